@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Benchmark for pack.py and unpack.py on generated packages.
+
+Two packages are built from fixed content, so runs are comparable across
+machines and commits: a .docx with 500 XML parts and a .pptx with 200 slides
+of 40 shapes each. Each is unpacked, then packed with every --jobs value
+given, without and with --original; the packed files must be byte-identical
+whatever the number of jobs.
+
+Example usage:
+    python benchmarks/bench_pack.py [--jobs 1 2 4] [--repeat 3]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+# Import the scripts the way they import each other when run directly
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pack import pack_document  # noqa: E402
+from unpack import unpack_document  # noqa: E402
+
+HEADER = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+R = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+RELS = "http://schemas.openxmlformats.org/package/2006/relationships"
+W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+P = "http://schemas.openxmlformats.org/presentationml/2006/main"
+A = "http://schemas.openxmlformats.org/drawingml/2006/main"
+TYPES = "http://schemas.openxmlformats.org/package/2006/content-types"
+
+
+def make_parts_docx(path, parts=500, paragraphs=40):
+    """Write a .docx whose document.xml has parts - 1 custom XML parts beside it."""
+    paragraph = (
+        '<w:p><w:r><w:t xml:space="preserve">Part {i} line {j} </w:t></w:r></w:p>'
+    )
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(
+            "[Content_Types].xml",
+            HEADER + f'<Types xmlns="{TYPES}">'
+            '<Default Extension="rels" ContentType="application/'
+            'vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/word/document.xml" ContentType="application/'
+            'vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+            "</Types>",
+        )
+        zf.writestr(
+            "_rels/.rels",
+            HEADER + f'<Relationships xmlns="{RELS}"><Relationship Id="rId1" '
+            f'Type="{R}/officeDocument" Target="word/document.xml"/></Relationships>',
+        )
+        body = "".join(paragraph.format(i=0, j=j) for j in range(paragraphs))
+        zf.writestr(
+            "word/document.xml",
+            HEADER + f'<w:document xmlns:w="{W}"><w:body>{body}</w:body></w:document>',
+        )
+        for i in range(1, parts):
+            body = "".join(paragraph.format(i=i, j=j) for j in range(paragraphs))
+            zf.writestr(
+                f"customXml/item{i}.xml",
+                HEADER + f'<w:body xmlns:w="{W}">{body}</w:body>',
+            )
+    return path
+
+
+def make_deck(path, slides=200, shapes=40):
+    """Write a .pptx with the given number of slides of text shapes."""
+    namespaces = f'xmlns:p="{P}" xmlns:a="{A}" xmlns:r="{R}"'
+    overrides = "".join(
+        f'<Override PartName="/ppt/slides/slide{i}.xml" ContentType="application/'
+        'vnd.openxmlformats-officedocument.presentationml.slide+xml"/>'
+        for i in range(1, slides + 1)
+    )
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(
+            "[Content_Types].xml",
+            HEADER + f'<Types xmlns="{TYPES}">'
+            '<Default Extension="rels" ContentType="application/'
+            'vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/ppt/presentation.xml" ContentType="application/'
+            'vnd.openxmlformats-officedocument.presentationml.presentation.main+xml"/>'
+            f"{overrides}</Types>",
+        )
+        zf.writestr(
+            "_rels/.rels",
+            HEADER + f'<Relationships xmlns="{RELS}"><Relationship Id="rId1" '
+            f'Type="{R}/officeDocument" Target="ppt/presentation.xml"/>'
+            "</Relationships>",
+        )
+        zf.writestr(
+            "ppt/_rels/presentation.xml.rels",
+            HEADER
+            + f'<Relationships xmlns="{RELS}">'
+            + "".join(
+                f'<Relationship Id="rId{i}" Type="{R}/slide" '
+                f'Target="slides/slide{i}.xml"/>'
+                for i in range(1, slides + 1)
+            )
+            + "</Relationships>",
+        )
+        zf.writestr(
+            "ppt/presentation.xml",
+            HEADER
+            + f"<p:presentation {namespaces}><p:sldIdLst>"
+            + "".join(
+                f'<p:sldId id="{255 + i}" r:id="rId{i}"/>' for i in range(1, slides + 1)
+            )
+            + '</p:sldIdLst><p:sldSz cx="9144000" cy="6858000"/>'
+            '<p:notesSz cx="6858000" cy="9144000"/></p:presentation>',
+        )
+        for i in range(1, slides + 1):
+            tree = "".join(
+                f'<p:sp><p:nvSpPr><p:cNvPr id="{j + 2}" name="s{j}"/><p:cNvSpPr/>'
+                "<p:nvPr/></p:nvSpPr><p:spPr/><p:txBody><a:bodyPr/><a:p><a:r>"
+                f"<a:t>Slide {i} shape {j}</a:t></a:r></a:p></p:txBody></p:sp>"
+                for j in range(shapes)
+            )
+            zf.writestr(
+                f"ppt/slides/slide{i}.xml",
+                HEADER + f'<p:sld {namespaces}><p:cSld><p:spTree><p:nvGrpSpPr>'
+                '<p:cNvPr id="1" name=""/><p:cNvGrpSpPr/><p:nvPr/></p:nvGrpSpPr>'
+                f"<p:grpSpPr/>{tree}</p:spTree></p:cSld></p:sld>",
+            )
+            zf.writestr(
+                f"ppt/slides/_rels/slide{i}.xml.rels",
+                HEADER + f'<Relationships xmlns="{RELS}"></Relationships>',
+            )
+    return path
+
+
+def best_time(function, repeat):
+    """Run function repeat times and return the fastest run in seconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def bench(name, office_file, work_dir, jobs_values, repeat):
+    """Time unpacking and packing one package and check the outputs agree."""
+    unpacked = work_dir / f"{name}_unpacked"
+    seconds = best_time(lambda: unpack_document(office_file, unpacked), repeat)
+    print(f"{name}: unpack {seconds:.2f}s")
+
+    for original in (None, office_file):
+        label = "pack --original" if original else "pack"
+        outputs = []
+        for jobs in jobs_values:
+            output = work_dir / f"{name}_jobs{jobs}{office_file.suffix}"
+            seconds = best_time(
+                lambda: pack_document(unpacked, output, original=original, jobs=jobs),
+                repeat,
+            )
+            print(f"{name}: {label} --jobs {jobs} {seconds:.2f}s")
+            outputs.append(output.read_bytes())
+        if any(output != outputs[0] for output in outputs):
+            sys.exit(f"{name}: {label} output differs between --jobs values")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pack.py and unpack.py")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        nargs="+",
+        default=[1, 2, 4],
+        help="--jobs values to pack with (default: 1 2 4)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Runs per measurement; the fastest is reported (default: 3)",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench_pack_") as temp_dir:
+        work_dir = Path(temp_dir)
+        packages = {
+            "docx500": make_parts_docx(work_dir / "parts.docx"),
+            "deck200": make_deck(work_dir / "deck.pptx"),
+        }
+        for name, office_file in packages.items():
+            bench(name, office_file, work_dir, args.jobs, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,29 +3,81 @@
 Tool to pack a directory into a .docx, .pptx, or .xlsx file with XML formatting undone.
 
 Example usage:
-    python pack.py <input_directory> <office_file> [--force]
+    python pack.py <input_directory> <office_file> [--force] [--validate structural|render]
+                   [--original <office_file>] [--jobs N]
 """
 
 import argparse
-import shutil
-import subprocess
+import hashlib
+import os
+import struct
 import sys
-import tempfile
 import defusedxml.minidom
+import xml.parsers.expat
 import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
 from pathlib import Path
 
+try:
+    from .validation_server import get_validation_server
+    from .xml_stream import (
+        NeedsDom,
+        create_parser,
+        escape,
+        is_xml_part,
+        qname,
+        start_tag,
+    )
+except ImportError:
+    # Run as a script from ooxml/scripts
+    from validation_server import get_validation_server
+    from xml_stream import (
+        NeedsDom,
+        create_parser,
+        escape,
+        is_xml_part,
+        qname,
+        start_tag,
+    )
+
+# Validation tiers, cheapest first; each tier includes the ones before it
+VALIDATION_TIERS = ("structural", "render")
+
 
 def main():
     parser = argparse.ArgumentParser(description="Pack a directory into an Office file")
     parser.add_argument("input_directory", help="Unpacked Office document directory")
     parser.add_argument("output_file", help="Output Office file (.docx/.pptx/.xlsx)")
     parser.add_argument("--force", action="store_true", help="Skip validation")
+    parser.add_argument(
+        "--validate",
+        choices=VALIDATION_TIERS,
+        default="render",
+        help="Validation tier: 'structural' runs only the in-process package "
+        "checks, 'render' also converts with soffice (default: render)",
+    )
+    parser.add_argument(
+        "--original",
+        help="Office file the directory was unpacked from; unchanged parts are "
+        "copied from it without being recompressed",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for condensing and compressing parts (default: 1)",
+    )
     args = parser.parse_args()
 
     try:
         success = pack_document(
-            args.input_directory, args.output_file, validate=not args.force
+            args.input_directory,
+            args.output_file,
+            validate=False if args.force else args.validate,
+            original=args.original,
+            jobs=args.jobs,
         )
 
         # Show warning if validation was skipped
@@ -42,13 +94,22 @@ def main():
         sys.exit(f"Error: {e}")
 
 
-def pack_document(input_dir, output_file, validate=False):
+def pack_document(input_dir, output_file, validate=False, original=None, jobs=1):
     """Pack a directory into an Office file (.docx/.pptx/.xlsx).
 
     Args:
         input_dir: Path to unpacked Office document directory
         output_file: Path to output Office file
-        validate: If True, validates with soffice (default: False)
+        validate: Validation tier (default: False, no validation).
+            "structural" runs the in-process package checks on input_dir and
+            fails before anything is written. "render" (or True) additionally
+            converts the packed file with soffice, which is only started once
+            the structural checks pass.
+        original: Optional Office file input_dir was unpacked from. Parts whose
+            content is unchanged are copied from it as raw compressed members
+            and only changed parts are condensed and compressed.
+        jobs: Number of worker processes used to condense and compress parts
+            (default: 1, no pool)
 
     Returns:
         bool: True if successful, False if validation failed
@@ -61,80 +122,503 @@ def pack_document(input_dir, output_file, validate=False):
     if output_file.suffix.lower() not in {".docx", ".pptx", ".xlsx"}:
         raise ValueError(f"{output_file} must be a .docx, .pptx, or .xlsx file")
 
-    # Work in temporary directory to avoid modifying original
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_content_dir = Path(temp_dir) / "content"
-        shutil.copytree(input_dir, temp_content_dir)
-
-        # Process XML files to remove pretty-printing whitespace
-        for pattern in ["*.xml", "*.rels"]:
-            for xml_file in temp_content_dir.rglob(pattern):
-                condense_xml(xml_file)
-
-        # Create final Office file as zip archive
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-        with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as zf:
-            for f in temp_content_dir.rglob("*"):
-                if f.is_file():
-                    zf.write(f, f.relative_to(temp_content_dir))
-
-        # Validate if requested
-        if validate:
-            if not validate_document(output_file):
-                output_file.unlink()  # Delete the corrupt file
-                return False
+    if validate is True:
+        validate = "render"
+    if validate and validate not in VALIDATION_TIERS:
+        raise ValueError(f"Unknown validation tier: {validate}")
+
+    if original is not None:
+        original = Path(original)
+        if not original.is_file():
+            raise ValueError(f"Original file not found: {original}")
+
+    # Fail fast on a broken package before packing or starting soffice
+    if validate and not validate_structure(input_dir, output_file.suffix.lower()):
+        return False
+
+    _write_package(input_dir, output_file, original, jobs)
+
+    if validate == "render":
+        if not validate_document(output_file):
+            output_file.unlink()  # Delete the corrupt file
+            return False
 
     return True
 
 
-def validate_document(doc_path):
-    """Validate document by converting to HTML with soffice."""
-    # Determine the correct filter based on file extension
-    match doc_path.suffix.lower():
+def validate_structure(input_dir, file_type=".docx", verbose=False):
+    """Run the in-process structural checks on an unpacked directory.
+
+    Uses the validation package's schema validator for file_type, but only its
+    structural tier (see BaseSchemaValidator.validate_structure()): no XSD
+    schemas, no original file and no soffice, so it runs in milliseconds.
+
+    Args:
+        input_dir: Path to unpacked Office document directory
+        file_type: Extension of the package being built (".docx", ".pptx", ...)
+        verbose: Print passing checks as well as failures
+
+    Returns:
+        bool: True if the package structure is sound
+    """
+    try:
+        from .validation import (
+            BaseSchemaValidator,
+            DOCXSchemaValidator,
+            PPTXSchemaValidator,
+            XLSXSchemaValidator,
+        )
+    except ImportError:
+        # Run as a script from ooxml/scripts
+        from validation import (
+            BaseSchemaValidator,
+            DOCXSchemaValidator,
+            PPTXSchemaValidator,
+            XLSXSchemaValidator,
+        )
+
+    match file_type:
         case ".docx":
-            filter_name = "html:HTML"
+            validator_class = DOCXSchemaValidator
         case ".pptx":
-            filter_name = "html:impress_html_Export"
+            validator_class = PPTXSchemaValidator
         case ".xlsx":
-            filter_name = "html:HTML (StarCalc)"
-
-    with tempfile.TemporaryDirectory() as temp_dir:
-        try:
-            result = subprocess.run(
-                [
-                    "soffice",
-                    "--headless",
-                    "--convert-to",
-                    filter_name,
-                    "--outdir",
-                    temp_dir,
-                    str(doc_path),
-                ],
-                capture_output=True,
-                timeout=10,
-                text=True,
-            )
-            if not (Path(temp_dir) / f"{doc_path.stem}.html").exists():
-                error_msg = result.stderr.strip() or "Document validation failed"
-                print(f"Validation error: {error_msg}", file=sys.stderr)
-                return False
-            return True
-        except FileNotFoundError:
-            print("Warning: soffice not found. Skipping validation.", file=sys.stderr)
-            return True
-        except subprocess.TimeoutExpired:
-            print("Validation error: Timeout during conversion", file=sys.stderr)
-            return False
-        except Exception as e:
-            print(f"Validation error: {e}", file=sys.stderr)
-            return False
+            validator_class = XLSXSchemaValidator
+        case _:
+            validator_class = BaseSchemaValidator
+    return validator_class(input_dir, verbose=verbose).validate_structure()
+
+
+def validate_document(doc_path, timeout=10):
+    """Validate document by converting it to HTML with soffice.
+
+    Conversions go through the process-wide ValidationServer (see
+    get_validation_server()), so a warm office process is reused when possible.
+
+    Args:
+        doc_path: Path to the Office file
+        timeout: Seconds the conversion may take (default: 10)
+
+    Returns:
+        bool: True if the document converted (or soffice is unavailable)
+    """
+    server = get_validation_server()
+    if server is None:
+        print("Warning: soffice not found. Skipping validation.", file=sys.stderr)
+        return True
+
+    error = server.submit(doc_path, timeout=timeout).result()
+    if error:
+        print(f"Validation error: {error}", file=sys.stderr)
+        return False
+    return True
+
+
+def update_package(original_file, changes_dir, output_file):
+    """Write a copy of an Office file with some parts replaced or added.
+
+    Every file under changes_dir replaces (or adds) the member with the same
+    relative path; XML parts are condensed first. All other members are copied
+    as raw compressed bytes, without being decompressed or re-deflated. The
+    output is written to a temp file beside output_file and swapped in, so
+    output_file may be original_file itself.
+
+    Args:
+        original_file: Path to the source Office file
+        changes_dir: Directory holding the changed/new parts (may be sparse)
+        output_file: Path to output Office file
+    """
+    original_file = Path(original_file)
+    changes_dir = Path(changes_dir)
+    output_file = Path(output_file)
+
+    changes = {}
+    if changes_dir.is_dir():
+        for f in changes_dir.rglob("*"):
+            if f.is_file():
+                changes[f.relative_to(changes_dir).as_posix()] = f
+
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    temp_output = output_file.with_name(f".{output_file.name}.tmp")
+    with (
+        zipfile.ZipFile(original_file, "r") as src,
+        open(original_file, "rb") as src_fp,
+        zipfile.ZipFile(temp_output, "w", zipfile.ZIP_DEFLATED) as dst,
+    ):
+        for info in src.infolist():
+            changed = changes.pop(info.filename, None)
+            if changed is None:
+                _copy_member_raw(src_fp, info, dst)
+            else:
+                dst.writestr(info.filename, _read_part(changed))
+        for name, f in sorted(changes.items()):
+            dst.writestr(name, _read_part(f))
+    os.replace(temp_output, output_file)
+
+
+def _write_package(input_dir, output_file, original_file, jobs):
+    """Condense and deflate the files of input_dir and write them as a zip.
+
+    Parts are prepared by _prepare_part(), across a process pool when jobs > 1,
+    and written in a fixed order regardless of which worker finishes first:
+    directory order, or with original_file, its member order followed by new
+    files (members whose file was deleted are dropped).
+    """
+    files = {
+        f.relative_to(input_dir).as_posix(): f
+        for f in input_dir.rglob("*")
+        if f.is_file()
+    }
+
+    originals = {}
+    references = []
+    if original_file is not None:
+        with zipfile.ZipFile(original_file) as src:
+            originals = {
+                info.filename: info for info in src.infolist() if info.filename in files
+            }
+            # XML members are handed to the workers; binary ones are compared by CRC
+            for name, info in originals.items():
+                data = src.read(info) if is_xml_part(name) else None
+                references.append((info, data))
+        names = list(originals) + [name for name in files if name not in originals]
+    else:
+        names = list(files)
+    references += [None] * (len(names) - len(references))
+    paths = [files[name] for name in names]
+
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    temp_output = output_file.with_name(f".{output_file.name}.tmp")
+    with ExitStack() as stack:
+        if jobs > 1:
+            pool = stack.enter_context(ProcessPoolExecutor(max_workers=jobs))
+            chunksize = max(1, len(paths) // (jobs * 4))
+            results = pool.map(_prepare_part, paths, references, chunksize=chunksize)
+        else:
+            results = map(_prepare_part, paths, references)
+
+        src_fp = stack.enter_context(open(original_file, "rb")) if originals else None
+        dst = stack.enter_context(zipfile.ZipFile(temp_output, "w"))
+        for name, path, result in zip(names, paths, results):
+            if result is None:
+                _copy_member_raw(src_fp, originals[name], dst)
+            else:
+                crc, size, compressed = result
+                info = zipfile.ZipInfo.from_file(path, name)
+                info.compress_type = zipfile.ZIP_DEFLATED
+                info.CRC, info.file_size = crc, size
+                info.compress_size = len(compressed)
+                _write_member_raw(dst, info, [compressed])
+    os.replace(temp_output, output_file)
+
+
+def _prepare_part(path, reference=None):
+    """Condense (if XML) and deflate one part; runs in the worker processes.
+
+    Args:
+        path: Path to the part
+        reference: Optional (ZipInfo, data) of the original member, data being its
+            bytes for XML parts
+
+    Returns:
+        (crc, size, compressed bytes), or None if the part matches reference
+    """
+    if reference is not None and _is_unchanged(path, *reference):
+        return None
+    data = _read_part(path)
+    compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+    return zlib.crc32(data), len(data), compressor.compress(data) + compressor.flush()
+
+
+def _is_unchanged(path, info, data):
+    """Check whether a file holds the same content as a zip member.
+
+    data is the member's content, needed for XML parts only.
+    """
+    if is_xml_part(path.name):
+        digest = _part_digest(path.read_bytes())
+        return digest is not None and digest == _part_digest(data)
+
+    if path.stat().st_size != info.file_size:
+        return False
+    crc = 0
+    with open(path, "rb") as f:
+        while chunk := f.read(1 << 20):
+            crc = zlib.crc32(chunk, crc)
+    return crc == info.CRC
+
+
+def _part_digest(data):
+    """Hash an XML part as condense_xml() would see it, or None if that is unclear.
+
+    The digest covers elements, attributes, processing instructions and text,
+    skipping comments and whitespace-only text outside *:t elements, so a part
+    and its pretty-printed copy hash the same only when condensing both gives
+    equivalent XML. Namespace declarations and attributes are each hashed as a
+    sorted set, since unpacking writes the declarations first and attribute
+    order carries no meaning. Parts with CDATA sections or a DOCTYPE return None.
+    """
+    tokens = []
+    text = []
+    in_t = [False]
+
+    def flush():
+        chunk = "".join(text)
+        text.clear()
+        if in_t[-1] or chunk.strip():
+            tokens.append("\x01" + chunk)
+
+    def start(name, attrs):
+        if text:
+            flush()
+        in_t.append(name.endswith(":t"))
+        tokens.append("\x02" + name)
+        pairs = zip(attrs[::2], attrs[1::2])
+        namespaces, others = [], []
+        for attr, value in pairs:
+            is_namespace = attr == "xmlns" or attr.startswith("xmlns:")
+            (namespaces if is_namespace else others).append(f"{attr}\x00{value}")
+        tokens.append("\x05" + "\x00".join(sorted(namespaces)))
+        tokens.append("\x06" + "\x00".join(sorted(others)))
+
+    def end(name):
+        if text:
+            flush()
+        in_t.pop()
+        tokens.append("\x03")
+
+    def pi(target, value):
+        if text:
+            flush()
+        tokens.append(f"\x04{target}\x00{value}")
+
+    def comment(data):
+        if text:
+            flush()
+
+    def unsupported(*args):
+        raise ValueError("unsupported construct")
+
+    parser = xml.parsers.expat.ParserCreate()
+    parser.ordered_attributes = True
+    parser.buffer_text = True
+    parser.StartElementHandler = start
+    parser.EndElementHandler = end
+    parser.CharacterDataHandler = text.append
+    parser.ProcessingInstructionHandler = pi
+    parser.CommentHandler = comment
+    parser.StartCdataSectionHandler = unsupported
+    parser.StartDoctypeDeclHandler = unsupported
+    try:
+        parser.Parse(data, True)
+    except (ValueError, xml.parsers.expat.ExpatError):
+        return None
+    return hashlib.sha256("\x00".join(tokens).encode("utf-8")).digest()
+
+
+def _read_part(path):
+    """Read a part for packing, condensing XML the same way pack_document does."""
+    data = path.read_bytes()
+    if is_xml_part(path.name):
+        return condense_xml_bytes(data)
+    return data
+
+
+def _copy_member_raw(src_fp, info, zf):
+    """Copy one member's compressed bytes from an open source file into zf as-is."""
+    if info.flag_bits & 0x1:
+        raise ValueError(f"Encrypted zip member not supported: {info.filename}")
+
+    # Skip the source local header (its name/extra lengths may differ from the
+    # central directory's)
+    src_fp.seek(info.header_offset)
+    local_header = src_fp.read(30)
+    name_len, extra_len = struct.unpack("<HH", local_header[26:30])
+    src_fp.seek(name_len + extra_len, os.SEEK_CUR)
+
+    new_info = zipfile.ZipInfo(info.filename, info.date_time)
+    new_info.compress_type = info.compress_type
+    new_info.CRC = info.CRC
+    new_info.compress_size = info.compress_size
+    new_info.file_size = info.file_size
+    new_info.external_attr = info.external_attr
+    _write_member_raw(zf, new_info, _read_chunks(src_fp, info))
+
+
+def _read_chunks(src_fp, info):
+    """Yield a member's compressed bytes from a file positioned at its data."""
+    remaining = info.compress_size
+    while remaining:
+        chunk = src_fp.read(min(remaining, 1 << 20))
+        if not chunk:
+            raise ValueError(f"Truncated zip member: {info.filename}")
+        yield chunk
+        remaining -= len(chunk)
+
+
+def _write_member_raw(zf, info, chunks):
+    """Append a member whose data is already compressed to zf.
+
+    zipfile has no public API for this, so the local header is written directly
+    and the member is registered the same way ZipFile.write() does it. info must
+    carry the CRC, sizes and compress_type.
+    """
+    info.header_offset = zf.fp.tell()
+    zf.fp.write(info.FileHeader())
+    for chunk in chunks:
+        zf.fp.write(chunk)
+
+    zf.filelist.append(info)
+    zf.NameToInfo[info.filename] = info
+    zf.start_dir = zf.fp.tell()
 
 
 def condense_xml(xml_file):
     """Strip unnecessary whitespace and remove comments."""
-    with open(xml_file, "r", encoding="utf-8") as f:
-        dom = defusedxml.minidom.parse(f)
+    xml_file = Path(xml_file)
+    temp_file = xml_file.with_name(f".{xml_file.name}.tmp")
+    try:
+        with (
+            open(xml_file, "r", encoding="utf-8") as src,
+            open(temp_file, "wb") as dst,
+        ):
+            _condense_stream(lambda parser: _parse_chunks(parser, src), dst.write)
+    except NeedsDom:
+        temp_file.unlink()
+        with open(xml_file, "r", encoding="utf-8") as f:
+            dom = defusedxml.minidom.parse(f)
+        with open(xml_file, "wb") as f:
+            f.write(_condense_dom(dom))
+        return
+    except BaseException:
+        temp_file.unlink(missing_ok=True)
+        raise
+
+    # Write back the condensed XML
+    os.replace(temp_file, xml_file)
+
+
+def condense_xml_bytes(data):
+    """Return XML bytes with whitespace and comments stripped, as condense_xml()."""
+    out = []
+    try:
+        _condense_stream(lambda parser: parser.Parse(data, True), out.append)
+    except NeedsDom:
+        return _condense_dom(defusedxml.minidom.parseString(data))
+    return b"".join(out)
+
+
+def _parse_chunks(parser, f):
+    """Feed a text file to an expat parser in fixed-size chunks."""
+    while chunk := f.read(1 << 16):
+        parser.Parse(chunk, False)
+    parser.Parse("", True)
+
+
+def _condense_stream(feed, write):
+    """Condense XML from expat events, writing UTF-8 output as it goes.
+
+    Produces the same bytes as _condense_dom() (minidom's toxml()) without
+    building a tree: whitespace-only text and comments are dropped except
+    inside *:t elements, namespace declarations come first in each start tag,
+    and an element's start tag is closed as "/>" or ">" once its first kept
+    child (or its end) is seen. Memory is bounded by nesting depth and the
+    longest text run.
+
+    Args:
+        feed: Callable that drives the given parser over the input
+        write: Callable receiving chunks of UTF-8 output
+
+    Raises:
+        NeedsDom: For documents with a DOCTYPE, which are left to defusedxml
+    """
+    pieces = ['<?xml version="1.0" encoding="UTF-8"?>']
+    text = []
+    cdata = []
+    stack = []  # [qname, in *:t, start tag still open]
+    ns_decls = []
+    in_cdata = False
+
+    def flush_pieces():
+        write("".join(pieces).encode("utf-8"))
+        pieces.clear()
+
+    def open_parent():
+        if stack and stack[-1][2]:
+            pieces.append(">")
+            stack[-1][2] = False
+
+    def flush_text():
+        data = "".join(text)
+        text.clear()
+        if stack and (stack[-1][1] or data.strip()):
+            open_parent()
+            pieces.append(escape(data))
+
+    def start(name, attrs):
+        if text:
+            flush_text()
+        open_parent()
+        qualified_name = qname(name)
+        pieces.append(start_tag(qualified_name, ns_decls, attrs))
+        stack.append([qualified_name, qualified_name.endswith(":t"), True])
+
+    def end(name):
+        if text:
+            flush_text()
+        qualified_name, _, is_open = stack.pop()
+        pieces.append("/>" if is_open else f"</{qualified_name}>")
+        if len(pieces) > 4096:
+            flush_pieces()
+
+    def characters(data):
+        if in_cdata:
+            cdata.append(data)
+        else:
+            text.append(data)
 
+    def start_cdata():
+        nonlocal in_cdata
+        in_cdata = True
+
+    def end_cdata():
+        nonlocal in_cdata
+        in_cdata = False
+        # An empty section adds no node, so text on either side of it stays one run
+        if cdata:
+            if text:
+                flush_text()
+            open_parent()
+            pieces.append("<![CDATA[" + "".join(cdata) + "]]>")
+            cdata.clear()
+
+    def comment(data):
+        if text:
+            flush_text()
+        if not stack or stack[-1][1]:
+            open_parent()
+            pieces.append(f"<!--{data}-->")
+
+    def pi(target, data):
+        if text:
+            flush_text()
+        open_parent()
+        pieces.append(f"<?{target} {data}?>")
+
+    parser = create_parser(ns_decls)
+    parser.StartElementHandler = start
+    parser.EndElementHandler = end
+    parser.CharacterDataHandler = characters
+    parser.StartCdataSectionHandler = start_cdata
+    parser.EndCdataSectionHandler = end_cdata
+    parser.CommentHandler = comment
+    parser.ProcessingInstructionHandler = pi
+    feed(parser)
+    flush_pieces()
+
+
+def _condense_dom(dom):
+    """Condense a parsed DOM in place and serialize it as UTF-8."""
     # Process each element to remove whitespace and comments
     for element in dom.getElementsByTagName("*"):
         # Skip w:t elements and their processing
@@ -150,9 +634,7 @@ def condense_xml(xml_file):
             ) or child.nodeType == child.COMMENT_NODE:
                 element.removeChild(child)
 
-    # Write back the condensed XML
-    with open(xml_file, "wb") as f:
-        f.write(dom.toxml(encoding="UTF-8"))
+    return dom.toxml(encoding="UTF-8")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,9 @@
+"""Make the scripts importable the way they import each other when run directly."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# The docx library (scripts/document.py) imports these scripts as ooxml.scripts
+sys.path.append(str(Path(__file__).resolve().parents[3]))
@@ -0,0 +1,173 @@
+"""
+XML samples for checking the streaming writers against minidom, and minimal
+packages for the validators.
+"""
+
+import random
+import zipfile
+
+W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+# Hand-written cases for the constructs the streaming writers special-case
+SAMPLES = {
+    "namespaces": (
+        f'<w:document xmlns:w="{W}" xmlns="urn:default" a="1">'
+        '<w:body xmlns:x="urn:x" x:attr="v"><child/><x:child w:val="2"/>'
+        "</w:body></w:document>"
+    ),
+    "preserved_text": (
+        f'<w:document xmlns:w="{W}">\n  <w:body>\n    <w:p>\n'
+        '      <w:r><w:t xml:space="preserve">  two  spaces  </w:t></w:r>\n'
+        "      <w:r><w:t>   </w:t></w:r>\n"
+        "      <w:r><w:t></w:t></w:r>\n"
+        "    </w:p>\n  </w:body>\n</w:document>\n"
+    ),
+    "comments": (
+        "<!-- before the root -->\n"
+        f'<w:document xmlns:w="{W}"><!-- in the root -->'
+        "<w:p><w:t>a<!-- inside text -->b</w:t><!---->\n  </w:p>"
+        "</w:document>\n<!-- after the root -->"
+    ),
+    "cdata": (
+        "<root><a><![CDATA[x < y & z]]></a>"
+        "<b>before<![CDATA[]]>after</b>"
+        "<c>   <![CDATA[  ]]>   </c>"
+        "<d><![CDATA[one]]><![CDATA[two]]></d>"
+        "<e>text<![CDATA[cdata]]>text</e>"
+        "<x:t xmlns:x='urn:x'> <![CDATA[kept]]> </x:t></root>"
+    ),
+    "processing_instructions": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<?mso-application progid="Word.Document"?>\n'
+        "<root><?target some data?><a><?empty?></a>\n"
+        "  <b>text<?pi inside?>more</b></root>"
+    ),
+    "mixed_content": (
+        "<root>leading<a/>between <b>inner</b> trailing\n"
+        "  <c>\n    <d>deep</d>\n    tail\n  </c>\n</root>"
+    ),
+    "non_ascii": (
+        '<root attr="café &quot;q&quot; &lt;&gt;&amp;">'
+        "<a>日本語 &amp; &lt;x&gt;  nbsp</a>"
+        "<b>\U0001f600 &#169; &#x2014;</b>"
+        '<c v="line&#10;break&#9;tab"/></root>'
+    ),
+    "doctype": '<!DOCTYPE root><root>\n  <a>text</a>\n</root>',
+}
+
+_NAMES = ["w:p", "w:r", "w:t", "w:body", "a:t", "plain", "x:item"]
+_WORDS = [
+    "text", " ", "  ", "\n", "\t", "&amp;", "&lt;", "&gt;", "&quot;", "'",
+    "é", "日本", "\U0001f600", "&#169;", " ", "a b",
+]
+
+
+def random_document(rng: random.Random, max_depth=5):
+    """Build a random well-formed document mixing every construct in SAMPLES."""
+    parts = []
+    if rng.random() < 0.3:
+        parts.append("<?pi top?>\n")
+    if rng.random() < 0.3:
+        parts.append("<!-- top -->\n")
+    parts.append(
+        f'<w:document xmlns:w="{W}" xmlns:a="urn:a" xmlns:x="urn:x">'
+    )
+    _random_children(rng, parts, max_depth)
+    parts.append("</w:document>")
+    if rng.random() < 0.3:
+        parts.append("\n<!-- bottom -->")
+    return "".join(parts)
+
+
+def _random_children(rng, parts, depth):
+    for _ in range(rng.randint(0, 4)):
+        kind = rng.random()
+        if kind < 0.35 and depth:
+            name = rng.choice(_NAMES)
+            attrs = "".join(
+                f' {attr}="{rng.choice(_WORDS)}"'
+                for attr in rng.sample(["w:val", "id", "x:a"], rng.randint(0, 2))
+            )
+            if rng.random() < 0.2:
+                parts.append(f"<{name}{attrs}/>")
+            else:
+                parts.append(f"<{name}{attrs}>")
+                _random_children(rng, parts, depth - 1)
+                parts.append(f"</{name}>")
+        elif kind < 0.7:
+            parts.append("".join(rng.choices(_WORDS, k=rng.randint(1, 3))))
+        elif kind < 0.8:
+            parts.append(f"<!--{rng.choice(['', ' c ', 'x'])}-->")
+        elif kind < 0.9:
+            parts.append(f"<![CDATA[{rng.choice(['', ' ', 'a<b', '&amp;'])}]]>")
+        else:
+            parts.append(f"<?pi{rng.choice(['', ' data', ' a b'])}?>")
+
+
+# Minimal .docx package (see write_docx_package())
+CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+  <Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+  <Default Extension="xml" ContentType="application/xml"/>
+  <Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
+</Types>"""
+
+PACKAGE_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+  <Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>
+</Relationships>"""
+
+DOCUMENT = f"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:document xmlns:w="{W}">
+  <w:body>{{body}}
+    <w:p><w:r><w:t>Hello</w:t></w:r></w:p>
+  </w:body>
+</w:document>"""
+
+
+def write_docx_package(directory, body=""):
+    """Write a minimal unpacked .docx to a directory and return it."""
+    (directory / "_rels").mkdir(parents=True)
+    (directory / "word").mkdir()
+    (directory / "[Content_Types].xml").write_text(CONTENT_TYPES)
+    (directory / "_rels" / ".rels").write_text(PACKAGE_RELS)
+    (directory / "word" / "document.xml").write_text(DOCUMENT.format(body=body))
+    return directory
+
+
+DOCUMENT_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+  <Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/settings" Target="settings.xml"/>
+</Relationships>"""
+
+SETTINGS = f"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:settings xmlns:w="{W}">
+  <w:defaultTabStop w:val="720"/>
+</w:settings>"""
+
+
+def write_word_package(directory, body=""):
+    """Write a minimal unpacked .docx with the settings part Document() needs."""
+    write_docx_package(directory, body)
+    (directory / "word" / "_rels").mkdir()
+    (directory / "word" / "_rels" / "document.xml.rels").write_text(DOCUMENT_RELS)
+    (directory / "word" / "settings.xml").write_text(SETTINGS)
+    content_types = directory / "[Content_Types].xml"
+    content_types.write_text(
+        content_types.read_text().replace(
+            "</Types>",
+            '  <Override PartName="/word/settings.xml" ContentType="application/'
+            'vnd.openxmlformats-officedocument.wordprocessingml.settings+xml"/>\n'
+            "</Types>",
+        )
+    )
+    return directory
+
+
+def zip_package(directory, path):
+    """Zip an unpacked package into an Office file."""
+    with zipfile.ZipFile(path, "w") as office_file:
+        for file_path in sorted(directory.rglob("*")):
+            if file_path.is_file():
+                office_file.write(file_path, file_path.relative_to(directory))
+    return path
@@ -0,0 +1,58 @@
+"""
+Tests for validating many documents in one run.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+from samples import write_docx_package, zip_package
+from validation import validate_many
+from validation.batch import find_packages
+
+
+def test_office_file_on_its_own_reports_every_xsd_error(tmp_path):
+    office_file = zip_package(
+        write_docx_package(tmp_path / "invalid", body="\n<w:bogus/>"),
+        tmp_path / "invalid.docx",
+    )
+
+    report = validate_many([(None, office_file)])
+
+    assert not report.passed
+    [xsd] = [r for r in report.results if r.name == "validate_against_xsd"]
+    [error] = xsd.errors
+    # Lines are those of the unpacked (pretty-printed) part
+    assert error.file == "word/document.xml" and error.line > 1
+    assert "bogus" in error.message
+    # Nothing to compare tracked changes against
+    assert not [r for r in report.results if r.validator == "RedliningValidator"]
+
+
+def test_valid_office_file_on_its_own_passes(tmp_path):
+    office_file = zip_package(
+        write_docx_package(tmp_path / "valid"), tmp_path / "valid.docx"
+    )
+
+    assert validate_many([(None, office_file)]).passed
+
+
+def test_validate_many_fails_on_schema_invalid_package(tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    zip_package(write_docx_package(tmp_path / "valid"), docs / "valid.docx")
+    zip_package(
+        write_docx_package(tmp_path / "invalid", body="\n<w:bogus/>"),
+        docs / "invalid.docx",
+    )
+    assert len(find_packages(docs)) == 2
+
+    completed = subprocess.run(
+        [sys.executable, "validate_many.py", "--packages", str(docs), "--no-cache"],
+        cwd=Path(__file__).parent.parent,
+        capture_output=True,
+        text=True,
+    )
+
+    assert completed.returncode == 1
+    assert "bogus" in completed.stdout
@@ -0,0 +1,89 @@
+"""
+Tests for the on-disk XSD result cache.
+"""
+
+from pathlib import Path
+from unittest import mock
+
+import lxml.etree
+import pytest
+
+from validation import BaseSchemaValidator, base
+from validation.cache import (
+    enable_xsd_error_cache,
+    get_xsd_error_cache,
+    set_xsd_error_cache,
+)
+
+SCHEMA = """<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema" xmlns:t="urn:t"
+    targetNamespace="urn:t" elementFormDefault="qualified">
+  <xs:include schemaLocation="types.xsd"/>
+  <xs:element name="root" type="t:RootType"/>
+</xs:schema>"""
+
+TYPES = """<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"
+    targetNamespace="urn:t" elementFormDefault="qualified">
+  <xs:complexType name="RootType">
+    <xs:sequence><xs:element name="{child}" minOccurs="0"/></xs:sequence>
+  </xs:complexType>
+</xs:schema>"""
+
+PART = b'<root xmlns="urn:t"><a/></root>'
+
+
+@pytest.fixture
+def validator(tmp_path, monkeypatch):
+    monkeypatch.setenv("OOXML_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(base, "_schema_cache", {})
+    monkeypatch.setattr(base, "_schema_digests", {})
+    unpacked_dir = tmp_path / "unpacked"
+    (unpacked_dir / "custom").mkdir(parents=True)
+    (unpacked_dir / "custom" / "part.xml").write_bytes(PART)
+    (tmp_path / "schemas").mkdir()
+    (tmp_path / "schemas" / "root.xsd").write_text(SCHEMA)
+    (tmp_path / "schemas" / "types.xsd").write_text(TYPES.format(child="a"))
+    yield BaseSchemaValidator(unpacked_dir)
+    set_xsd_error_cache(None)
+
+
+def _validate(validator, read_data=lambda: PART):
+    schema_path = Path(validator.unpacked_dir).parent / "schemas" / "root.xsd"
+    return validator._validate_part_xsd(
+        read_data,
+        lambda: lxml.etree.ElementTree(lxml.etree.fromstring(PART)),
+        Path("custom/part.xml"),
+        schema_path,
+    )
+
+
+def test_cache_is_off_unless_enabled(validator, tmp_path):
+    assert get_xsd_error_cache() is None
+    read_data = mock.Mock(return_value=PART)
+
+    assert _validate(validator, read_data) == (True, {})
+    read_data.assert_not_called()
+    assert not (tmp_path / "cache").exists()
+
+
+def test_enabled_cache_reuses_results(validator, tmp_path):
+    cache = enable_xsd_error_cache()
+    assert cache.path == tmp_path / "cache" / "xsd-errors.sqlite3"
+    assert enable_xsd_error_cache() is cache
+
+    assert _validate(validator) == (True, {})
+    with mock.patch.object(validator, "_validate_tree_xsd") as validate_tree:
+        assert _validate(validator) == (True, {})
+    validate_tree.assert_not_called()
+
+
+def test_editing_an_included_schema_invalidates_results(validator, tmp_path):
+    enable_xsd_error_cache()
+    assert _validate(validator) == (True, {})
+
+    # A new process sees the edited schema set
+    (tmp_path / "schemas" / "types.xsd").write_text(TYPES.format(child="b"))
+    base._schema_cache.clear()
+    base._schema_digests.clear()
+
+    is_valid, errors = _validate(validator)
+    assert not is_valid and errors
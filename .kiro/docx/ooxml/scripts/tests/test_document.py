@@ -0,0 +1,196 @@
+"""
+Tests for the Document library: comment batches, tracked change IDs and saving.
+"""
+
+import zipfile
+
+import pytest
+from defusedxml import minidom
+
+from samples import write_word_package, zip_package
+from scripts.document import Document
+
+INSERTION = "<w:ins><w:r><w:t>new</w:t></w:r></w:ins>"
+
+
+@pytest.fixture
+def unpacked_dir(tmp_path):
+    return write_word_package(
+        tmp_path / "unpacked",
+        body="\n    <w:p><w:r><w:t>First</w:t></w:r></w:p>",
+    )
+
+
+def _ids(path, tag):
+    dom = minidom.parse(str(path))
+    return [node.getAttribute("w:id") for node in dom.getElementsByTagName(tag)]
+
+
+def _change_ids(editor):
+    return [
+        node.getAttribute("w:id")
+        for tag in ("w:ins", "w:del")
+        for node in editor._dom.getElementsByTagName(tag)
+    ]
+
+
+def test_batch_appends_comment_parts_on_exit(unpacked_dir):
+    doc = Document(unpacked_dir)
+    first = doc["word/document.xml"].get_node(tag="w:p", contains="First")
+    second = doc["word/document.xml"].get_node(tag="w:p", contains="Hello")
+
+    with doc.batch():
+        assert doc.add_comment(start=first, end=first, text="One") == 0
+        assert doc.add_comment(start=second, end=second, text="Two") == 1
+        assert doc.reply_to_comment(parent_comment_id=0, text="Reply") == 2
+        # Anchors are placed right away, the side parts are written on exit
+        assert not doc._part_exists("word/comments.xml")
+        assert len(doc._document._dom.getElementsByTagName("w:commentRangeStart")) == 3
+
+    doc.save()
+
+    word = unpacked_dir / "word"
+    assert _ids(word / "comments.xml", "w:comment") == ["0", "1", "2"]
+    assert sorted(_ids(word / "document.xml", "w:commentRangeStart")) == ["0", "1", "2"]
+    extended = minidom.parse(str(word / "commentsExtended.xml"))
+    entries = extended.getElementsByTagName("w15:commentEx")
+    assert len(entries) == 3
+    parent_para_id = doc.existing_comments[0]["para_id"]
+    assert entries[2].getAttribute("w15:paraIdParent") == parent_para_id
+
+
+def test_failed_batch_keeps_comments_for_placed_anchors(unpacked_dir):
+    doc = Document(unpacked_dir)
+    first = doc["word/document.xml"].get_node(tag="w:p", contains="First")
+    second = doc["word/document.xml"].get_node(tag="w:p", contains="Hello")
+
+    with pytest.raises(KeyError):
+        with doc.batch():
+            doc.add_comment(start=first, end=first, text="One")
+            doc.add_comment(start=second, end=second, text="Two")
+            raise KeyError("boom")
+
+    assert doc._batch is None
+    doc.save()
+
+    anchors = _ids(unpacked_dir / "word" / "document.xml", "w:commentRangeStart")
+    assert anchors == ["0", "1"]
+    assert _ids(unpacked_dir / "word" / "comments.xml", "w:comment") == anchors
+    assert sorted(doc.existing_comments) == [0, 1]
+
+
+def test_save_only_replaces_files_the_document_wrote(unpacked_dir):
+    inodes = {
+        path.relative_to(unpacked_dir).as_posix(): path.stat().st_ino
+        for path in unpacked_dir.rglob("*")
+        if path.is_file()
+    }
+    doc = Document(unpacked_dir)
+    node = doc["word/document.xml"].get_node(tag="w:p", contains="First")
+    doc.add_comment(start=node, end=node, text="Comment")
+    doc.save()
+
+    replaced = {
+        name
+        for name, inode in inodes.items()
+        if (unpacked_dir / name).stat().st_ino != inode
+    }
+    assert replaced == {
+        "[Content_Types].xml",
+        "word/_rels/document.xml.rels",
+        "word/document.xml",
+        "word/settings.xml",
+    }
+    assert (unpacked_dir / "word" / "comments.xml").is_file()
+    assert (unpacked_dir / "word" / "people.xml").is_file()
+
+    # Nothing written since: nothing copied
+    inodes = {name: (unpacked_dir / name).stat().st_ino for name in inodes}
+    doc.save()
+    assert all(
+        (unpacked_dir / name).stat().st_ino == inode for name, inode in inodes.items()
+    )
+
+
+def test_change_ids_stay_unique_across_calls_and_batches(tmp_path):
+    unpacked_dir = write_word_package(
+        tmp_path / "unpacked",
+        body=(
+            '\n    <w:ins w:id="4" w:author="A" w:date="2024-01-01T00:00:00Z">'
+            "<w:r><w:t>Old</w:t></w:r></w:ins>"
+            "\n    <w:p><w:r><w:t>First</w:t></w:r><w:r><w:t>Second</w:t></w:r></w:p>"
+        ),
+    )
+    doc = Document(unpacked_dir)
+    editor = doc["word/document.xml"]
+    first = editor.get_node(tag="w:r", contains="First")
+    second = editor.get_node(tag="w:r", contains="Second")
+
+    editor.insert_after(first, INSERTION)
+    with doc.batch():
+        editor.insert_after(first, INSERTION)
+        editor.suggest_deletion(second)
+        editor.insert_after(first, INSERTION)
+    with doc.batch():
+        editor.insert_before(first, INSERTION)
+    editor.insert_before(first, INSERTION)
+
+    ids = _change_ids(editor)
+    assert len(ids) == 7
+    assert sorted(ids, key=int) == ["4", "5", "6", "7", "8", "9", "10"]
+
+
+def test_parts_are_written_only_once_handed_out(unpacked_dir):
+    doc = Document(unpacked_dir)
+    rels = doc["_rels/.rels"]
+    assert not rels.dirty and not rels.save_if_modified()
+
+    # A node the caller may change marks the part dirty
+    rels.get_node(tag="Relationship", attrs={"Id": "rId1"})
+    assert rels.dirty and rels.save_if_modified()
+    assert not rels.dirty and not rels.save_if_modified()
+
+
+def test_lazy_document_leaves_the_original_until_saved(tmp_path, unpacked_dir):
+    original_docx = zip_package(unpacked_dir, tmp_path / "original.docx")
+    document = unpacked_dir / "word" / "document.xml"
+    before = document.read_bytes()
+
+    doc = Document(unpacked_dir, lazy=True, original_docx=original_docx)
+    node = doc["word/document.xml"].get_node(tag="w:p", contains="First")
+    doc.add_comment(start=node, end=node, text="Comment")
+    doc._write_parts()
+
+    # The working copy was hard-linked; writing a part replaced it, never
+    # writing through the link
+    assert document.read_bytes() == before
+    assert not (unpacked_dir / "word" / "comments.xml").exists()
+
+    doc.save()
+    assert _ids(document, "w:commentRangeStart") == ["0"]
+    assert _ids(unpacked_dir / "word" / "comments.xml", "w:comment") == ["0"]
+
+
+def test_open_docx_writes_only_edited_parts(tmp_path, unpacked_dir):
+    docx = zip_package(unpacked_dir, tmp_path / "input.docx")
+
+    doc = Document.open_docx(docx)
+    node = doc["word/document.xml"].get_node(tag="w:p", contains="First")
+    doc.add_comment(start=node, end=node, text="Comment")
+    doc.save_docx(docx)
+
+    overlay = {
+        path.relative_to(doc.unpacked_path).as_posix()
+        for path in doc.unpacked_path.rglob("*")
+        if path.is_file()
+    }
+    assert "_rels/.rels" not in overlay
+    assert {"word/document.xml", "word/comments.xml"} <= overlay
+
+    with zipfile.ZipFile(docx) as zf:
+        assert zf.read("_rels/.rels") == (unpacked_dir / "_rels" / ".rels").read_bytes()
+        assert b"commentRangeStart" in zf.read("word/document.xml")
+        assert b"Comment" in zf.read("word/comments.xml")
+
+    with pytest.raises(ValueError, match="save_docx"):
+        doc.save()
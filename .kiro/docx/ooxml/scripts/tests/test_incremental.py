@@ -0,0 +1,90 @@
+"""
+Tests for incremental validation: what reruns after a part or its .rels changes.
+"""
+
+import pytest
+
+from samples import write_word_package, zip_package
+from validation import DOCXSchemaValidator
+
+R = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
+HYPERLINK = (
+    f'\n    <w:p><w:hyperlink xmlns:r="{R}" r:id="rId5">'
+    "<w:r><w:t>Link</w:t></w:r></w:hyperlink></w:p>"
+)
+
+HYPERLINK_RELATIONSHIP = (
+    '  <Relationship Id="rId5" Type="http://schemas.openxmlformats.org/'
+    'officeDocument/2006/relationships/hyperlink" Target="https://example.com" '
+    'TargetMode="External"/>\n'
+)
+
+
+@pytest.fixture
+def package(tmp_path):
+    unpacked_dir = write_word_package(tmp_path / "unpacked", body=HYPERLINK)
+    rels = unpacked_dir / "word" / "_rels" / "document.xml.rels"
+    rels.write_text(
+        rels.read_text().replace(
+            "</Relationships>", HYPERLINK_RELATIONSHIP + "</Relationships>"
+        )
+    )
+    original = zip_package(unpacked_dir, tmp_path / "original.docx")
+    return unpacked_dir, original, tmp_path / "state.json"
+
+
+def _run(package):
+    unpacked_dir, original, state_file = package
+    validator = DOCXSchemaValidator(unpacked_dir, original, state_file=state_file)
+    passed = validator.validate()
+    return passed, {result.name: result for result in validator.results}
+
+
+def test_unchanged_package_skips_every_check(package):
+    passed, results = _run(package)
+    assert passed and not any(result.skipped for result in results.values())
+
+    passed, results = _run(package)
+    assert passed and all(result.skipped for result in results.values())
+
+
+def test_edited_part_is_checked_again(package):
+    unpacked_dir, _, state_file = package
+    assert _run(package)[0]
+
+    document = unpacked_dir / "word" / "document.xml"
+    document.write_text(
+        document.read_text().replace("<w:body>", "<w:body><w:bogus/>")
+    )
+    passed, results = _run(package)
+
+    assert not passed
+    xsd = results["validate_against_xsd"]
+    assert not xsd.skipped and xsd.files == 1
+    assert [error.file for error in xsd.errors] == ["word/document.xml"]
+    assert "bogus" in xsd.errors[0].message
+    # No .rels changed and no file was added or removed
+    assert results["validate_file_references"].skipped
+
+    # A failed run leaves the state alone, so the error is found again
+    passed, results = _run(package)
+    assert not passed and results["validate_against_xsd"].errors
+
+
+def test_edited_rels_rechecks_the_part_it_belongs_to(package):
+    unpacked_dir, _, _ = package
+    assert _run(package)[0]
+
+    rels = unpacked_dir / "word" / "_rels" / "document.xml.rels"
+    rels.write_text(rels.read_text().replace(HYPERLINK_RELATIONSHIP, ""))
+    passed, results = _run(package)
+
+    assert not passed
+    rids = results["validate_all_relationship_ids"]
+    assert not rids.skipped
+    [error] = rids.errors
+    assert error.file == "word/document.xml" and "rId5" in error.message
+    # Only the .rels changed, so it is the one part validated against XSD
+    assert results["validate_against_xsd"].files == 1
+    assert not results["validate_file_references"].skipped
@@ -0,0 +1,109 @@
+"""
+Golden tests: pack.py's streaming condenser against minidom, and raw copies
+of unchanged parts.
+"""
+
+import random
+import zipfile
+
+import defusedxml.minidom
+import pytest
+
+import pack
+from samples import SAMPLES, W, random_document, write_docx_package, zip_package
+from unpack import unpack_document
+
+
+def _condense_with_minidom(data):
+    return pack._condense_dom(defusedxml.minidom.parseString(data))
+
+
+@pytest.mark.parametrize("name", sorted(SAMPLES))
+def test_condense_matches_minidom(name):
+    data = SAMPLES[name].encode("utf-8")
+    assert pack.condense_xml_bytes(data) == _condense_with_minidom(data)
+
+
+@pytest.mark.parametrize("name", sorted(SAMPLES))
+def test_condense_file_matches_minidom(name, tmp_path):
+    path = tmp_path / "part.xml"
+    path.write_bytes(SAMPLES[name].encode("utf-8"))
+    pack.condense_xml(path)
+    assert path.read_bytes() == _condense_with_minidom(SAMPLES[name].encode("utf-8"))
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_condense_random_documents_match_minidom():
+    rng = random.Random(1234)
+    for _ in range(500):
+        data = random_document(rng).encode("utf-8")
+        assert pack.condense_xml_bytes(data) == _condense_with_minidom(data), data
+
+
+def test_doctype_is_left_to_minidom():
+    with pytest.raises(pack.NeedsDom):
+        pack._condense_stream(
+            lambda parser: parser.Parse(SAMPLES["doctype"], True), lambda data: None
+        )
+
+
+def test_unchanged_parts_are_copied_from_the_original(tmp_path):
+    # Declarations after an attribute, as some producers write them; unpacking
+    # moves them first
+    comments = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        f'<w:comments mc:Ignorable="w14" xmlns:w="{W}" '
+        'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006" '
+        'xmlns:w14="http://schemas.microsoft.com/office/word/2010/wordml">'
+        '<w:comment w:id="0" w:author="A"><w:p><w:r><w:t>Note</w:t></w:r></w:p>'
+        "</w:comment></w:comments>"
+    )
+    source = write_docx_package(tmp_path / "source")
+    (source / "word" / "comments.xml").write_text(comments)
+    original = zip_package(source, tmp_path / "original.docx")
+
+    unpacked = tmp_path / "unpacked"
+    unpack_document(original, unpacked)
+    document = unpacked / "word" / "document.xml"
+    document.write_text(document.read_text().replace("Hello", "Goodbye"))
+    assert pack.pack_document(unpacked, tmp_path / "out.docx", original=original)
+
+    with (
+        zipfile.ZipFile(original) as before,
+        zipfile.ZipFile(tmp_path / "out.docx") as after,
+    ):
+        assert after.namelist() == before.namelist()
+        for info in before.infolist():
+            if info.filename == "word/document.xml":
+                assert b"Goodbye" in after.read(info.filename)
+                continue
+            copied = after.getinfo(info.filename)
+            assert after.read(info.filename) == before.read(info.filename)
+            assert (copied.compress_type, copied.CRC) == (info.compress_type, info.CRC)
+
+
+@pytest.mark.parametrize("with_original", [False, True])
+def test_packing_with_jobs_gives_identical_zips(tmp_path, with_original):
+    source = write_docx_package(tmp_path / "source")
+    for i in range(40):
+        (source / "customXml").mkdir(exist_ok=True)
+        (source / "customXml" / f"item{i}.xml").write_text(
+            f'<w:body xmlns:w="{W}">\n  <w:p><w:r><w:t>Part {i}</w:t></w:r></w:p>\n'
+            "</w:body>"
+        )
+    original = zip_package(source, tmp_path / "original.docx")
+    unpacked = tmp_path / "unpacked"
+    unpack_document(original, unpacked)
+    # Some parts changed, so both raw copies and condensed parts are written
+    for i in range(0, 40, 3):
+        item = unpacked / "customXml" / f"item{i}.xml"
+        item.write_text(item.read_text().replace("Part", "Edited part"))
+
+    outputs = []
+    for jobs in (1, 3):
+        output = tmp_path / f"jobs{jobs}.docx"
+        assert pack.pack_document(
+            unpacked, output, original=original if with_original else None, jobs=jobs
+        )
+        outputs.append(output.read_bytes())
+    assert outputs[0] == outputs[1]
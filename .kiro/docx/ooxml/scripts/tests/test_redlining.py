@@ -0,0 +1,168 @@
+"""
+Tests for the redlining check and the diff it reports with.
+"""
+
+import hashlib
+import random
+from unittest import mock
+
+import pytest
+
+from samples import write_docx_package, zip_package
+from validation import RedliningValidator
+from validation.diff import diff_sequences, word_diff
+
+
+def _change(tag, author, content):
+    return (
+        f'<w:{tag} w:id="1" w:author="{author}" w:date="2024-01-01T00:00:00Z">'
+        f"{content}</w:{tag}>"
+    )
+
+
+def _run(text, tag="t"):
+    return f"<w:r><w:{tag}>{text}</w:{tag}></w:r>"
+
+
+# Paragraph bodies with Claude's and another author's changes nested every way
+NESTED = [
+    # Claude's insertion is left out
+    _run("Hello ") + _change("ins", "Claude", _run("new ")) + _run("world"),
+    # Claude's deletion inside another author's insertion counts, as does
+    # the other author's inserted text
+    _change(
+        "ins",
+        "Other",
+        _run("kept ") + _change("del", "Claude", _run("back", "delText")),
+    ),
+    # Another author's deletion inside Claude's insertion is left out with it
+    _run("Only")
+    + _change("ins", "Claude", _change("del", "Other", _run(" gone", "delText"))),
+    # Another author's deletion on its own is not text
+    _run("Still") + _change("del", "Other", _run(" deleted", "delText")),
+]
+
+# The paragraph texts once Claude's changes are removed
+ORIGINAL = ["Hello world", "kept back", "Only", "Still"]
+
+
+def _document(paragraphs):
+    return "".join(f"\n    <w:p>{body}</w:p>" for body in paragraphs)
+
+
+@pytest.fixture
+def original(tmp_path):
+    directory = write_docx_package(
+        tmp_path / "original", body=_document(_run(text) for text in ORIGINAL)
+    )
+    return zip_package(directory, tmp_path / "original.docx")
+
+
+def test_scan_removes_only_claudes_changes(tmp_path, original):
+    # A paragraph inside Claude's insertion gets no slot at all
+    inserted_paragraph = _change("ins", "Claude", f"<w:p>{_run('Added')}</w:p>")
+    unpacked_dir = write_docx_package(
+        tmp_path / "unpacked", body=_document(NESTED) + inserted_paragraph
+    )
+    validator = RedliningValidator(unpacked_dir, original)
+
+    document = unpacked_dir / "word" / "document.xml"
+    digests, texts, claude_changes = validator._scan_paragraphs(
+        document, wanted=range(6)
+    )
+    assert claude_changes
+    # The sample's own "Hello" paragraph comes last
+    assert texts == dict(enumerate(ORIGINAL + ["Hello"]))
+    assert digests == [
+        hashlib.blake2b(text.encode()).digest() for text in ORIGINAL + ["Hello"]
+    ]
+
+    assert validator.validate()
+
+
+def test_matching_documents_are_not_read_back(tmp_path, original):
+    unpacked_dir = write_docx_package(tmp_path / "unpacked", body=_document(NESTED))
+    validator = RedliningValidator(unpacked_dir, original)
+
+    with mock.patch.object(validator, "_read_paragraphs") as read_paragraphs:
+        assert validator.validate()
+    read_paragraphs.assert_not_called()
+    assert validator.errors == []
+
+
+def test_no_claude_changes_skips_the_original(tmp_path):
+    unpacked_dir = write_docx_package(
+        tmp_path / "unpacked",
+        body=_document([_change("ins", "Other", _run("Theirs"))]),
+    )
+    # The original is never opened
+    validator = RedliningValidator(unpacked_dir, tmp_path / "missing.docx")
+    assert validator.validate()
+
+
+def test_untracked_edit_is_reported_as_a_word_diff(tmp_path, original, capsys):
+    edited = list(NESTED)
+    edited[0] = edited[0].replace("world", "Bye")
+    edited[3] = _run("Stilt")
+    unpacked_dir = write_docx_package(tmp_path / "unpacked", body=_document(edited))
+    validator = RedliningValidator(unpacked_dir, original)
+
+    assert not validator.validate()
+    [error] = validator.errors
+    assert error.file == "word/document.xml"
+    assert list(error.details) == ["Hello [-world-]{+Bye+}", "Stil[-l-]{+t+}"]
+    assert "Hello [-world-]{+Bye+}" in capsys.readouterr().out
+
+
+def test_word_diff_format():
+    original = ["Same", "Paragraph one", "Removed", "Last"]
+    modified = ["Same", "Paragxyzh one", "Last", "Added"]
+    # One line per paragraph; a marker never spans two paragraphs
+    assert word_diff(original, modified).split("\n") == [
+        "Parag[-rap-]{+xyz+}h one",
+        "[-Removed-]",
+        "{+Added+}",
+    ]
+    assert word_diff(["a b", "c"], ["a x"]).split("\n") == [
+        "a [-b-]",
+        "[-c-]{+x+}",
+    ]
+    assert word_diff(original, original) == ""
+
+
+def _apply(a, b, blocks):
+    result = []
+    i = 0
+    for i1, i2, j1, j2 in blocks:
+        assert i <= i1 <= i2 and j1 <= j2
+        result.extend(a[i:i1])
+        result.extend(b[j1:j2])
+        i = i2
+    result.extend(a[i:])
+    return result
+
+
+@pytest.mark.parametrize("patience", [False, True])
+def test_diff_blocks_turn_one_sequence_into_the_other(patience):
+    rng = random.Random(50)
+    for _ in range(300):
+        a = rng.choices("abcdef", k=rng.randint(0, 30))
+        b = list(a)
+        for _ in range(rng.randint(0, 6)):
+            position = rng.randint(0, len(b))
+            if b and rng.random() < 0.5:
+                del b[min(position, len(b) - 1)]
+            else:
+                b.insert(position, rng.choice("abcdefg"))
+        blocks = diff_sequences(a, b, patience=patience)
+        assert _apply(a, b, blocks) == b
+        # Blocks are separated by at least one matching item
+        for (_, i2, _, j2), (i1, _, j1, _) in zip(blocks, blocks[1:]):
+            assert i1 > i2 and j1 > j2
+
+
+def test_diff_gives_up_past_max_edits():
+    a = list("abcdefghij")
+    b = list("ABCDEFGHIJ")
+    assert diff_sequences(a, b, max_edits=5) == [(0, 10, 0, 10)]
+    assert len(diff_sequences(list("xaxbx"), list("xAxBx"))) == 2
@@ -0,0 +1,231 @@
+"""
+Tests for the relationship graph and the single-walk element rules, on a small
+presentation with seeded errors.
+"""
+
+import lxml.etree
+import pytest
+
+from validation import PPTXSchemaValidator
+from validation.relationships import OFFICE_RELATIONSHIPS_NAMESPACE
+
+P = "http://schemas.openxmlformats.org/presentationml/2006/main"
+MC = "http://schemas.openxmlformats.org/markup-compatibility/2006"
+RELS = "http://schemas.openxmlformats.org/package/2006/relationships"
+TYPES = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
+
+def _rels(*relationships):
+    entries = "".join(
+        f'\n  <Relationship Id="{rid}" Type="{TYPES}/{kind}" Target="{target}"/>'
+        for rid, kind, target in relationships
+    )
+    return f'<Relationships xmlns="{RELS}">{entries}\n</Relationships>'
+
+
+def _part(root, body):
+    return (
+        f'<p:{root} xmlns:p="{P}" xmlns:r="{TYPES}" xmlns:mc="{MC}">\n'
+        f"{body}\n</p:{root}>"
+    )
+
+
+PACKAGE = {
+    "[Content_Types].xml": '<Types xmlns="http://schemas.openxmlformats.org/'
+    'package/2006/content-types"/>',
+    "_rels/.rels": _rels(("rId1", "officeDocument", "ppt/presentation.xml")),
+    "ppt/presentation.xml": _part(
+        "presentation",
+        '  <p:sldMasterIdLst><p:sldMasterId id="2147483648" r:id="rId1"/>'
+        "</p:sldMasterIdLst>\n"
+        '  <p:sldIdLst>\n    <p:sldId id="256" r:id="rId2"/>\n  </p:sldIdLst>',
+    ),
+    "ppt/_rels/presentation.xml.rels": _rels(
+        ("rId1", "slideMaster", "slideMasters/slideMaster1.xml"),
+        ("rId2", "slide", "slides/slide1.xml"),
+    ),
+    "ppt/slideMasters/slideMaster1.xml": _part(
+        "sldMaster",
+        '  <p:sldLayoutIdLst>\n    <p:sldLayoutId id="2147483649" r:id="rId1"/>\n'
+        "  </p:sldLayoutIdLst>",
+    ),
+    "ppt/slideMasters/_rels/slideMaster1.xml.rels": _rels(
+        ("rId1", "slideLayout", "../slideLayouts/slideLayout1.xml")
+    ),
+    "ppt/slideLayouts/slideLayout1.xml": _part("sldLayout", ""),
+    "ppt/slideLayouts/_rels/slideLayout1.xml.rels": _rels(
+        ("rId1", "slideMaster", "../slideMasters/slideMaster1.xml")
+    ),
+    "ppt/slides/slide1.xml": _part(
+        "sld",
+        '  <p:sp id="2"/>\n'
+        "  <mc:AlternateContent><mc:Fallback>\n"
+        '    <p:sp id="2"/>\n'
+        "  </mc:Fallback></mc:AlternateContent>",
+    ),
+    "ppt/slides/_rels/slide1.xml.rels": _rels(
+        ("rId1", "slideLayout", "../slideLayouts/slideLayout1.xml")
+    ),
+}
+
+# Edits seeding one error each: part -> (old, new)
+SEEDED_ERRORS = {
+    # Dangling r:id, in presentation.xml and in the slide master
+    "ppt/presentation.xml": (
+        '<p:sldId id="256" r:id="rId2"/>',
+        '<p:sldId id="256" r:id="rId2"/>\n    <p:sldId id="257" r:id="rId9"/>',
+    ),
+    "ppt/slideMasters/slideMaster1.xml": ('r:id="rId1"', 'r:id="rId5"'),
+    # Duplicate relationship ID
+    "ppt/_rels/presentation.xml.rels": (
+        "</Relationships>",
+        f'  <Relationship Id="rId2" Type="{TYPES}/slide" Target="slides/slide1.xml"/>'
+        "\n</Relationships>",
+    ),
+    # Duplicate shape ID outside mc:AlternateContent, and a bad UUID inside it
+    "ppt/slides/slide1.xml": (
+        "  <mc:AlternateContent><mc:Fallback>\n",
+        '  <p:sp id="2"/>\n'
+        "  <mc:AlternateContent><mc:Fallback>\n"
+        '    <p:tag modelId="{1234567G-1234-1234-1234-123456789ABC}"/>\n',
+    ),
+    # Second slideLayout relationship for one slide
+    "ppt/slides/_rels/slide1.xml.rels": (
+        "</Relationships>",
+        f'  <Relationship Id="rId2" Type="{TYPES}/slideLayout" '
+        'Target="../slideLayouts/slideLayout1.xml"/>\n</Relationships>',
+    ),
+}
+
+
+def _write(directory, files):
+    for name, content in files.items():
+        path = directory / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    return directory
+
+
+@pytest.fixture
+def clean(tmp_path):
+    return _write(tmp_path / "clean", PACKAGE)
+
+
+@pytest.fixture
+def broken(tmp_path):
+    files = dict(PACKAGE)
+    for name, (old, new) in SEEDED_ERRORS.items():
+        assert old in files[name]
+        files[name] = files[name].replace(old, new, 1)
+    return _write(tmp_path / "broken", files)
+
+
+def _line(directory, name, needle):
+    lines = (directory / name).read_text().splitlines()
+    return next(number for number, line in enumerate(lines, 1) if needle in line)
+
+
+CHECKS = [
+    "validate_unique_ids",
+    "validate_uuid_ids",
+    "validate_file_references",
+    "validate_all_relationship_ids",
+    "validate_slide_layout_ids",
+    "validate_no_duplicate_slide_layouts",
+]
+
+
+def _run_checks(unpacked_dir):
+    validator = PPTXSchemaValidator(unpacked_dir)
+    for name in CHECKS:
+        validator._run_check(getattr(validator, name))
+    return validator, {
+        result.name: [(error.file, error.line) for error in result.errors]
+        for result in validator.results
+    }
+
+
+def test_clean_package_passes(clean):
+    _, errors = _run_checks(clean)
+    assert errors == {name: [] for name in CHECKS}
+
+
+def test_seeded_errors_are_found(broken):
+    _, errors = _run_checks(broken)
+
+    presentation = "ppt/presentation.xml"
+    master = "ppt/slideMasters/slideMaster1.xml"
+    slide = "ppt/slides/slide1.xml"
+    presentation_rels = "ppt/_rels/presentation.xml.rels"
+    slide_line = _line(broken, slide, 'id="2"') + 1
+    assert errors == {
+        "validate_unique_ids": [(slide, slide_line)],
+        "validate_uuid_ids": [(slide, _line(broken, slide, "modelId"))],
+        # The slide is still reachable: nothing is unreferenced or broken
+        "validate_file_references": [],
+        "validate_all_relationship_ids": [
+            (presentation_rels, _line(broken, presentation_rels, "slide1") + 1),
+            (presentation, _line(broken, presentation, "rId9")),
+            (master, _line(broken, master, "rId5")),
+        ],
+        "validate_slide_layout_ids": [(master, _line(broken, master, "rId5"))],
+        "validate_no_duplicate_slide_layouts": [
+            ("ppt/slides/_rels/slide1.xml.rels", None)
+        ],
+    }
+
+
+@pytest.mark.parametrize("package", ["clean", "broken"])
+def test_graph_matches_a_direct_read(package, request):
+    unpacked_dir = request.getfixturevalue(package)
+    validator = PPTXSchemaValidator(unpacked_dir)
+    graph = validator.relationship_graph
+    rid = f"{{{OFFICE_RELATIONSHIPS_NAMESPACE}}}id"
+
+    for path in graph.files:
+        root = lxml.etree.parse(str(path)).getroot()
+        if path.name.endswith(".rels"):
+            expected = [
+                (rel.get("Id"), rel.get("Target"), rel.sourceline)
+                for rel in root.iter(f"{{{RELS}}}Relationship")
+            ]
+            relationships = graph.relationships(path)
+            assert [
+                (rel.id, rel.target, rel.sourceline) for rel in relationships
+            ] == expected
+            # Targets are relative to the folder holding the _rels folder
+            for rel in relationships:
+                target = (path.parent.parent / rel.target).resolve()
+                assert rel.target_part == target
+        else:
+            expected = [
+                (elem.tag, elem.sourceline)
+                for elem in root.iter()
+                if elem.get(rid) is not None
+            ]
+            references = graph.references(path)
+            assert [(elem.tag, elem.sourceline) for elem in references] == expected
+
+
+@pytest.mark.parametrize("package", ["clean", "broken"])
+def test_single_walk_matches_one_pass_per_rule(package, request):
+    unpacked_dir = request.getfixturevalue(package)
+    validator = PPTXSchemaValidator(unpacked_dir)
+    alternate_content = f"{{{MC}}}AlternateContent"
+
+    for path in validator.xml_files:
+        root = lxml.etree.parse(str(path)).getroot()
+        for name, (local_names, handler, skips) in validator.ELEMENT_RULES.items():
+            expected = []
+            for elem in root.iter(lxml.etree.Element):
+                local_name = elem.tag.split("}")[-1].lower()
+                if local_names is not None and local_name not in local_names:
+                    continue
+                in_alternate_content = any(
+                    node.tag == alternate_content
+                    for node in (elem, *elem.iterancestors())
+                )
+                if skips and in_alternate_content:
+                    continue
+                getattr(validator, handler)(elem, local_name, expected)
+            assert validator._walk_part(path)[name] == expected, (path, name)
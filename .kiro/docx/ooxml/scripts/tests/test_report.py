@@ -0,0 +1,73 @@
+"""
+Tests for the structured results the validators record for each check.
+"""
+
+import json
+
+import pytest
+
+from samples import write_docx_package, zip_package
+from validation import DOCXSchemaValidator
+from validation.report import ValidationReport
+
+
+@pytest.fixture
+def original(tmp_path):
+    return zip_package(
+        write_docx_package(tmp_path / "original"), tmp_path / "original.docx"
+    )
+
+
+def test_xsd_errors_are_recorded_with_file_and_line(tmp_path, original):
+    unpacked_dir = write_docx_package(tmp_path / "unpacked", body="\n<w:bogus/>")
+    validator = DOCXSchemaValidator(unpacked_dir, original)
+
+    assert not validator._run_check(validator.validate_against_xsd)
+
+    result = validator.results[-1]
+    assert result.files == 3  # Every part with a schema
+    [error] = result.errors
+    assert error.file == "word/document.xml"
+    assert error.line == 4
+    assert "bogus" in error.message and "This element is not expected" in error.message
+
+
+def test_printed_errors_are_rendered_from_the_records(tmp_path, original, capsys):
+    unpacked_dir = write_docx_package(
+        tmp_path / "unpacked",
+        body="\n<w:p><w:r><w:t> a</w:t></w:r><w:r><w:t>b </w:t></w:r></w:p>",
+    )
+    validator = DOCXSchemaValidator(unpacked_dir, original)
+
+    assert not validator._run_check(validator.validate_whitespace_preservation)
+
+    result = validator.results[-1]
+    assert result.files == 1  # Only document.xml is checked
+    assert [(error.file, error.line) for error in result.errors] == [
+        ("word/document.xml", 4),
+        ("word/document.xml", 4),
+    ]
+    assert capsys.readouterr().out.splitlines() == [
+        "FAILED - Found 2 whitespace preservation violations:",
+        *(line for error in result.errors for line in error.render()),
+    ]
+
+
+def test_report_serializes_error_records(tmp_path, original):
+    unpacked_dir = write_docx_package(tmp_path / "unpacked", body="\n<w:bogus/>")
+    validator = DOCXSchemaValidator(unpacked_dir, original)
+    assert not validator.validate()
+
+    report = ValidationReport()
+    report.add_validator(validator)
+    report.write_json(tmp_path / "report.json")
+
+    checks = json.loads((tmp_path / "report.json").read_text())["checks"]
+    [xsd] = [check for check in checks if check["name"] == "validate_against_xsd"]
+    [error] = xsd["errors"]
+    assert (error["file"], error["line"], error["details"]) == (
+        "word/document.xml",
+        4,
+        [],
+    )
+    assert "bogus" in error["message"]
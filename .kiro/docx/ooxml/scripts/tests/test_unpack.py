@@ -0,0 +1,68 @@
+"""
+Golden tests: unpack.py's streaming pretty-printer against minidom.
+"""
+
+import io
+import random
+import zipfile
+
+import defusedxml.minidom
+import pytest
+
+import unpack
+from samples import SAMPLES, W, random_document
+
+
+def _pretty_print(text):
+    out = []
+    unpack._pretty_print_stream(io.StringIO(text), out.append)
+    return b"".join(out)
+
+
+def _pretty_print_with_minidom(text):
+    dom = defusedxml.minidom.parseString(text.encode("utf-8"))
+    return dom.toprettyxml(indent="  ", encoding="ascii")
+
+
+@pytest.mark.parametrize("name", sorted(set(SAMPLES) - {"doctype"}))
+def test_pretty_print_matches_minidom(name):
+    assert _pretty_print(SAMPLES[name]) == _pretty_print_with_minidom(SAMPLES[name])
+
+
+def test_pretty_print_random_documents_match_minidom():
+    rng = random.Random(5678)
+    for _ in range(500):
+        text = random_document(rng)
+        assert _pretty_print(text) == _pretty_print_with_minidom(text), text
+
+
+def test_pretty_print_across_read_chunks():
+    # Tags and text runs straddle the 64 KiB reads
+    text = (
+        f'<w:document xmlns:w="{W}"><w:body>'
+        + "<w:p><w:r><w:t> \u00e9 </w:t></w:r>tail<!-- c --></w:p>" * 5000
+        + "<w:t>" + "\u65e5\u672c" * 40000 + "</w:t></w:body></w:document>"
+    )
+    assert _pretty_print(text) == _pretty_print_with_minidom(text)
+
+
+def test_doctype_is_left_to_minidom():
+    with pytest.raises(unpack.NeedsDom):
+        _pretty_print(SAMPLES["doctype"])
+
+
+def test_unpack_document_matches_minidom(tmp_path):
+    parts = {f"word/{name}.xml": text for name, text in SAMPLES.items()}
+    parts["media/image.bin"] = "not xml"
+    office_file = tmp_path / "sample.docx"
+    with zipfile.ZipFile(office_file, "w") as zf:
+        for name, text in parts.items():
+            zf.writestr(name, text.encode("utf-8"))
+
+    unpack.unpack_document(office_file, tmp_path / "out")
+    for name, text in parts.items():
+        written = (tmp_path / "out" / name).read_bytes()
+        if name.endswith(".xml"):
+            assert written == _pretty_print_with_minidom(text), name
+        else:
+            assert written == text.encode("utf-8")
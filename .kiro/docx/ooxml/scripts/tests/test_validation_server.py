@@ -0,0 +1,228 @@
+"""
+Tests for the validation server backends, with the office process mocked.
+"""
+
+import sys
+import threading
+import types
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+import validation_server
+from samples import write_docx_package, zip_package
+from validation_server import ConversionError, UnoBackend
+
+
+class NoConnectException(Exception):
+    pass
+
+
+class FakeProcess:
+    """Stands in for a Popen'd soffice; killed by the patched process group kill."""
+
+    def __init__(self):
+        self.pid = -1
+        self.killed = False
+
+    def poll(self):
+        return -9 if self.killed else None
+
+    def wait(self):
+        return self.poll()
+
+
+@pytest.fixture
+def office(monkeypatch, tmp_path):
+    """Mock the uno bindings and soffice processes for UnoBackend."""
+    resolver = mock.Mock()
+    context = resolver.resolve.return_value
+    desktop = context.ServiceManager.createInstanceWithContext.return_value
+    local = mock.Mock()
+    local.ServiceManager.createInstanceWithContext.return_value = resolver
+
+    uno = types.ModuleType("uno")
+    uno.getComponentContext = lambda: local
+    uno.systemPathToFileUrl = lambda path: "file://" + path
+    connection = types.ModuleType("com.sun.star.connection")
+    connection.NoConnectException = NoConnectException
+    beans = types.ModuleType("com.sun.star.beans")
+    beans.PropertyValue = lambda Name, Value: (Name, Value)
+    modules = {
+        "uno": uno,
+        "com": types.ModuleType("com"),
+        "com.sun": types.ModuleType("com.sun"),
+        "com.sun.star": types.ModuleType("com.sun.star"),
+        "com.sun.star.connection": connection,
+        "com.sun.star.beans": beans,
+    }
+    for name, module in modules.items():
+        monkeypatch.setitem(sys.modules, name, module)
+
+    processes = []
+
+    def popen(*args, **kwargs):
+        processes.append(FakeProcess())
+        return processes[-1]
+
+    def kill(process):
+        process.killed = True
+
+    monkeypatch.setattr(validation_server.subprocess, "Popen", popen)
+    monkeypatch.setattr(validation_server, "_kill_process_group", kill)
+    monkeypatch.setattr(validation_server.time, "sleep", lambda seconds: None)
+
+    backend = UnoBackend()
+    yield types.SimpleNamespace(
+        backend=backend,
+        desktop=desktop,
+        resolver=resolver,
+        processes=processes,
+        out_dir=tmp_path,
+    )
+    backend.close()
+
+
+def test_office_is_started_once_and_reused(office):
+    office.backend.convert(office.out_dir / "a.docx", office.out_dir)
+    office.backend.convert(office.out_dir / "b.docx", office.out_dir)
+
+    assert len(office.processes) == 1
+    assert office.desktop.loadComponentFromURL.call_count == 2
+
+
+def test_abort_kills_the_office_and_next_conversion_restarts_it(office):
+    office.backend.convert(office.out_dir / "a.docx", office.out_dir)
+    office.backend.abort()
+
+    assert office.processes[0].killed
+    assert office.backend._process is None and office.backend._desktop is None
+
+    office.backend.convert(office.out_dir / "b.docx", office.out_dir)
+    assert len(office.processes) == 2
+    assert not office.processes[1].killed
+
+
+def test_dead_office_is_restarted(office):
+    office.backend.convert(office.out_dir / "a.docx", office.out_dir)
+    office.processes[0].killed = True
+
+    office.backend.convert(office.out_dir / "b.docx", office.out_dir)
+    assert len(office.processes) == 2
+
+
+def test_abort_during_startup_fails_the_conversion(office):
+    # The watchdog fires while the office is still coming up: the Desktop the
+    # start-up then gets must not be kept
+    def resolve(url):
+        office.backend.abort()
+        return mock.DEFAULT
+
+    office.resolver.resolve.side_effect = resolve
+    with pytest.raises(ConversionError, match="aborted"):
+        office.backend.convert(office.out_dir / "a.docx", office.out_dir)
+    assert office.processes[0].killed
+    assert office.backend._desktop is None
+
+    office.resolver.resolve.side_effect = None
+    office.backend.convert(office.out_dir / "b.docx", office.out_dir)
+    assert len(office.processes) == 2
+
+
+def test_office_that_exits_during_startup_is_reported(office):
+    def resolve(url):
+        office.processes[-1].killed = True
+        raise NoConnectException()
+
+    office.resolver.resolve.side_effect = resolve
+    with pytest.raises(ConversionError, match="did not start"):
+        office.backend.convert(office.out_dir / "a.docx", office.out_dir)
+    assert office.backend._process is None
+
+
+def test_abort_from_another_thread_while_converting(office):
+    started = threading.Event()
+    release = threading.Event()
+
+    def load(*args):
+        started.set()
+        release.wait(5)
+        raise RuntimeError("connection lost")
+
+    office.desktop.loadComponentFromURL.side_effect = load
+    errors = []
+
+    def convert():
+        try:
+            office.backend.convert(office.out_dir / "a.docx", office.out_dir)
+        except RuntimeError as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=convert)
+    thread.start()
+    assert started.wait(5)
+    office.backend.abort()
+    release.set()
+    thread.join(5)
+
+    assert errors and office.processes[0].killed
+    assert office.backend._process is None
+
+
+def test_slow_office_startup_is_not_charged_to_the_job(office):
+    # Start-up takes longer than the job timeout but stays within startup_timeout
+    def resolve(url):
+        threading.Event().wait(0.3)
+        return mock.DEFAULT
+
+    def store(url, properties):
+        Path(url.removeprefix("file://")).write_text("<html></html>")
+
+    office.resolver.resolve.side_effect = resolve
+    office.desktop.loadComponentFromURL.return_value.storeToURL.side_effect = store
+    server = validation_server.ValidationServer(office.backend, timeout=0.1)
+
+    assert server.submit(office.out_dir / "a.docx").result() is None
+    assert len(office.processes) == 1 and not office.processes[0].killed
+    server.close()
+
+
+def test_watchdog_expiring_after_the_conversion_is_ignored(monkeypatch, tmp_path):
+    class LateTimer:
+        """Fires just as the server cancels it, after convert() returned."""
+
+        def __init__(self, interval, function):
+            self.function = function
+
+        def start(self):
+            pass
+
+        def cancel(self):
+            self.function()
+
+    monkeypatch.setattr(validation_server.threading, "Timer", LateTimer)
+    backend = validation_server.FakeBackend()
+    backend.abort = mock.Mock()
+    server = validation_server.ValidationServer(backend)
+    docx = write_docx_package(tmp_path / "unpacked")
+    zip_package(docx, tmp_path / "a.docx")
+
+    assert server._convert(tmp_path / "a.docx", 10) is None
+    backend.abort.assert_not_called()
+
+
+def test_set_validation_server_closes_the_replaced_server(monkeypatch):
+    monkeypatch.setattr(validation_server, "_validation_server", None)
+    first = validation_server.ValidationServer(validation_server.FakeBackend())
+    second = validation_server.ValidationServer(validation_server.FakeBackend())
+    first.close = mock.Mock()
+    second.close = mock.Mock()
+
+    validation_server.set_validation_server(first)
+    validation_server.set_validation_server(second)
+    first.close.assert_called_once()
+
+    validation_server._close_validation_server()
+    second.close.assert_called_once()
+    assert first.close.call_count == 1
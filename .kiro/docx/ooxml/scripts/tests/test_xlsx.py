@@ -0,0 +1,95 @@
+"""
+Tests for the worksheet checks, streamed and from whole trees.
+"""
+
+import pytest
+
+from validation import XLSXSchemaValidator
+
+S = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+R = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
+CONTENT_TYPES = """<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+  <Default Extension="xml" ContentType="application/xml"/>
+  <Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>
+  <Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>
+</Types>"""
+
+WORKBOOK = f"""<workbook xmlns="{S}" xmlns:r="{R}">
+  <sheets><sheet name="Sheet1" sheetId="1" r:id="rId1"/></sheets>
+</workbook>"""
+
+WORKBOOK_RELS = """<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+  <Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>
+</Relationships>"""
+
+SHEET_RELS = """<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+  <Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/hyperlink" Target="https://example.com" TargetMode="External"/>
+</Relationships>"""
+
+# Cell errors (no shared strings part) on either side of the r:id errors,
+# one of them on an element no fixed list of tags would include
+SHEET = f"""<worksheet xmlns="{S}" xmlns:r="{R}">
+  <sheetData>
+    <row r="1"><c r="A1" t="s"><v>0</v></c></row>
+  </sheetData>
+  <hyperlinks>
+    <hyperlink ref="A1" r:id="rId1"/>
+    <hyperlink ref="A2" r:id="rId7"/>
+  </hyperlinks>
+  <extLst><ext uri="urn:x"><foo xmlns="urn:foo" r:id="rId8"/></ext></extLst>
+</worksheet>"""
+
+
+@pytest.fixture
+def unpacked_dir(tmp_path):
+    files = {
+        "[Content_Types].xml": CONTENT_TYPES,
+        "xl/workbook.xml": WORKBOOK,
+        "xl/_rels/workbook.xml.rels": WORKBOOK_RELS,
+        "xl/worksheets/sheet1.xml": SHEET,
+        "xl/worksheets/_rels/sheet1.xml.rels": SHEET_RELS,
+    }
+    for name, content in files.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    return tmp_path
+
+
+def _errors(result):
+    return [(error.file, error.line, error.message) for error in result.errors]
+
+
+def test_streamed_worksheet_reports_what_the_tree_checks_do(
+    unpacked_dir, monkeypatch, capsys
+):
+    tree = XLSXSchemaValidator(unpacked_dir)
+    assert not tree._run_check(tree.validate_worksheets, streamed=True)
+    assert not tree._run_check(tree.validate_all_relationship_ids)
+    expected = sorted(
+        _errors(tree.results[0]) + _errors(tree.results[1]), key=lambda e: e[1]
+    )
+    capsys.readouterr()
+
+    monkeypatch.setattr(XLSXSchemaValidator, "STREAMING_THRESHOLD", 0)
+    streamed = XLSXSchemaValidator(unpacked_dir)
+    assert streamed.streamed_parts == {unpacked_dir / "xl/worksheets/sheet1.xml"}
+    assert streamed._run_check(streamed.validate_all_relationship_ids)
+    assert not streamed._run_check(streamed.validate_worksheets, streamed=True)
+
+    # Same errors, in document order
+    assert _errors(streamed.results[1]) == expected
+    assert [line for _, line, _ in expected] == [3, 7, 9]
+    assert XLSXSchemaValidator.RELATIONSHIP_ID_HINT.strip() in capsys.readouterr().out
+
+
+def test_other_checks_leave_streamed_worksheets_out(unpacked_dir, monkeypatch):
+    monkeypatch.setattr(XLSXSchemaValidator, "STREAMING_THRESHOLD", 0)
+    validator = XLSXSchemaValidator(unpacked_dir)
+
+    assert validator._run_check(validator.validate_xml)
+    assert not validator._run_check(validator.validate_worksheets, streamed=True)
+
+    assert unpacked_dir / "xl/worksheets/sheet1.xml" not in validator._trees
+    assert validator.results[0].files == 4  # Every part but the worksheet
@@ -1,29 +1,308 @@
 #!/usr/bin/env python3
-"""Unpack and format XML contents of Office files (.docx, .pptx, .xlsx)"""
+"""
+Tool to unpack a .docx, .pptx, or .xlsx file and pretty-print its XML contents.
 
+Example usage:
+    python unpack.py <office_file> <output_directory> [--only <part>] [--jobs N]
+"""
+
+import argparse
+import fnmatch
+import io
 import random
 import sys
 import defusedxml.minidom
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-# Get command line arguments
-assert len(sys.argv) == 3, "Usage: python unpack.py <office_file> <output_dir>"
-input_file, output_dir = sys.argv[1], sys.argv[2]
-
-# Extract and format
-output_path = Path(output_dir)
-output_path.mkdir(parents=True, exist_ok=True)
-zipfile.ZipFile(input_file).extractall(output_path)
-
-# Pretty print all XML files
-xml_files = list(output_path.rglob("*.xml")) + list(output_path.rglob("*.rels"))
-for xml_file in xml_files:
-    content = xml_file.read_text(encoding="utf-8")
-    dom = defusedxml.minidom.parseString(content)
-    xml_file.write_bytes(dom.toprettyxml(indent="  ", encoding="ascii"))
-
-# For .docx files, suggest an RSID for tracked changes
-if input_file.endswith(".docx"):
-    suggested_rsid = "".join(random.choices("0123456789ABCDEF", k=8))
-    print(f"Suggested RSID for edit session: {suggested_rsid}")
+try:
+    from .xml_stream import (
+        NeedsDom,
+        create_parser,
+        escape,
+        is_xml_part,
+        qname,
+        start_tag,
+    )
+except ImportError:
+    # Run as a script from ooxml/scripts
+    from xml_stream import (
+        NeedsDom,
+        create_parser,
+        escape,
+        is_xml_part,
+        qname,
+        start_tag,
+    )
+
+# Zip opened once per worker process by _init_worker()
+_worker_zip = None
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Unpack an Office file and pretty-print its XML"
+    )
+    parser.add_argument("office_file", help="Office file (.docx/.pptx/.xlsx)")
+    parser.add_argument("output_directory", help="Directory to unpack into")
+    parser.add_argument(
+        "--only",
+        action="append",
+        metavar="PART",
+        help="Only pretty-print this part (e.g. word/document.xml; glob patterns "
+        "allowed; repeatable). Other parts are extracted unchanged.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for pretty-printing parts (default: 1)",
+    )
+    args = parser.parse_args()
+
+    try:
+        unpack_document(
+            args.office_file, args.output_directory, only=args.only, jobs=args.jobs
+        )
+    except ValueError as e:
+        sys.exit(f"Error: {e}")
+
+    # For .docx files, suggest an RSID for tracked changes
+    if args.office_file.endswith(".docx"):
+        suggested_rsid = "".join(random.choices("0123456789ABCDEF", k=8))
+        print(f"Suggested RSID for edit session: {suggested_rsid}")
+
+
+def unpack_document(input_file, output_dir, only=None, jobs=1):
+    """Unpack an Office file into a directory, pretty-printing its XML parts.
+
+    Each XML part is streamed from the zip through an incremental pretty-printer,
+    so no part is ever held in memory as a whole string or tree. The output is
+    identical to minidom's toprettyxml(indent="  ", encoding="ascii").
+
+    Args:
+        input_file: Path to the Office file
+        output_dir: Directory to unpack into (created if needed)
+        only: Optional list of part names or glob patterns to pretty-print.
+            Every other part is extracted byte-for-byte.
+        jobs: Number of worker processes used for pretty-printing (default: 1)
+
+    Raises:
+        ValueError: If input_file is not a zip, or a pattern in only matches no part
+    """
+    input_file = Path(input_file)
+    output_path = Path(output_dir)
+
+    if not zipfile.is_zipfile(input_file):
+        raise ValueError(f"{input_file} is not an Office file")
+
+    with zipfile.ZipFile(input_file) as zf:
+        names = [info.filename for info in zf.infolist() if not info.is_dir()]
+        pretty = [name for name in names if is_xml_part(name)]
+        if only:
+            for pattern in only:
+                if not fnmatch.filter(names, pattern):
+                    raise ValueError(f"No part in {input_file} matches {pattern}")
+            pretty = [
+                name
+                for name in pretty
+                if any(fnmatch.fnmatchcase(name, pattern) for pattern in only)
+            ]
+
+        # Everything that is not pretty-printed is extracted as-is
+        output_path.mkdir(parents=True, exist_ok=True)
+        skip = set(pretty)
+        for info in zf.infolist():
+            if info.filename not in skip:
+                zf.extract(info, output_path)
+
+        if jobs > 1 and len(pretty) > 1:
+            targets = [_member_path(output_path, name) for name in pretty]
+            with ProcessPoolExecutor(
+                max_workers=jobs, initializer=_init_worker, initargs=(input_file,)
+            ) as pool:
+                chunksize = max(1, len(pretty) // (jobs * 4))
+                for _ in pool.map(
+                    _pretty_print_in_worker, pretty, targets, chunksize=chunksize
+                ):
+                    pass
+        else:
+            for name in pretty:
+                _pretty_print_member(zf, name, _member_path(output_path, name))
+
+
+def _member_path(output_path, name):
+    """Map a member name into output_path, dropping unsafe components as extract() does."""
+    parts = [part for part in name.split("/") if part not in ("", ".", "..")]
+    return output_path.joinpath(*parts)
+
+
+def _init_worker(input_file):
+    """Open the Office file once per worker process."""
+    global _worker_zip
+    _worker_zip = zipfile.ZipFile(input_file)
+
+
+def _pretty_print_in_worker(name, target):
+    """Pretty-print one member in a worker process."""
+    _pretty_print_member(_worker_zip, name, target)
+
+
+def _pretty_print_member(zf, name, target):
+    """Stream one XML member from zf through the pretty-printer into target."""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        with (
+            zf.open(name) as raw,
+            io.TextIOWrapper(raw, encoding="utf-8") as src,
+            open(target, "wb") as dst,
+        ):
+            _pretty_print_stream(src, dst.write)
+    except NeedsDom:
+        # DOCTYPEs are left to defusedxml
+        with zf.open(name) as raw:
+            content = io.TextIOWrapper(raw, encoding="utf-8").read()
+        dom = defusedxml.minidom.parseString(content)
+        target.write_bytes(dom.toprettyxml(indent="  ", encoding="ascii"))
+
+
+def _pretty_print_stream(src, write, indent="  "):
+    """Pretty-print XML from a text stream, writing ASCII output as it goes.
+
+    Mirrors minidom's toprettyxml(): an element whose only child is one text or
+    CDATA node stays on one line, other children go on their own indented lines
+    (text nodes included, whitespace and all), and non-ASCII characters become
+    character references. Only a pending first text child is held back per
+    open element, so memory is bounded by nesting depth and text length.
+
+    Args:
+        src: Text stream to read XML from
+        write: Callable receiving chunks of ASCII output
+        indent: Indentation added per nesting level
+
+    Raises:
+        NeedsDom: For documents with a DOCTYPE
+    """
+    pieces = ['<?xml version="1.0" encoding="ascii"?>\n']
+    text = []
+    cdata = []
+    # Per open element: [qname, depth indent, state, pending text/CDATA child]
+    # state: 0 = no children, 1 = one text/CDATA child pending, 2 = block layout
+    stack = []
+    ns_decls = []
+    in_cdata = False
+
+    def flush_pieces():
+        write("".join(pieces).encode("ascii", "xmlcharrefreplace"))
+        pieces.clear()
+
+    def block(frame):
+        """Switch an element to one-child-per-line layout."""
+        pieces.append(">\n")
+        if frame[2] == 1:
+            kind, data = frame[3]
+            if kind == "text":
+                pieces.append(escape(frame[1] + indent + data + "\n"))
+            else:
+                pieces.append(f"<![CDATA[{data}]]>")
+            frame[3] = None
+        frame[2] = 2
+
+    def add_inline(kind, data):
+        """Add a text or CDATA child to the current element."""
+        frame = stack[-1]
+        if frame[2] == 0:
+            frame[2] = 1
+            frame[3] = (kind, data)
+            return
+        if frame[2] == 1:
+            block(frame)
+        if kind == "text":
+            pieces.append(escape(frame[1] + indent + data + "\n"))
+        else:
+            pieces.append(f"<![CDATA[{data}]]>")
+
+    def child_indent():
+        """Prepare the current element for a non-text child; return its indent."""
+        if not stack:
+            return ""
+        frame = stack[-1]
+        if frame[2] != 2:
+            block(frame)
+        return frame[1] + indent
+
+    def flush_text():
+        data = "".join(text)
+        text.clear()
+        add_inline("text", data)
+
+    def start(name, attrs):
+        if text:
+            flush_text()
+        depth_indent = child_indent()
+        qualified_name = qname(name)
+        pieces.append(depth_indent + start_tag(qualified_name, ns_decls, attrs))
+        stack.append([qualified_name, depth_indent, 0, None])
+
+    def end(name):
+        if text:
+            flush_text()
+        qualified_name, depth_indent, state, pending = stack.pop()
+        if state == 0:
+            pieces.append("/>\n")
+        elif state == 1:
+            kind, data = pending
+            inline = escape(data) if kind == "text" else f"<![CDATA[{data}]]>"
+            pieces.append(f">{inline}</{qualified_name}>\n")
+        else:
+            pieces.append(f"{depth_indent}</{qualified_name}>\n")
+        if len(pieces) > 4096:
+            flush_pieces()
+
+    def characters(data):
+        if in_cdata:
+            cdata.append(data)
+        else:
+            text.append(data)
+
+    def start_cdata():
+        nonlocal in_cdata
+        in_cdata = True
+
+    def end_cdata():
+        nonlocal in_cdata
+        in_cdata = False
+        # An empty section adds no node, so text on either side of it stays one run
+        if cdata:
+            if text:
+                flush_text()
+            add_inline("cdata", "".join(cdata))
+            cdata.clear()
+
+    def comment(data):
+        if text:
+            flush_text()
+        pieces.append(f"{child_indent()}<!--{data}-->\n")
+
+    def pi(target, data):
+        if text:
+            flush_text()
+        pieces.append(f"{child_indent()}<?{target} {data}?>\n")
+
+    parser = create_parser(ns_decls)
+    parser.StartElementHandler = start
+    parser.EndElementHandler = end
+    parser.CharacterDataHandler = characters
+    parser.StartCdataSectionHandler = start_cdata
+    parser.EndCdataSectionHandler = end_cdata
+    parser.CommentHandler = comment
+    parser.ProcessingInstructionHandler = pi
+    while chunk := src.read(1 << 16):
+        parser.Parse(chunk, False)
+    parser.Parse("", True)
+    flush_pieces()
+
+
+if __name__ == "__main__":
+    main()
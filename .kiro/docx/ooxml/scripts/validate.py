@@ -3,14 +3,17 @@
 Command line tool to validate Office document XML files against XSD schemas and tracked changes.
 
 Usage:
-    python validate.py <dir> --original <original_file>
+    python validate.py <dir> --original <original_file> [--jobs N] [--incremental]
+                       [--no-cache] [--json FILE] [--junit FILE] [--profile]
 """
 
 import argparse
 import sys
 from pathlib import Path
 
-from validation import DOCXSchemaValidator, PPTXSchemaValidator, RedliningValidator
+from validation.batch import VALIDATORS, validate_package
+from validation.cache import enable_xsd_error_cache
+from validation.report import ValidationReport
 
 
 def main():
@@ -30,8 +33,44 @@ def main():
         action="store_true",
         help="Enable verbose output",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for XSD validation (default: 1)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only re-check parts changed since the last successful run of this "
+        "command on the same directory",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Don't reuse or record XSD results in the on-disk cache "
+        "($OOXML_CACHE_DIR, default ~/.cache/ooxml)",
+    )
+    parser.add_argument(
+        "--json",
+        metavar="FILE",
+        help="Write a JSON report of every check (result, timing, errors) to FILE",
+    )
+    parser.add_argument(
+        "--junit",
+        metavar="FILE",
+        help="Write a JUnit XML report with one test case per check to FILE",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print the time spent per check and per file",
+    )
     args = parser.parse_args()
 
+    if not args.no_cache:
+        enable_xsd_error_cache()
+
     # Validate paths
     unpacked_dir = Path(args.unpacked_dir)
     original_file = Path(args.original)
@@ -42,22 +81,27 @@ def main():
         f"Error: {original_file} must be a .docx, .pptx, or .xlsx file"
     )
 
-    # Run validations
-    match file_extension:
-        case ".docx":
-            validators = [DOCXSchemaValidator, RedliningValidator]
-        case ".pptx":
-            validators = [PPTXSchemaValidator]
-        case _:
-            print(f"Error: Validation not supported for file type {file_extension}")
-            sys.exit(1)
-
     # Run validators
-    success = True
-    for V in validators:
-        validator = V(unpacked_dir, original_file, verbose=args.verbose)
-        if not validator.validate():
-            success = False
+    if file_extension not in VALIDATORS:
+        print(f"Error: Validation not supported for file type {file_extension}")
+        sys.exit(1)
+
+    report = ValidationReport()
+    success = validate_package(
+        unpacked_dir,
+        original_file,
+        report,
+        verbose=args.verbose,
+        jobs=args.jobs,
+        incremental=args.incremental,
+    )
+
+    if args.json:
+        report.write_json(args.json)
+    if args.junit:
+        report.write_junit(args.junit)
+    if args.profile:
+        report.print_profile()
 
     if success:
         print("All validations PASSED!")
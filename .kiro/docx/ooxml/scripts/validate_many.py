@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Command line tool to validate many Office documents in one process.
+
+Usage:
+    python validate_many.py --manifest <file> [--jobs N] [--json FILE] [--junit FILE]
+    python validate_many.py --packages <dir> [--jobs N] [--json FILE] [--junit FILE]
+
+A manifest lists one document per line: an unpacked directory and its original
+file separated by a tab, or just an Office file to check on its own.
+"""
+
+import argparse
+import sys
+
+from validation import validate_many
+from validation.batch import find_packages, read_manifest
+from validation.cache import enable_xsd_error_cache
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Validate many Office documents in one warm process"
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
+        "--manifest",
+        help="File listing <unpacked_dir>TAB<original_file> (or <office_file>) "
+        "per line",
+    )
+    source.add_argument(
+        "--packages",
+        metavar="DIR",
+        help="Directory of .docx/.pptx/.xlsx files, each unpacked and checked on its own",
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        help="Enable verbose output",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes, each validating whole documents (default: 1)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only re-check parts changed since the last successful run on "
+        "each unpacked directory",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Don't reuse or record XSD results in the on-disk cache "
+        "($OOXML_CACHE_DIR, default ~/.cache/ooxml)",
+    )
+    parser.add_argument(
+        "--json",
+        metavar="FILE",
+        help="Write a JSON report of every check of every document to FILE",
+    )
+    parser.add_argument(
+        "--junit",
+        metavar="FILE",
+        help="Write a JUnit XML report with one test suite per document and "
+        "validator to FILE",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print the time spent per check and per file",
+    )
+    args = parser.parse_args()
+
+    if not args.no_cache:
+        enable_xsd_error_cache()
+
+    if args.manifest:
+        packages = read_manifest(args.manifest)
+    else:
+        packages = find_packages(args.packages)
+    if not packages:
+        print("Error: No documents to validate")
+        sys.exit(1)
+
+    report = validate_many(
+        packages, jobs=args.jobs, verbose=args.verbose, incremental=args.incremental
+    )
+
+    if args.json:
+        report.write_json(args.json)
+    if args.junit:
+        report.write_junit(args.junit)
+    if args.profile:
+        report.print_profile()
+
+    documents = report.documents()
+    failed = [document for document, passed in documents.items() if not passed]
+    print(f"\nValidated {len(documents)} documents: {len(failed)} failed")
+    for document in failed:
+        print(f"  FAILED - {document}")
+    if not failed:
+        print("All validations PASSED!")
+
+    sys.exit(0 if not failed else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,13 +3,17 @@ Validation modules for Word document processing.
 """
 
 from .base import BaseSchemaValidator
+from .batch import validate_many
 from .docx import DOCXSchemaValidator
 from .pptx import PPTXSchemaValidator
 from .redlining import RedliningValidator
+from .xlsx import XLSXSchemaValidator
 
 __all__ = [
     "BaseSchemaValidator",
     "DOCXSchemaValidator",
     "PPTXSchemaValidator",
     "RedliningValidator",
+    "XLSXSchemaValidator",
+    "validate_many",
 ]
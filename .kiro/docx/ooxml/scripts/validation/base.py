@@ -2,11 +2,38 @@
 Base validator with common validation logic for document files.
 """
 
+import copy
+import fnmatch
+import functools
+import hashlib
+import json
+import os
 import re
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import lxml.etree
 
+from .cache import (
+    CACHE_VERSION,
+    enable_xsd_error_cache,
+    get_xsd_error_cache,
+    set_xsd_error_cache,
+)
+from .package import get_original_package
+from .relationships import RelationshipGraph
+from .report import CheckResult, ErrorRecord
+
+# Compiled XSD schemas shared by every validator in the process, by schema path
+_schema_cache = {}
+
+# Digest of each schema and everything it imports or includes, by schema path
+_schema_digests = {}
+
+# Validator built once per worker process by _init_xsd_worker()
+_worker_validator = None
+
 
 class BaseSchemaValidator:
     """Base validator with common validation logic for document files."""
@@ -37,6 +64,15 @@ class BaseSchemaValidator:
         "grpsp": ("id", "file"),  # Group shape IDs
     }
 
+    # Per-element rules applied in a single walk over each part (see _walk_part()):
+    # rule name -> (lowercase local names the rule handles, or None for every
+    # element; handler method name; whether mc:AlternateContent is skipped)
+    # Handlers are called as handler(elem, local_name, findings) and append what
+    # they find to the rule's findings list, which its check then reports on.
+    ELEMENT_RULES = {
+        "unique_ids": (frozenset(UNIQUE_ID_REQUIREMENTS), "_unique_id_rule", True),
+    }
+
     # Mapping of element names to expected relationship types
     # Subclasses should override this with format-specific mappings
     ELEMENT_RELATIONSHIP_TYPES = {}
@@ -81,6 +117,14 @@ class BaseSchemaValidator:
         "http://schemas.openxmlformats.org/package/2006/content-types"
     )
 
+    # Printed after relationship ID errors
+    RELATIONSHIP_ID_HINT = (
+        "\nThese ID mismatches will cause the document to appear corrupt!"
+    )
+
+    # Template placeholders stripped from text before XSD validation
+    TEMPLATE_TAG_PATTERN = re.compile(r"\{\{[^}]*\}\}")
+
     # Folders where we should clean ignorable namespaces
     MAIN_CONTENT_FOLDERS = {"word", "ppt", "xl"}
 
@@ -103,10 +147,46 @@ class BaseSchemaValidator:
         "http://www.w3.org/XML/1998/namespace",
     }
 
-    def __init__(self, unpacked_dir, original_file, verbose=False):
+    # How each check depends on the package, used by incremental runs:
+    # check name -> (scope, triggers, rerun when files are added or removed)
+    #   scope: "parts" re-checks only changed parts, "parts+rels" also parts
+    #       whose .rels changed, None skips the check unless it is triggered
+    #   triggers: glob patterns; any changed file matching one reruns the check
+    #       on the whole package
+    # Checks not listed here rerun on the whole package whenever anything changed.
+    INCREMENTAL_CHECKS = {
+        "validate_xml": ("parts", (), False),
+        "validate_namespaces": ("parts", (), False),
+        # Globally unique IDs (sldMasterId, sldLayoutId) live in these parts
+        "validate_unique_ids": (
+            "parts",
+            ("ppt/presentation.xml", "ppt/slideMasters/*"),
+            False,
+        ),
+        "validate_file_references": (None, ("*.rels",), True),
+        "validate_content_types": ("parts", ("[[]Content_Types].xml",), True),
+        "validate_against_xsd": ("parts", (), False),
+        "validate_all_relationship_ids": ("parts+rels", (), False),
+    }
+
+    # Bump when the state file format changes
+    STATE_VERSION = 1
+
+    def __init__(
+        self,
+        unpacked_dir,
+        original_file=None,
+        verbose=False,
+        jobs=1,
+        state_file=None,
+    ):
         self.unpacked_dir = Path(unpacked_dir).resolve()
-        self.original_file = Path(original_file)
+        # Only the XSD and paragraph-count checks compare against the original;
+        # without one every XSD error is reported
+        self.original_file = Path(original_file) if original_file else None
         self.verbose = verbose
+        # Worker processes for XSD validation (1 validates in this process)
+        self.jobs = jobs
 
         # Set schemas directory
         self.schemas_dir = Path(__file__).parent.parent.parent / "schemas"
@@ -120,10 +200,280 @@ class BaseSchemaValidator:
         if not self.xml_files:
             print(f"Warning: No XML files found in {self.unpacked_dir}")
 
+        # Parsed trees shared by every check in this run (see _parse())
+        self._trees = {}
+        self.parse_time = 0.0
+        # Built on first use by the relationship checks (see relationship_graph)
+        self._relationship_graph = None
+        # ELEMENT_RULES findings per part, and the rules that apply per Clark tag
+        self._findings = {}
+        self._rules_by_tag = {}
+
+        # CheckResult of every check run through _run_check(), and seconds
+        # spent per file: path -> {"parse"|"rules"|"xsd"|...: seconds}
+        self.results = []
+        self.file_times = {}
+        # ErrorRecords found by the check being run, and the files it has
+        # examined (see _run_check())
+        self.errors = []
+        self._examined = set()
+
+        # Incremental mode: files changed since the last successful run, or
+        # None to check everything (see _run_check())
+        self.state_file = Path(state_file) if state_file else None
+        self._changed = None
+        self._added_or_removed = False
+        if self.state_file is not None:
+            self._load_state()
+
     def validate(self):
         """Run all validation checks and return True if all pass."""
         raise NotImplementedError("Subclasses must implement the validate method")
 
+    def _parse(self, xml_file):
+        """Parse a file in unpacked_dir once per validator and return the tree.
+
+        Every check reads parts through this cache, so each file is parsed
+        exactly once no matter how many checks look at it. The trees are
+        shared: checks must not modify them. A parse error is cached as well
+        and raised again on every call.
+
+        Args:
+            xml_file: Path to a file in unpacked_dir
+
+        Returns:
+            lxml.etree._ElementTree: The parsed document
+
+        Raises:
+            lxml.etree.XMLSyntaxError: If the file is not well-formed
+        """
+        xml_file = Path(xml_file)
+        self._examined.add(xml_file)
+        cached = self._trees.get(xml_file)
+        if cached is None:
+            start = time.perf_counter()
+            try:
+                cached = lxml.etree.parse(str(xml_file))
+            except Exception as e:
+                cached = e
+            elapsed = time.perf_counter() - start
+            self.parse_time += elapsed
+            self.file_times.setdefault(xml_file, {})["parse"] = elapsed
+            self._trees[xml_file] = cached
+        if isinstance(cached, Exception):
+            raise cached
+        return cached
+
+    @property
+    def relationship_graph(self):
+        """Relationship graph of unpacked_dir, built once per run (see validation.relationships)."""
+        if self._relationship_graph is None:
+            self._relationship_graph = RelationshipGraph(
+                self.unpacked_dir, self._parse, self._examined.add
+            )
+        return self._relationship_graph
+
+    def _file_signatures(self):
+        """Map every file in unpacked_dir to a signature of its content.
+
+        XML parts are hashed; other files (media) use size and mtime so large
+        binaries are never read.
+        """
+        signatures = {}
+        for file_path in self.unpacked_dir.rglob("*"):
+            if not file_path.is_file():
+                continue
+            name = file_path.relative_to(self.unpacked_dir).as_posix()
+            if name.endswith((".xml", ".rels")):
+                digest = hashlib.sha256(file_path.read_bytes()).hexdigest()
+                signatures[name] = digest
+            else:
+                stat = file_path.stat()
+                signatures[name] = f"{stat.st_size}:{stat.st_mtime_ns}"
+        return signatures
+
+    def _state_header(self):
+        """Describe what the stored results are valid for."""
+        original = None
+        if self.original_file is not None and self.original_file.exists():
+            stat = self.original_file.stat()
+            original = [
+                str(self.original_file.resolve()),
+                stat.st_mtime_ns,
+                stat.st_size,
+            ]
+        return {
+            "version": self.STATE_VERSION,
+            "validator": type(self).__name__,
+            "original": original,
+        }
+
+    def _load_state(self):
+        """Work out which files changed since the last successful run."""
+        self._signatures = self._file_signatures()
+        try:
+            state = json.loads(self.state_file.read_text())
+        except (OSError, ValueError):
+            return  # No usable state: check everything
+        if state.get("header") != self._state_header():
+            return
+
+        previous = state.get("files", {})
+        current = self._signatures
+        added_or_removed = set(previous) ^ set(current)
+        modified = {
+            name
+            for name in current
+            if name in previous and previous[name] != current[name]
+        }
+        self._added_or_removed = bool(added_or_removed)
+        self._changed = {
+            self.unpacked_dir / name for name in added_or_removed | modified
+        }
+        if self.verbose:
+            print(
+                f"Incremental: {len(self._changed)} of {len(current)} files "
+                "changed since the last successful run"
+            )
+
+    def _save_state(self):
+        """Record the files as of this run, after every check passed."""
+        if self.state_file is None:
+            return
+        state = {"header": self._state_header(), "files": self._signatures}
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = self.state_file.with_name(f".{self.state_file.name}.tmp")
+        temp_file.write_text(json.dumps(state))
+        os.replace(temp_file, self.state_file)
+
+    def _run_check(self, check):
+        """Run one validate_* check, limited to what changed in incremental mode.
+
+        Without state from a previous successful run this is just check().
+        Otherwise INCREMENTAL_CHECKS decides whether the check is skipped,
+        run on the changed parts only, or run on the whole package. Either
+        way a CheckResult is added to results, with the errors the check
+        recorded and the number of files it examined.
+
+        Args:
+            check: Bound validate_* method
+
+        Returns:
+            bool: The check's result (True if it was skipped)
+        """
+        result = CheckResult(type(self).__name__, check.__name__)
+        self.results.append(result)
+
+        files = self._incremental_files(check)
+        if files is not None and not files:
+            result.skipped = True
+            return True
+
+        all_files = self.xml_files
+        if files is not None:
+            self.xml_files = files
+        trees_before = len(self._trees)
+        self.errors = []
+        self._examined.clear()
+        try:
+            return result.run(check)
+        finally:
+            self.xml_files = all_files
+            result.parses = len(self._trees) - trees_before
+            result.files = len(self._examined)
+            result.errors = self.errors
+
+    def _incremental_files(self, check):
+        """Return the files an incremental run must check, or None for all of them."""
+        if self._changed is None:
+            return None
+
+        scope, triggers, on_added_or_removed = self.INCREMENTAL_CHECKS.get(
+            check.__name__, (None, ("*",), True)
+        )
+        changed_names = [
+            path.relative_to(self.unpacked_dir).as_posix() for path in self._changed
+        ]
+        if (on_added_or_removed and self._added_or_removed) or any(
+            fnmatch.filter(changed_names, pattern) for pattern in triggers
+        ):
+            return None
+        if scope is None:
+            return []
+
+        files = [f for f in self.xml_files if f in self._changed]
+        if scope == "parts+rels":
+            files += [
+                f
+                for f in self.xml_files
+                if f not in self._changed
+                and f.parent / "_rels" / f"{f.name}.rels" in self._changed
+            ]
+        return files
+
+    def _error(self, message, path=None, line=None, details=()):
+        """Build an ErrorRecord for a file in unpacked_dir (or for no file)."""
+        if path is not None:
+            path = Path(path)
+            if path.is_absolute():
+                path = path.relative_to(self.unpacked_dir)
+            path = path.as_posix()
+        return ErrorRecord(message, path, line, details)
+
+    def _fail(self, summary, errors, hint=None, lines=None):
+        """Record a failed check's errors and print them under its FAILED line.
+
+        Args:
+            summary: Rest of the "FAILED - ..." line
+            errors: ErrorRecords the check found
+            hint: Printed after the errors, if given
+            lines: Lines printed for the errors instead of their render()
+
+        Returns:
+            bool: False, for the check to return
+        """
+        self.errors.extend(errors)
+        print(f"FAILED - {summary}")
+        if lines is None:
+            lines = [line for error in errors for line in error.render()]
+        for line in lines:
+            print(line)
+        if hint:
+            print(hint)
+        return False
+
+    def _report_timing(self, total_time):
+        """Print how a validation run split between parsing and checking."""
+        if self.verbose:
+            print(
+                f"Timing: parsed {len(self._trees)} files in {self.parse_time:.3f}s, "
+                f"checks took {total_time - self.parse_time:.3f}s"
+            )
+
+    def validate_structure(self):
+        """Run the package-level checks that need neither schemas nor the original.
+
+        This is the fast tier: it catches what makes a package unopenable
+        (malformed XML, a missing [Content_Types].xml, dangling or unreferenced
+        parts, unknown relationship IDs) in milliseconds, so callers can fail
+        before paying for XSD validation or an soffice render.
+
+        Returns:
+            bool: True if all structural checks pass
+        """
+        # Nothing else is meaningful on XML that does not parse
+        if not self.validate_xml():
+            return False
+
+        all_valid = True
+        if not self.validate_content_types():
+            all_valid = False
+        if not self.validate_file_references():
+            all_valid = False
+        if not self.validate_all_relationship_ids():
+            all_valid = False
+        return all_valid
+
     def validate_xml(self):
         """Validate that all XML files are well-formed."""
         errors = []
@@ -131,23 +481,14 @@ class BaseSchemaValidator:
         for xml_file in self.xml_files:
             try:
                 # Try to parse the XML file
-                lxml.etree.parse(str(xml_file))
+                self._parse(xml_file)
             except lxml.etree.XMLSyntaxError as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                    f"Line {e.lineno}: {e.msg}"
-                )
+                errors.append(self._error(e.msg, xml_file, e.lineno))
             except Exception as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                    f"Unexpected error: {str(e)}"
-                )
+                errors.append(self._error(f"Unexpected error: {str(e)}", xml_file))
 
         if errors:
-            print(f"FAILED - Found {len(errors)} XML violations:")
-            for error in errors:
-                print(error)
-            return False
+            return self._fail(f"Found {len(errors)} XML violations:", errors)
         else:
             if self.verbose:
                 print("PASSED - All XML files are well-formed")
@@ -159,7 +500,7 @@ class BaseSchemaValidator:
 
         for xml_file in self.xml_files:
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
+                root = self._parse(xml_file).getroot()
                 declared = set(root.nsmap.keys()) - {None}  # Exclude default namespace
 
                 for attr_val in [
@@ -167,22 +508,92 @@ class BaseSchemaValidator:
                 ]:
                     undeclared = set(attr_val.split()) - declared
                     errors.extend(
-                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                        f"Namespace '{ns}' in Ignorable but not declared"
+                        self._error(
+                            f"Namespace '{ns}' in Ignorable but not declared", xml_file
+                        )
                         for ns in undeclared
                     )
             except lxml.etree.XMLSyntaxError:
                 continue
 
         if errors:
-            print(f"FAILED - {len(errors)} namespace issues:")
-            for error in errors:
-                print(error)
-            return False
+            return self._fail(f"{len(errors)} namespace issues:", errors)
         if self.verbose:
             print("PASSED - All namespace prefixes properly declared")
         return True
 
+    def _walk_part(self, xml_file):
+        """Apply every ELEMENT_RULES rule to a part in one walk over its elements.
+
+        Which rules apply to a tag is worked out once per Clark tag, so a rule
+        that only handles a few element names costs one dict lookup per element.
+        The findings are memoized per part for the checks that report them.
+
+        Args:
+            xml_file: Path to a part in unpacked_dir
+
+        Returns:
+            dict: rule name -> list of findings, in document order
+
+        Raises:
+            lxml.etree.XMLSyntaxError: If the part is not well-formed
+        """
+        findings = self._findings.get(xml_file)
+        if findings is not None:
+            self._examined.add(xml_file)
+            return findings
+
+        root = self._parse(xml_file).getroot()
+        start = time.perf_counter()
+        findings = {name: [] for name in self.ELEMENT_RULES}
+        rules_by_tag = self._rules_by_tag
+        alternate_content = f"{{{self.MC_NAMESPACE}}}AlternateContent"
+        # mc:AlternateContent subtrees (the shared tree must not be modified, so
+        # rules that skip them are not called there rather than removing them)
+        skipped = set()
+
+        for elem in root.iter(lxml.etree.Element):
+            tag = elem.tag
+            if tag == alternate_content and elem not in skipped:
+                skipped.update(elem.iter())
+            rules = rules_by_tag.get(tag)
+            if rules is None:
+                rules = rules_by_tag[tag] = self._rules_for_tag(tag)
+            if not rules:
+                continue
+            in_alternate_content = bool(skipped) and elem in skipped
+            for name, handler, skips_alternate_content, local_name in rules:
+                if in_alternate_content and skips_alternate_content:
+                    continue
+                handler(elem, local_name, findings[name])
+
+        self.file_times.setdefault(xml_file, {})["rules"] = (
+            time.perf_counter() - start
+        )
+        self._findings[xml_file] = findings
+        return findings
+
+    def _rules_for_tag(self, tag):
+        """Return the ELEMENT_RULES entries that handle elements with a Clark tag."""
+        local_name = tag.split("}")[-1].lower()
+        return tuple(
+            (name, getattr(self, handler), skips_alternate_content, local_name)
+            for name, (local_names, handler, skips_alternate_content) in (
+                self.ELEMENT_RULES.items()
+            )
+            if local_names is None or local_name in local_names
+        )
+
+    def _unique_id_rule(self, elem, tag, findings):
+        """Record the ID of an element listed in UNIQUE_ID_REQUIREMENTS."""
+        attr_name, scope = self.UNIQUE_ID_REQUIREMENTS[tag]
+
+        # Look for the specified attribute
+        for attr, value in elem.attrib.items():
+            if attr.split("}")[-1].lower() == attr_name:
+                findings.append((tag, attr_name, scope, value, elem.sourceline))
+                return
+
     def validate_unique_ids(self):
         """Validate that specific IDs are unique according to OOXML requirements."""
         errors = []
@@ -190,85 +601,51 @@ class BaseSchemaValidator:
 
         for xml_file in self.xml_files:
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                file_ids = {}  # Track IDs that must be unique within this file
+                findings = self._walk_part(xml_file)["unique_ids"]
+            except Exception as e:
+                errors.append(self._error(f"Error: {e}", xml_file))
+                continue
 
-                # Remove all mc:AlternateContent elements from the tree
-                mc_elements = root.xpath(
-                    ".//mc:AlternateContent", namespaces={"mc": self.MC_NAMESPACE}
-                )
-                for elem in mc_elements:
-                    elem.getparent().remove(elem)
-
-                # Now check IDs in the cleaned tree
-                for elem in root.iter():
-                    # Get the element name without namespace
-                    tag = (
-                        elem.tag.split("}")[-1].lower()
-                        if "}" in elem.tag
-                        else elem.tag.lower()
-                    )
+            file_ids = {}  # Track IDs that must be unique within this file
 
-                    # Check if this element type has ID uniqueness requirements
-                    if tag in self.UNIQUE_ID_REQUIREMENTS:
-                        attr_name, scope = self.UNIQUE_ID_REQUIREMENTS[tag]
-
-                        # Look for the specified attribute
-                        id_value = None
-                        for attr, value in elem.attrib.items():
-                            attr_local = (
-                                attr.split("}")[-1].lower()
-                                if "}" in attr
-                                else attr.lower()
+            for tag, attr_name, scope, id_value, line in findings:
+                if scope == "global":
+                    # Check global uniqueness
+                    if id_value in global_ids:
+                        prev_file, prev_line, prev_tag = global_ids[id_value]
+                        errors.append(
+                            self._error(
+                                f"Global ID '{id_value}' in <{tag}> already used "
+                                f"in {prev_file} at line {prev_line} in <{prev_tag}>",
+                                xml_file,
+                                line,
                             )
-                            if attr_local == attr_name:
-                                id_value = value
-                                break
-
-                        if id_value is not None:
-                            if scope == "global":
-                                # Check global uniqueness
-                                if id_value in global_ids:
-                                    prev_file, prev_line, prev_tag = global_ids[
-                                        id_value
-                                    ]
-                                    errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: Global ID '{id_value}' in <{tag}> "
-                                        f"already used in {prev_file} at line {prev_line} in <{prev_tag}>"
-                                    )
-                                else:
-                                    global_ids[id_value] = (
-                                        xml_file.relative_to(self.unpacked_dir),
-                                        elem.sourceline,
-                                        tag,
-                                    )
-                            elif scope == "file":
-                                # Check file-level uniqueness
-                                key = (tag, attr_name)
-                                if key not in file_ids:
-                                    file_ids[key] = {}
-
-                                if id_value in file_ids[key]:
-                                    prev_line = file_ids[key][id_value]
-                                    errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: Duplicate {attr_name}='{id_value}' in <{tag}> "
-                                        f"(first occurrence at line {prev_line})"
-                                    )
-                                else:
-                                    file_ids[key][id_value] = elem.sourceline
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+                        )
+                    else:
+                        global_ids[id_value] = (
+                            xml_file.relative_to(self.unpacked_dir),
+                            line,
+                            tag,
+                        )
+                elif scope == "file":
+                    # Check file-level uniqueness
+                    ids = file_ids.setdefault((tag, attr_name), {})
+                    if id_value in ids:
+                        errors.append(
+                            self._error(
+                                f"Duplicate {attr_name}='{id_value}' in <{tag}> "
+                                f"(first occurrence at line {ids[id_value]})",
+                                xml_file,
+                                line,
+                            )
+                        )
+                    else:
+                        ids[id_value] = line
 
         if errors:
-            print(f"FAILED - Found {len(errors)} ID uniqueness violations:")
-            for error in errors:
-                print(error)
-            return False
+            return self._fail(
+                f"Found {len(errors)} ID uniqueness violations:", errors
+            )
         else:
             if self.verbose:
                 print("PASSED - All required IDs are unique")
@@ -279,105 +656,67 @@ class BaseSchemaValidator:
         Validate that all .rels files properly reference files and that all files are referenced.
         """
         errors = []
+        graph = self.relationship_graph
 
-        # Find all .rels files
-        rels_files = list(self.unpacked_dir.rglob("*.rels"))
-
-        if not rels_files:
+        if not graph.rels_files:
             if self.verbose:
                 print("PASSED - No .rels files found")
             return True
 
         # Get all files in the unpacked directory (excluding reference files)
-        all_files = []
-        for file_path in self.unpacked_dir.rglob("*"):
-            if (
-                file_path.is_file()
-                and file_path.name != "[Content_Types].xml"
-                and not file_path.name.endswith(".rels")
-            ):  # This file is not referenced by .rels
-                all_files.append(file_path.resolve())
+        all_files = [
+            file_path
+            for file_path in graph.files
+            if file_path.name != "[Content_Types].xml"
+            and not file_path.name.endswith(".rels")
+        ]
 
         # Track all files that are referenced by any .rels file
         all_referenced_files = set()
 
         if self.verbose:
             print(
-                f"Found {len(rels_files)} .rels files and {len(all_files)} target files"
+                f"Found {len(graph.rels_files)} .rels files and {len(all_files)} target files"
             )
 
         # Check each .rels file
-        for rels_file in rels_files:
+        for rels_file in graph.rels_files:
             try:
-                # Parse relationships file
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
-
-                # Get the directory where this .rels file is located
-                rels_dir = rels_file.parent
-
-                # Find all relationships and their targets
-                referenced_files = set()
                 broken_refs = []
 
-                for rel in rels_root.findall(
-                    ".//ns:Relationship",
-                    namespaces={"ns": self.PACKAGE_RELATIONSHIPS_NAMESPACE},
-                ):
-                    target = rel.get("Target")
-                    if target and not target.startswith(
-                        ("http", "mailto:")
-                    ):  # Skip external URLs
-                        # Resolve the target path relative to the .rels file location
-                        if rels_file.name == ".rels":
-                            # Root .rels file - targets are relative to unpacked_dir
-                            target_path = self.unpacked_dir / target
-                        else:
-                            # Other .rels files - targets are relative to their parent's parent
-                            # e.g., word/_rels/document.xml.rels -> targets relative to word/
-                            base_dir = rels_dir.parent
-                            target_path = base_dir / target
-
-                        # Normalize the path and check if it exists
-                        try:
-                            target_path = target_path.resolve()
-                            if target_path.exists() and target_path.is_file():
-                                referenced_files.add(target_path)
-                                all_referenced_files.add(target_path)
-                            else:
-                                broken_refs.append((target, rel.sourceline))
-                        except (OSError, ValueError):
-                            broken_refs.append((target, rel.sourceline))
+                # External URLs are not part of the package
+                for rel in graph.relationships(rels_file):
+                    if not rel.internal:
+                        continue
+                    if rel.target_part is not None:
+                        all_referenced_files.add(rel.target_part)
+                    else:
+                        broken_refs.append((rel.target, rel.sourceline))
 
                 # Report broken references
-                if broken_refs:
-                    rel_path = rels_file.relative_to(self.unpacked_dir)
-                    for broken_ref, line_num in broken_refs:
-                        errors.append(
-                            f"  {rel_path}: Line {line_num}: Broken reference to {broken_ref}"
-                        )
+                errors.extend(
+                    self._error(f"Broken reference to {broken_ref}", rels_file, line)
+                    for broken_ref, line in broken_refs
+                )
 
             except Exception as e:
-                rel_path = rels_file.relative_to(self.unpacked_dir)
-                errors.append(f"  Error parsing {rel_path}: {e}")
+                errors.append(self._error(f"Error parsing: {e}", rels_file))
 
         # Check for unreferenced files (files that exist but are not referenced anywhere)
         unreferenced_files = set(all_files) - all_referenced_files
 
         if unreferenced_files:
             for unref_file in sorted(unreferenced_files):
-                unref_rel_path = unref_file.relative_to(self.unpacked_dir)
-                errors.append(f"  Unreferenced file: {unref_rel_path}")
+                errors.append(self._error("Unreferenced file", unref_file))
 
         if errors:
-            print(f"FAILED - Found {len(errors)} relationship validation errors:")
-            for error in errors:
-                print(error)
-            print(
-                "CRITICAL: These errors will cause the document to appear corrupt. "
+            return self._fail(
+                f"Found {len(errors)} relationship validation errors:",
+                errors,
+                hint="CRITICAL: These errors will cause the document to appear corrupt. "
                 + "Broken references MUST be fixed, "
-                + "and unreferenced files MUST be referenced or removed."
+                + "and unreferenced files MUST be referenced or removed.",
             )
-            return False
         else:
             if self.verbose:
                 print(
@@ -390,9 +729,8 @@ class BaseSchemaValidator:
         Validate that all r:id attributes in XML files reference existing IDs
         in their corresponding .rels files, and optionally validate relationship types.
         """
-        import lxml.etree
-
         errors = []
+        graph = self.relationship_graph
 
         # Process each XML file that might contain r:id references
         for xml_file in self.xml_files:
@@ -400,48 +738,34 @@ class BaseSchemaValidator:
             if xml_file.suffix == ".rels":
                 continue
 
-            # Determine the corresponding .rels file
-            # For dir/file.xml, it's dir/_rels/file.xml.rels
-            rels_dir = xml_file.parent / "_rels"
-            rels_file = rels_dir / f"{xml_file.name}.rels"
-
             # Skip if there's no corresponding .rels file (that's okay)
-            if not rels_file.exists():
+            rels_file = graph.rels_file_for(xml_file)
+            if rels_file is None:
                 continue
 
             try:
-                # Parse the .rels file to get valid relationship IDs and their types
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
+                # Valid relationship IDs and their types
                 rid_to_type = {}
 
-                for rel in rels_root.findall(
-                    f".//{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
-                ):
-                    rid = rel.get("Id")
-                    rel_type = rel.get("Type", "")
-                    if rid:
+                for rel in graph.relationships(rels_file):
+                    if rel.id:
                         # Check for duplicate rIds
-                        if rid in rid_to_type:
-                            rels_rel_path = rels_file.relative_to(self.unpacked_dir)
+                        if rel.id in rid_to_type:
                             errors.append(
-                                f"  {rels_rel_path}: Line {rel.sourceline}: "
-                                f"Duplicate relationship ID '{rid}' (IDs must be unique)"
+                                self._error(
+                                    f"Duplicate relationship ID '{rel.id}' "
+                                    "(IDs must be unique)",
+                                    rels_file,
+                                    rel.sourceline,
+                                )
                             )
                         # Extract just the type name from the full URL
-                        type_name = (
-                            rel_type.split("/")[-1] if "/" in rel_type else rel_type
-                        )
-                        rid_to_type[rid] = type_name
-
-                # Parse the XML file to find all r:id references
-                xml_root = lxml.etree.parse(str(xml_file)).getroot()
+                        rid_to_type[rel.id] = rel.type.split("/")[-1]
 
-                # Find all elements with r:id attributes
-                for elem in xml_root.iter():
-                    # Check for r:id attribute (relationship ID)
+                # Elements with r:id attributes (relationship IDs)
+                for elem in graph.references(xml_file):
                     rid_attr = elem.get(f"{{{self.OFFICE_RELATIONSHIPS_NAMESPACE}}}id")
                     if rid_attr:
-                        xml_rel_path = xml_file.relative_to(self.unpacked_dir)
                         elem_name = (
                             elem.tag.split("}")[-1] if "}" in elem.tag else elem.tag
                         )
@@ -449,9 +773,12 @@ class BaseSchemaValidator:
                         # Check if the ID exists
                         if rid_attr not in rid_to_type:
                             errors.append(
-                                f"  {xml_rel_path}: Line {elem.sourceline}: "
-                                f"<{elem_name}> references non-existent relationship '{rid_attr}' "
-                                f"(valid IDs: {', '.join(sorted(rid_to_type.keys())[:5])}{'...' if len(rid_to_type) > 5 else ''})"
+                                self._error(
+                                    f"<{elem_name}> references non-existent relationship '{rid_attr}' "
+                                    f"(valid IDs: {', '.join(sorted(rid_to_type.keys())[:5])}{'...' if len(rid_to_type) > 5 else ''})",
+                                    xml_file,
+                                    elem.sourceline,
+                                )
                             )
                         # Check if we have type expectations for this element
                         elif self.ELEMENT_RELATIONSHIP_TYPES:
@@ -463,21 +790,23 @@ class BaseSchemaValidator:
                                 # Check if the actual type matches or contains the expected type
                                 if expected_type not in actual_type.lower():
                                     errors.append(
-                                        f"  {xml_rel_path}: Line {elem.sourceline}: "
-                                        f"<{elem_name}> references '{rid_attr}' which points to '{actual_type}' "
-                                        f"but should point to a '{expected_type}' relationship"
+                                        self._error(
+                                            f"<{elem_name}> references '{rid_attr}' which points to '{actual_type}' "
+                                            f"but should point to a '{expected_type}' relationship",
+                                            xml_file,
+                                            elem.sourceline,
+                                        )
                                     )
 
             except Exception as e:
-                xml_rel_path = xml_file.relative_to(self.unpacked_dir)
-                errors.append(f"  Error processing {xml_rel_path}: {e}")
+                errors.append(self._error(f"Error processing: {e}", xml_file))
 
         if errors:
-            print(f"FAILED - Found {len(errors)} relationship ID reference errors:")
-            for error in errors:
-                print(error)
-            print("\nThese ID mismatches will cause the document to appear corrupt!")
-            return False
+            return self._fail(
+                f"Found {len(errors)} relationship ID reference errors:",
+                errors,
+                hint=self.RELATIONSHIP_ID_HINT,
+            )
         else:
             if self.verbose:
                 print("PASSED - All relationship ID references are valid")
@@ -526,12 +855,15 @@ class BaseSchemaValidator:
         # Find [Content_Types].xml file
         content_types_file = self.unpacked_dir / "[Content_Types].xml"
         if not content_types_file.exists():
-            print("FAILED - [Content_Types].xml file not found")
-            return False
+            return self._fail(
+                "[Content_Types].xml file not found",
+                [self._error("File not found", "[Content_Types].xml")],
+                lines=[],
+            )
 
         try:
             # Parse and get all declared parts and extensions
-            root = lxml.etree.parse(str(content_types_file)).getroot()
+            root = self._parse(content_types_file).getroot()
             declared_parts = set()
             declared_extensions = set()
 
@@ -593,12 +925,15 @@ class BaseSchemaValidator:
                     continue
 
                 try:
-                    root_tag = lxml.etree.parse(str(xml_file)).getroot().tag
+                    root_tag = self._parse(xml_file).getroot().tag
                     root_name = root_tag.split("}")[-1] if "}" in root_tag else root_tag
 
                     if root_name in declarable_roots and path_str not in declared_parts:
                         errors.append(
-                            f"  {path_str}: File with <{root_name}> root not declared in [Content_Types].xml"
+                            self._error(
+                                f"File with <{root_name}> root not declared in [Content_Types].xml",
+                                path_str,
+                            )
                         )
 
                 except Exception:
@@ -618,19 +953,21 @@ class BaseSchemaValidator:
                 if extension and extension not in declared_extensions:
                     # Check if it's a known media extension that should be declared
                     if extension in media_extensions:
-                        relative_path = file_path.relative_to(self.unpacked_dir)
                         errors.append(
-                            f'  {relative_path}: File with extension \'{extension}\' not declared in [Content_Types].xml - should add: <Default Extension="{extension}" ContentType="{media_extensions[extension]}"/>'
+                            self._error(
+                                f"File with extension '{extension}' not declared in [Content_Types].xml - should add: "
+                                f'<Default Extension="{extension}" ContentType="{media_extensions[extension]}"/>',
+                                file_path,
+                            )
                         )
 
         except Exception as e:
-            errors.append(f"  Error parsing [Content_Types].xml: {e}")
+            errors.append(self._error(f"Error parsing: {e}", content_types_file))
 
         if errors:
-            print(f"FAILED - Found {len(errors)} content type declaration errors:")
-            for error in errors:
-                print(error)
-            return False
+            return self._fail(
+                f"Found {len(errors)} content type declaration errors:", errors
+            )
         else:
             if self.verbose:
                 print(
@@ -646,7 +983,9 @@ class BaseSchemaValidator:
             verbose: Enable verbose output
 
         Returns:
-            tuple: (is_valid, new_errors_set) where is_valid is True/False/None (skipped)
+            tuple: (is_valid, new_errors) where is_valid is True/False/None
+                (skipped) and new_errors maps each error message not in the
+                original to the line it first occurs on (or None)
         """
         # Resolve both paths to handle symlinks
         xml_file = Path(xml_file).resolve()
@@ -658,16 +997,20 @@ class BaseSchemaValidator:
         )
 
         if is_valid is None:
-            return None, set()  # Skipped
+            return None, {}  # Skipped
         elif is_valid:
-            return True, set()  # Valid, no errors
+            return True, {}  # Valid, no errors
 
         # Get errors from original file for this specific file
         original_errors = self._get_original_file_errors(xml_file)
 
-        # Compare with original (both are guaranteed to be sets here)
+        # Compare messages with the original (line numbers may have moved)
         assert current_errors is not None
-        new_errors = current_errors - original_errors
+        new_errors = {
+            message: line
+            for message, line in current_errors.items()
+            if message not in original_errors
+        }
 
         if new_errors:
             if verbose:
@@ -683,25 +1026,30 @@ class BaseSchemaValidator:
                 print(
                     f"PASSED - No new errors (original had {len(current_errors)} errors)"
                 )
-            return True, set()
+            return True, {}
 
     def validate_against_xsd(self):
-        """Validate XML files against XSD schemas, showing only new errors compared to original."""
+        """Validate XML files against XSD schemas, showing only new errors compared to original.
+
+        Every new error is recorded with its file and line. The report groups
+        them by file, showing the first three messages of each.
+        """
         new_errors = []
+        lines = []
         original_error_count = 0
         valid_count = 0
         skipped_count = 0
 
-        for xml_file in self.xml_files:
+        for xml_file, (is_valid, new_file_errors) in zip(
+            self.xml_files, self._xsd_results()
+        ):
             relative_path = str(xml_file.relative_to(self.unpacked_dir))
-            is_valid, new_file_errors = self.validate_file_against_xsd(
-                xml_file, verbose=False
-            )
 
             if is_valid is None:
                 skipped_count += 1
                 continue
-            elif is_valid and not new_file_errors:
+            self._examined.add(xml_file)
+            if is_valid and not new_file_errors:
                 valid_count += 1
                 continue
             elif is_valid:
@@ -711,9 +1059,15 @@ class BaseSchemaValidator:
                 continue
 
             # Has new errors
-            new_errors.append(f"  {relative_path}: {len(new_file_errors)} new error(s)")
-            for error in list(new_file_errors)[:3]:  # Show first 3 errors
-                new_errors.append(
+            new_errors.extend(
+                self._error(message, xml_file, line)
+                for message, line in sorted(
+                    new_file_errors.items(), key=lambda item: (item[1] or 0, item[0])
+                )
+            )
+            lines.append(f"  {relative_path}: {len(new_file_errors)} new error(s)")
+            for error in sorted(new_file_errors)[:3]:  # Show first 3 errors
+                lines.append(
                     f"    - {error[:250]}..." if len(error) > 250 else f"    - {error}"
                 )
 
@@ -725,19 +1079,54 @@ class BaseSchemaValidator:
             if original_error_count:
                 print(f"  - With original errors (ignored): {original_error_count}")
             print(
-                f"  - With NEW errors: {len(new_errors) > 0 and len([e for e in new_errors if not e.startswith('    ')]) or 0}"
+                f"  - With NEW errors: {len({error.file for error in new_errors})}"
             )
 
         if new_errors:
-            print("\nFAILED - Found NEW validation errors:")
-            for error in new_errors:
-                print(error)
-            return False
+            print()
+            return self._fail("Found NEW validation errors:", new_errors, lines=lines)
         else:
             if self.verbose:
                 print("\nPASSED - No new XSD validation errors introduced")
             return True
 
+    def _xsd_results(self):
+        """Yield validate_file_against_xsd() results for xml_files, in order.
+
+        With jobs > 1 the files are sharded across a process pool. Each worker
+        builds its own validator, and with it its own compiled schemas and
+        original-part memo; results come back in xml_files order, so the
+        report is the same as a serial run. The time each file took is
+        recorded in file_times.
+        """
+        if self.jobs <= 1 or len(self.xml_files) < 2:
+            for xml_file in self.xml_files:
+                start = time.perf_counter()
+                result = self.validate_file_against_xsd(xml_file, verbose=False)
+                self.file_times.setdefault(xml_file, {})["xsd"] = (
+                    time.perf_counter() - start
+                )
+                yield result
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=self.jobs,
+            initializer=_init_xsd_worker,
+            initargs=(
+                type(self),
+                self.unpacked_dir,
+                self.original_file,
+                cache.path if (cache := get_xsd_error_cache()) else None,
+            ),
+        ) as pool:
+            chunksize = max(1, len(self.xml_files) // (self.jobs * 4))
+            for xml_file, (result, elapsed) in zip(
+                self.xml_files,
+                pool.map(_validate_file_in_worker, self.xml_files, chunksize=chunksize),
+            ):
+                self.file_times.setdefault(xml_file, {})["xsd"] = elapsed
+                yield result
+
     def _get_schema_path(self, xml_file):
         """Determine the appropriate schema path for an XML file."""
         # Check exact filename match
@@ -762,189 +1151,278 @@ class BaseSchemaValidator:
 
         return None
 
-    def _clean_ignorable_namespaces(self, xml_doc):
-        """Remove attributes and elements not in allowed namespaces."""
-        # Create a clean copy
-        xml_string = lxml.etree.tostring(xml_doc, encoding="unicode")
-        xml_copy = lxml.etree.fromstring(xml_string)
-
-        # Remove attributes not in allowed namespaces
-        for elem in xml_copy.iter():
-            attrs_to_remove = []
-
-            for attr in elem.attrib:
-                # Check if attribute is from a namespace other than allowed ones
-                if "{" in attr:
-                    ns = attr.split("}")[0][1:]
-                    if ns not in self.OOXML_NAMESPACES:
-                        attrs_to_remove.append(attr)
-
-            # Remove collected attributes
-            for attr in attrs_to_remove:
-                del elem.attrib[attr]
+    def _preprocess_for_xsd(self, xml_doc, clean_namespaces):
+        """Prepare a copy of a part for XSD validation in a single walk.
 
-        # Remove elements not in allowed namespaces
-        self._remove_ignorable_elements(xml_copy)
+        The tree is copied once and then, in one pass over the copy:
 
-        return lxml.etree.ElementTree(xml_copy)
+        - template tags ({{ ... }} placeholders for content replacement) are
+          removed from text and tail content, except inside w:t-style elements
+        - the mc:Ignorable attribute is removed from the root
+        - if clean_namespaces, attributes and elements from namespaces outside
+          OOXML_NAMESPACES are removed
 
-    def _remove_ignorable_elements(self, root):
-        """Recursively remove all elements not in allowed namespaces."""
-        elements_to_remove = []
+        Args:
+            xml_doc: Parsed part; it is not modified, so it may be a shared tree
+            clean_namespaces: Whether to strip foreign namespaces
 
-        # Find elements to remove
-        for elem in list(root):
-            # Skip non-element nodes (comments, processing instructions, etc.)
-            if not hasattr(elem, "tag") or callable(elem.tag):
+        Returns:
+            lxml.etree._ElementTree: The preprocessed copy
+        """
+        root = copy.deepcopy(xml_doc.getroot())
+        root.attrib.pop(f"{{{self.MC_NAMESPACE}}}Ignorable", None)
+
+        template_pattern = self.TEMPLATE_TAG_PATTERN
+        foreign = {}  # tag or attribute name -> outside OOXML_NAMESPACES
+        foreign_elements = []
+        # Elements only: comments and processing instructions are left alone
+        for elem in root.iter(lxml.etree.Element):
+            tag = elem.tag
+
+            # Text of w:t elements (and their tails) is left alone
+            if not tag.endswith("}t") and tag != "t":
+                text = elem.text
+                if text and "{{" in text:
+                    elem.text = template_pattern.sub("", text)
+                tail = elem.tail
+                if tail and "{{" in tail:
+                    elem.tail = template_pattern.sub("", tail)
+
+            if not clean_namespaces:
                 continue
+            for name in (tag, *elem.attrib):
+                if name not in foreign:
+                    foreign[name] = (
+                        name.startswith("{")
+                        and name[1:].split("}", 1)[0] not in self.OOXML_NAMESPACES
+                    )
+            for attr in [attr for attr in elem.attrib if foreign[attr]]:
+                del elem.attrib[attr]
+            if foreign[tag] and elem is not root:
+                foreign_elements.append(elem)
 
-            tag_str = str(elem.tag)
-            if tag_str.startswith("{"):
-                ns = tag_str.split("}")[0][1:]
-                if ns not in self.OOXML_NAMESPACES:
-                    elements_to_remove.append(elem)
-                    continue
-
-            # Recursively clean child elements
-            self._remove_ignorable_elements(elem)
-
-        # Remove collected elements
-        for elem in elements_to_remove:
-            root.remove(elem)
+        # Removing an element takes its subtree and tail text with it
+        for elem in foreign_elements:
+            elem.getparent().remove(elem)
 
-    def _preprocess_for_mc_ignorable(self, xml_doc):
-        """Preprocess XML to handle mc:Ignorable attribute properly."""
-        # Remove mc:Ignorable attributes before validation
-        root = xml_doc.getroot()
+        return lxml.etree.ElementTree(root)
 
-        # Remove mc:Ignorable attribute from root
-        if f"{{{self.MC_NAMESPACE}}}Ignorable" in root.attrib:
-            del root.attrib[f"{{{self.MC_NAMESPACE}}}Ignorable"]
+    def _load_schema(self, schema_path):
+        """Compile an XSD schema once per process and return the cached copy.
 
-        return xml_doc
+        Compiling wml.xsd with its imports is the most expensive step of XSD
+        validation, so every file and every original file checked against the
+        same schema reuses one compiled XMLSchema. Schemas are not safe to use
+        from several threads at once.
 
-    def _validate_single_file_xsd(self, xml_file, base_path):
-        """Validate a single XML file against XSD schema. Returns (is_valid, errors_set)."""
-        schema_path = self._get_schema_path(xml_file)
-        if not schema_path:
-            return None, None  # Skip file
+        Args:
+            schema_path: Path to the .xsd file
 
-        try:
-            # Load schema
+        Returns:
+            lxml.etree.XMLSchema: The compiled schema
+        """
+        key = str(Path(schema_path).resolve())
+        schema = _schema_cache.get(key)
+        if schema is None:
             with open(schema_path, "rb") as xsd_file:
                 parser = lxml.etree.XMLParser()
                 xsd_doc = lxml.etree.parse(
                     xsd_file, parser=parser, base_url=str(schema_path)
                 )
-                schema = lxml.etree.XMLSchema(xsd_doc)
+            schema = _schema_cache[key] = lxml.etree.XMLSchema(xsd_doc)
+        return schema
 
-            # Load and preprocess XML
-            with open(xml_file, "r") as f:
-                xml_doc = lxml.etree.parse(f)
+    def _schema_digest(self, schema_path):
+        """Hash a schema together with every schema it imports or includes.
 
-            xml_doc, _ = self._remove_template_tags_from_text_nodes(xml_doc)
-            xml_doc = self._preprocess_for_mc_ignorable(xml_doc)
+        Memoized per process, like the compiled schemas in _schema_cache.
 
-            # Clean ignorable namespaces if needed
-            relative_path = xml_file.relative_to(base_path)
-            if (
-                relative_path.parts
-                and relative_path.parts[0] in self.MAIN_CONTENT_FOLDERS
-            ):
-                xml_doc = self._clean_ignorable_namespaces(xml_doc)
+        Args:
+            schema_path: Path to the top-level .xsd file
 
-            # Validate
-            if schema.validate(xml_doc):
-                return True, set()
-            else:
-                errors = set()
-                for error in schema.error_log:
-                    # Store normalized error message (without line numbers for comparison)
-                    errors.add(error.message)
-                return False, errors
+        Returns:
+            str: Hex digest over the paths and bytes of the whole schema set
+        """
+        key = str(Path(schema_path).resolve())
+        digest = _schema_digests.get(key)
+        if digest is None:
+            hasher = hashlib.sha256()
+            seen = set()
+            pending = [Path(key)]
+            while pending:
+                path = pending.pop()
+                if path in seen or not path.is_file():
+                    continue
+                seen.add(path)
+                data = path.read_bytes()
+                hasher.update(f"{path}\0".encode())
+                hasher.update(hashlib.sha256(data).digest())
+                for location in lxml.etree.fromstring(data).xpath(
+                    "/xs:schema/*[self::xs:import or self::xs:include "
+                    "or self::xs:redefine]/@schemaLocation",
+                    namespaces={"xs": "http://www.w3.org/2001/XMLSchema"},
+                ):
+                    pending.append((path.parent / location).resolve())
+            digest = _schema_digests[key] = hasher.hexdigest()
+        return digest
+
+    def _validate_single_file_xsd(self, xml_file, base_path):
+        """Validate a single XML file against XSD schema.
+
+        Returns:
+            tuple: (is_valid, {error message: first line or None}), or
+                (None, None) if the file has no schema
+        """
+        schema_path = self._get_schema_path(xml_file)
+        if not schema_path:
+            return None, None  # Skip file
 
+        try:
+            # The cleanup before validation works on a copy, so files in
+            # unpacked_dir can come from the shared tree cache
+            if base_path == self.unpacked_dir:
+                load_tree = functools.partial(self._parse, xml_file)
+            else:
+                load_tree = functools.partial(lxml.etree.parse, str(xml_file))
+            return self._validate_part_xsd(
+                xml_file.read_bytes,
+                load_tree,
+                xml_file.relative_to(base_path),
+                schema_path,
+            )
         except Exception as e:
-            return False, {str(e)}
+            return False, {str(e): None}
 
-    def _get_original_file_errors(self, xml_file):
-        """Get XSD validation errors from a single file in the original document.
+    def _validate_part_xsd(self, read_data, load_tree, relative_path, schema_path):
+        """Validate a part, reusing a cached result for identical bytes.
+
+        The cache (see get_xsd_error_cache()) is keyed on the part's bytes and
+        on a digest of the schema with every schema it imports, so editing any
+        of them invalidates the results. Without a cache the bytes are not read.
 
         Args:
-            xml_file: Path to the XML file in unpacked_dir to check
+            read_data: Callable returning the part's bytes (only hashed)
+            load_tree: Callable returning the parsed part, called on a cache miss
+            relative_path: Part path inside the package
+            schema_path: Path to the XSD schema for the part
 
         Returns:
-            set: Set of error messages from the original file
+            tuple: (is_valid, {error message: first line or None})
         """
-        import tempfile
-        import zipfile
+        cache = get_xsd_error_cache()
+        if cache is None:
+            return self._validate_tree_xsd(load_tree(), relative_path, schema_path)
 
-        # Resolve both paths to handle symlinks (e.g., /var vs /private/var on macOS)
-        xml_file = Path(xml_file).resolve()
-        unpacked_dir = self.unpacked_dir.resolve()
-        relative_path = xml_file.relative_to(unpacked_dir)
+        # Whether foreign namespaces get stripped also changes the result
+        cleaned = bool(
+            relative_path.parts and relative_path.parts[0] in self.MAIN_CONTENT_FOLDERS
+        )
+        schema_key = f"{CACHE_VERSION}:{self._schema_digest(schema_path)}:{cleaned}"
+        digest = hashlib.sha256(read_data()).hexdigest()
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
+        errors = cache.get(schema_key, digest)
+        if errors is None:
+            _, errors = self._validate_tree_xsd(load_tree(), relative_path, schema_path)
+            cache.put(schema_key, digest, errors)
+        return not errors, errors
 
-            # Extract original file
-            with zipfile.ZipFile(self.original_file, "r") as zip_ref:
-                zip_ref.extractall(temp_path)
+    def _validate_tree_xsd(self, xml_doc, relative_path, schema_path):
+        """Validate a parsed part against an XSD schema.
 
-            # Find corresponding file in original
-            original_xml_file = temp_path / relative_path
+        Errors are keyed by message, which is what is compared with the
+        original; the copy validated keeps the part's line numbers.
 
-            if not original_xml_file.exists():
-                # File didn't exist in original, so no original errors
-                return set()
+        Returns:
+            tuple: (is_valid, {error message: first line it occurs on})
+        """
+        schema = self._load_schema(schema_path)
 
-            # Validate the specific file in original
-            is_valid, errors = self._validate_single_file_xsd(
-                original_xml_file, temp_path
-            )
-            return errors if errors else set()
+        # Preprocess a copy of the XML, cleaning ignorable namespaces if needed
+        xml_doc = self._preprocess_for_xsd(
+            xml_doc,
+            clean_namespaces=bool(
+                relative_path.parts
+                and relative_path.parts[0] in self.MAIN_CONTENT_FOLDERS
+            ),
+        )
+
+        # Validate
+        if schema.validate(xml_doc):
+            return True, {}
+        else:
+            errors = {}
+            for error in schema.error_log:
+                errors.setdefault(error.message, error.line or None)
+            return False, errors
+
+    @property
+    def original_package(self):
+        """Shared, lazily read view of original_file (see validation.package)."""
+        return get_original_package(self.original_file)
+
+    def _get_original_file_errors(self, xml_file):
+        """Get XSD validation errors from a single file in the original document.
 
-    def _remove_template_tags_from_text_nodes(self, xml_doc):
-        """Remove template tags from XML text nodes and collect warnings.
+        The part is read straight from the original zip, and its error set is
+        memoized on the shared OriginalPackage, so each original part is parsed
+        and validated at most once per process.
 
-        Template tags follow the pattern {{ ... }} and are used as placeholders
-        for content replacement. They should be removed from text content before
-        XSD validation while preserving XML structure.
+        Args:
+            xml_file: Path to the XML file in unpacked_dir to check
 
         Returns:
-            tuple: (cleaned_xml_doc, warnings_list)
+            dict: Error messages of the original file (see _validate_tree_xsd()),
+                empty if there is no original file
         """
-        warnings = []
-        template_pattern = re.compile(r"\{\{[^}]*\}\}")
-
-        # Create a copy of the document to avoid modifying the original
-        xml_string = lxml.etree.tostring(xml_doc, encoding="unicode")
-        xml_copy = lxml.etree.fromstring(xml_string)
-
-        def process_text_content(text, content_type):
-            if not text:
-                return text
-            matches = list(template_pattern.finditer(text))
-            if matches:
-                for match in matches:
-                    warnings.append(
-                        f"Found template tag in {content_type}: {match.group()}"
-                    )
-                return template_pattern.sub("", text)
-            return text
+        if self.original_file is None:
+            return {}
 
-        # Process all text nodes in the document
-        for elem in xml_copy.iter():
-            # Skip processing if this is a w:t element
-            if not hasattr(elem, "tag") or callable(elem.tag):
-                continue
-            tag_str = str(elem.tag)
-            if tag_str.endswith("}t") or tag_str == "t":
-                continue
-
-            elem.text = process_text_content(elem.text, "text content")
-            elem.tail = process_text_content(elem.tail, "tail content")
+        # Resolve both paths to handle symlinks (e.g., /var vs /private/var on macOS)
+        xml_file = Path(xml_file).resolve()
+        unpacked_dir = self.unpacked_dir.resolve()
+        relative_path = xml_file.relative_to(unpacked_dir)
 
-        return lxml.etree.ElementTree(xml_copy), warnings
+        package = self.original_package
+        schema_path = self._get_schema_path(relative_path)
+        key = (relative_path.as_posix(), str(schema_path))
+        if key not in package.xsd_errors:
+            errors = {}
+            try:
+                # A part that didn't exist in the original has no original errors
+                name = relative_path.as_posix()
+                data = package.read(name)
+                if data is not None and schema_path is not None:
+                    _, errors = self._validate_part_xsd(
+                        lambda: data,
+                        functools.partial(package.parse, name),
+                        relative_path,
+                        schema_path,
+                    )
+            except Exception as e:
+                errors = {str(e): None}
+            package.xsd_errors[key] = errors
+        return package.xsd_errors[key]
+
+
+def _init_xsd_worker(validator_class, unpacked_dir, original_file, cache_path):
+    """Build the validator a worker process checks its share of files with."""
+    global _worker_validator
+    if cache_path is None:
+        set_xsd_error_cache(None)
+    else:
+        enable_xsd_error_cache(cache_path)
+    _worker_validator = validator_class(unpacked_dir, original_file)
+
+
+def _validate_file_in_worker(xml_file):
+    """Run validate_file_against_xsd() for one file in a worker process.
+
+    Returns:
+        tuple: (validate_file_against_xsd() result, seconds it took)
+    """
+    start = time.perf_counter()
+    result = _worker_validator.validate_file_against_xsd(xml_file, verbose=False)
+    return result, time.perf_counter() - start
 
 
 if __name__ == "__main__":
@@ -0,0 +1,261 @@
+"""
+Validate many Office documents in one warm process or worker pool.
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from .base import BaseSchemaValidator
+from .cache import (
+    default_state_file,
+    enable_xsd_error_cache,
+    get_xsd_error_cache,
+    set_xsd_error_cache,
+)
+from .docx import DOCXSchemaValidator
+from .pptx import PPTXSchemaValidator
+from .redlining import RedliningValidator
+from .report import CheckResult, ErrorRecord, ValidationReport
+from .xlsx import XLSXSchemaValidator
+
+# Validators run for each type of original file, in order
+VALIDATORS = {
+    ".docx": (DOCXSchemaValidator, RedliningValidator),
+    ".pptx": (PPTXSchemaValidator,),
+    ".xlsx": (XLSXSchemaValidator,),
+}
+
+
+def validate_package(
+    unpacked_dir,
+    original_file,
+    report,
+    verbose=False,
+    jobs=1,
+    incremental=False,
+    document=None,
+    baseline=True,
+):
+    """Run every validator for the type of original_file on an unpacked package.
+
+    Args:
+        unpacked_dir: Unpacked document directory
+        original_file: Original .docx/.pptx/.xlsx the package is compared against
+        report: ValidationReport the check results are added to
+        verbose: Print passing checks too
+        jobs: Worker processes for XSD validation within the document
+        incremental: Only re-check what changed since the last successful run
+        document: Label for the results in report (None for a single document)
+        baseline: Whether original_file is a baseline to compare against. If
+            False it only gives the document type: every XSD error is
+            reported and the validators that need an original (redlining)
+            are skipped.
+
+    Returns:
+        bool: True if every validator passed
+
+    Raises:
+        ValueError: If original_file is not a supported type
+    """
+    file_extension = Path(original_file).suffix.lower()
+    if file_extension not in VALIDATORS:
+        raise ValueError(f"Validation not supported for file type {file_extension}")
+
+    success = True
+    for V in VALIDATORS[file_extension]:
+        if not baseline and not issubclass(V, BaseSchemaValidator):
+            continue
+        options = {}
+        if issubclass(V, BaseSchemaValidator):
+            options["jobs"] = jobs
+            if incremental:
+                options["state_file"] = default_state_file(unpacked_dir, V.__name__)
+        validator = V(
+            unpacked_dir,
+            original_file if baseline else None,
+            verbose=verbose,
+            **options,
+        )
+        if isinstance(validator, BaseSchemaValidator):
+            passed = validator.validate()
+            report.add_validator(validator, document)
+        else:
+            # Other validators run as a single check
+            result = CheckResult(V.__name__, "validate")
+            result.document = document
+            passed = result.run(validator.validate)
+            result.errors = validator.errors
+            report.results.append(result)
+        if not passed:
+            success = False
+    return success
+
+
+def validate_many(packages, jobs=1, verbose=False, incremental=False):
+    """Validate many documents and collect the results in one report.
+
+    Every document is validated in the same warm process, or across a pool
+    of jobs worker processes that each take whole documents: compiled XSD
+    schemas, parsed original parts and the XSD result cache stay loaded from
+    one document to the next instead of being rebuilt per document. Each
+    document's output is printed under a "== <document>" header, in the
+    order the documents were given.
+
+    Args:
+        packages: Iterable of (unpacked_dir, original_file) pairs. unpacked_dir
+            may be None to check an Office file on its own: it is unpacked
+            to a temporary directory and validated without a baseline, so
+            every XSD error counts and redlining is not checked.
+        jobs: Worker processes validating documents in parallel (default: 1)
+        verbose: Print passing checks too
+        incremental: Only re-check what changed since each directory's last
+            successful run (ignored for documents without unpacked_dir)
+
+    Returns:
+        ValidationReport: Results of every document, labelled by document
+    """
+    packages = [
+        (Path(unpacked_dir) if unpacked_dir else None, Path(original_file))
+        for unpacked_dir, original_file in packages
+    ]
+    report = ValidationReport()
+
+    if jobs <= 1 or len(packages) < 2:
+        for package in packages:
+            print(f"== {_document_label(*package)}")
+            _, results, file_times = _validate_document(
+                package, verbose, incremental, capture=False
+            )
+            report.add_results(results, file_times)
+        return report
+
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_batch_worker,
+        initargs=(cache.path if (cache := get_xsd_error_cache()) else None,),
+    ) as pool:
+        outcomes = pool.map(
+            _validate_document_in_worker,
+            packages,
+            [verbose] * len(packages),
+            [incremental] * len(packages),
+        )
+        for package, (output, results, file_times) in zip(packages, outcomes):
+            print(f"== {_document_label(*package)}")
+            print(output, end="")
+            report.add_results(results, file_times)
+    return report
+
+
+def find_packages(directory):
+    """Return (None, office_file) pairs for the Office files in a directory."""
+    return [
+        (None, path)
+        for path in sorted(Path(directory).iterdir())
+        if path.suffix.lower() in VALIDATORS and path.is_file()
+    ]
+
+
+def read_manifest(manifest_file):
+    """Read (unpacked_dir, original_file) pairs from a manifest.
+
+    Each non-empty line not starting with "#" holds an unpacked directory and
+    its original file separated by a tab, or just an Office file to check on
+    its own. Relative paths are relative to the manifest's directory.
+    """
+    manifest_file = Path(manifest_file)
+    base_dir = manifest_file.parent
+    packages = []
+    for line in manifest_file.read_text().splitlines():
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        paths = [
+            Path(os.path.normpath(base_dir / field.strip()))
+            for field in line.split("\t")
+        ]
+        if len(paths) == 1:
+            packages.append((None, paths[0]))
+        else:
+            packages.append((paths[0], paths[1]))
+    return packages
+
+
+def _document_label(unpacked_dir, original_file):
+    """Name a document by its unpacked directory, or its file if it has none."""
+    return str(unpacked_dir or original_file)
+
+
+def _validate_document(package, verbose, incremental, capture):
+    """Validate one document into a report of its own.
+
+    Returns:
+        tuple: (captured output or None, CheckResults, file_times by part name)
+    """
+    unpacked_dir, original_file = package
+    document = _document_label(unpacked_dir, original_file)
+    report = ValidationReport()
+    output = io.StringIO() if capture else None
+
+    with contextlib.ExitStack() as stack:
+        if output is not None:
+            stack.enter_context(contextlib.redirect_stdout(output))
+        try:
+            # An Office file checked on its own is not its own baseline
+            baseline = unpacked_dir is not None
+            if not baseline:
+                unpacked_dir = Path(stack.enter_context(tempfile.TemporaryDirectory()))
+                _unpack(original_file, unpacked_dir)
+                incremental = False
+            validate_package(
+                unpacked_dir,
+                original_file,
+                report,
+                verbose=verbose,
+                incremental=incremental,
+                document=document,
+                baseline=baseline,
+            )
+        except Exception as e:
+            # A document that cannot be validated fails without stopping the batch
+            result = CheckResult("validate_many", "load")
+            result.document = document
+            result.passed = False
+            result.errors = [ErrorRecord(str(e))]
+            report.results.append(result)
+            print(f"FAILED - {e}")
+
+    return (
+        output.getvalue() if output is not None else None,
+        report.results,
+        report.file_times,
+    )
+
+
+def _unpack(office_file, output_dir):
+    """Unpack an Office file with unpack.py (importable from either package layout)."""
+    try:
+        from unpack import unpack_document
+    except ImportError:
+        from ..unpack import unpack_document
+    unpack_document(office_file, output_dir)
+
+
+def _init_batch_worker(cache_path):
+    """Set up a worker process that validates whole documents."""
+    if cache_path is None:
+        set_xsd_error_cache(None)
+    else:
+        enable_xsd_error_cache(cache_path)
+
+
+def _validate_document_in_worker(package, verbose, incremental):
+    """Validate one document in a worker process, capturing its output."""
+    return _validate_document(package, verbose, incremental, capture=True)
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
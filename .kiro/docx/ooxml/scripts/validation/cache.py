@@ -0,0 +1,152 @@
+"""
+Persistent cache of XSD validation results, keyed by schema and part content.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from pathlib import Path
+
+# Bump when a change to the validators alters the errors reported for a part
+CACHE_VERSION = 2
+
+# Off unless a caller opts in with enable_xsd_error_cache() (the command line
+# tools do), so library use never writes to the user's cache dir
+_xsd_error_cache = None
+
+
+def default_cache_dir():
+    """Return the directory for validation caches.
+
+    $OOXML_CACHE_DIR if set, else $XDG_CACHE_HOME/ooxml (~/.cache/ooxml).
+    """
+    if os.environ.get("OOXML_CACHE_DIR"):
+        return Path(os.environ["OOXML_CACHE_DIR"])
+    xdg_cache = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(xdg_cache) / "ooxml"
+
+
+def default_state_file(unpacked_dir, validator_name):
+    """Return where incremental runs of a validator keep state for a directory.
+
+    State lives in the cache dir rather than next to the document, so it can
+    never be packed into the Office file.
+    """
+    key = hashlib.sha256(str(Path(unpacked_dir).resolve()).encode()).hexdigest()
+    return default_cache_dir() / "state" / f"{validator_name}-{key[:16]}.json"
+
+
+def get_xsd_error_cache():
+    """Return the process-wide XSDErrorCache.
+
+    Returns:
+        XSDErrorCache or None: The cache, or None if caching is not enabled
+    """
+    return _xsd_error_cache
+
+
+def enable_xsd_error_cache(path=None):
+    """Turn on the process-wide XSDErrorCache, keeping it if already on at path.
+
+    Args:
+        path: SQLite file to use (default: xsd-errors.sqlite3 in
+            default_cache_dir())
+
+    Returns:
+        XSDErrorCache: The enabled cache
+    """
+    path = Path(path) if path else default_cache_dir() / "xsd-errors.sqlite3"
+    if _xsd_error_cache is None or _xsd_error_cache.path != path:
+        set_xsd_error_cache(XSDErrorCache(path))
+    return _xsd_error_cache
+
+
+def set_xsd_error_cache(cache):
+    """Replace the process-wide XSDErrorCache (None disables caching)."""
+    global _xsd_error_cache
+    if _xsd_error_cache is not None:
+        _xsd_error_cache.close()
+    _xsd_error_cache = cache
+
+
+class XSDErrorCache:
+    """SQLite map from (schema key, sha256 of part bytes) to XSD error messages.
+
+    XSD validation is a pure function of the schema and the part's bytes, so
+    the result for a part that has been seen before, in any run or process,
+    can be reused without parsing or validating it. Any database error
+    disables the cache for the rest of the process instead of failing
+    validation.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._connection = None
+        self._pid = None
+        self._disabled = False
+
+    def get(self, schema_key, digest):
+        """Return the cached {error message: line} of a part, or None on a miss."""
+        connection = self._connect()
+        if connection is None:
+            return None
+        try:
+            row = connection.execute(
+                "SELECT errors FROM xsd_errors WHERE schema = ? AND digest = ?",
+                (schema_key, digest),
+            ).fetchone()
+        except sqlite3.Error:
+            self._disable()
+            return None
+        return dict(json.loads(row[0])) if row else None
+
+    def put(self, schema_key, digest, errors):
+        """Store the {error message: line} of a part (empty if it is valid)."""
+        connection = self._connect()
+        if connection is None:
+            return
+        try:
+            connection.execute(
+                "INSERT OR REPLACE INTO xsd_errors (schema, digest, errors) "
+                "VALUES (?, ?, ?)",
+                (schema_key, digest, json.dumps(sorted(errors.items()))),
+            )
+        except sqlite3.Error:
+            self._disable()
+
+    def close(self):
+        """Close the database connection."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _connect(self):
+        """Open the database once per process (connections don't survive fork)."""
+        if self._disabled:
+            return None
+        if self._connection is not None and self._pid == os.getpid():
+            return self._connection
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS xsd_errors ("
+                "schema TEXT NOT NULL, digest TEXT NOT NULL, errors TEXT NOT NULL, "
+                "PRIMARY KEY (schema, digest))"
+            )
+        except (OSError, sqlite3.Error):
+            self._disable()
+            return None
+        self._connection = connection
+        self._pid = os.getpid()
+        return connection
+
+    def _disable(self):
+        self._disabled = True
+        self._connection = None
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -0,0 +1,285 @@
+"""
+In-process Myers diff and git-style word diff of paragraph text.
+"""
+
+import bisect
+import re
+
+# Edits a diff may need before the changed region is reported as one block
+MAX_EDITS = 1000
+
+# Word-level tokens: runs of word characters, runs of whitespace, punctuation
+WORD_PATTERN = re.compile(r"\w+|\s+|[^\w\s]")
+
+# Longest changed run of words (removed plus added characters) that is
+# diffed further by characters
+MAX_REFINED_LENGTH = 200
+
+
+def diff_sequences(a, b, patience=False, max_edits=MAX_EDITS):
+    """Find the blocks where two sequences differ.
+
+    Items are compared with ==, so sequences of hashes compare in constant
+    time per item. The common prefix and suffix are stripped before the
+    search, so a few local changes cost little however long the sequences
+    are. What remains is diffed with Myers' O(ND) algorithm, after first
+    being split at the items that occur exactly once in each sequence if
+    patience is set (patience diff), which keeps many scattered changes
+    cheap when most items are unique, as paragraphs are.
+
+    Args:
+        a: Original sequence
+        b: Modified sequence
+        patience: Split at unique common items before running Myers
+        max_edits: Most insertions plus deletions Myers searches for; beyond
+            that the region it was given is reported as one block
+
+    Returns:
+        list: (i1, i2, j1, j2) tuples, in order, meaning a[i1:i2] was
+            replaced by b[j1:j2] (either side may be empty)
+    """
+    blocks = []
+    _diff(a, b, 0, len(a), 0, len(b), patience, max_edits, blocks)
+    return blocks
+
+
+def _diff(a, b, start_a, end_a, start_b, end_b, patience, max_edits, blocks):
+    """Append the blocks where a[start_a:end_a] and b[start_b:end_b] differ."""
+    while start_a < end_a and start_b < end_b and a[start_a] == b[start_b]:
+        start_a += 1
+        start_b += 1
+    while end_a > start_a and end_b > start_b and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    if start_a == end_a or start_b == end_b:
+        if start_a < end_a or start_b < end_b:
+            blocks.append((start_a, end_a, start_b, end_b))
+        return
+
+    anchors = _unique_anchors(a, b, start_a, end_a, start_b, end_b) if patience else []
+    if anchors:
+        for i, j in anchors:
+            _diff(a, b, start_a, i, start_b, j, patience, max_edits, blocks)
+            start_a, start_b = i + 1, j + 1
+        _diff(a, b, start_a, end_a, start_b, end_b, patience, max_edits, blocks)
+    else:
+        blocks.extend(_myers_blocks(a, b, start_a, end_a, start_b, end_b, max_edits))
+
+
+def _unique_anchors(a, b, start_a, end_a, start_b, end_b):
+    """Return (i, j) pairs of items occurring once in each range, matched in order.
+
+    The pairs are the longest increasing run of positions in b among the
+    items unique to both ranges (found by patience sorting).
+    """
+    counts = {}
+    for i in range(start_a, end_a):
+        entry = counts.get(a[i])
+        counts[a[i]] = [i, None, 0] if entry is None else [None, None, 0]
+    for j in range(start_b, end_b):
+        entry = counts.get(b[j])
+        if entry is not None:
+            entry[1] = j
+            entry[2] += 1
+    pairs = sorted(
+        (i, j) for i, j, count in counts.values() if i is not None and count == 1
+    )
+
+    # Longest increasing subsequence of j, keeping a back link per pair
+    tails = []  # j of the last pair of the best run of each length
+    tail_pairs = []
+    links = {}
+    for i, j in pairs:
+        length = bisect.bisect_left(tails, j)
+        links[(i, j)] = tail_pairs[length - 1] if length else None
+        if length == len(tails):
+            tails.append(j)
+            tail_pairs.append((i, j))
+        else:
+            tails[length] = j
+            tail_pairs[length] = (i, j)
+
+    anchors = []
+    pair = tail_pairs[-1] if tail_pairs else None
+    while pair is not None:
+        anchors.append(pair)
+        pair = links[pair]
+    anchors.reverse()
+    return anchors
+
+
+def _myers_blocks(a, b, start_a, end_a, start_b, end_b, max_edits):
+    """Return the blocks where two ranges differ, as Myers' shortest edit script."""
+    moves = _myers(a[start_a:end_a], b[start_b:end_b], max_edits)
+    if moves is None:
+        return [(start_a, end_a, start_b, end_b)]
+
+    # Merge the deletions and insertions between matching runs into blocks
+    blocks = []
+    x = y = 0
+    block = None
+    for next_x, next_y in moves:
+        if next_x - x == 1 and next_y - y == 1:  # Diagonal moves match
+            if block is not None:
+                blocks.append(block)
+                block = None
+        elif block is None:
+            block = (start_a + x, start_a + next_x, start_b + y, start_b + next_y)
+        else:
+            block = (block[0], start_a + next_x, block[2], start_b + next_y)
+        x, y = next_x, next_y
+    if block is not None:
+        blocks.append(block)
+    return blocks
+
+
+def _myers(a, b, max_edits):
+    """Return the points of a shortest edit path from (0, 0) to (len(a), len(b)).
+
+    Each step moves one item: right (deletion), down (insertion) or
+    diagonally (match). Returns None if more than max_edits edits are needed.
+    """
+    n, m = len(a), len(b)
+    offset = min(n + m, max_edits) + 1
+    v = [0] * (2 * offset + 1)
+    trace = []
+
+    for d in range(offset):
+        trace.append(v[offset - d : offset + d + 1])
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                x = v[offset + k + 1]  # Down from diagonal k + 1
+            else:
+                x = v[offset + k - 1] + 1  # Right from diagonal k - 1
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            v[offset + k] = x
+            if x >= n and y >= m:
+                return _backtrack(trace, n, m)
+    return None
+
+
+def _backtrack(trace, x, y):
+    """Walk the saved diagonals back from (x, y) and return the path forwards."""
+    points = []
+    for d in range(len(trace) - 1, -1, -1):
+        v = trace[d]  # Diagonals -d..d before step d, so k is at index k + d
+        k = x - y
+        if k == -d or (k != d and v[k - 1 + d] < v[k + 1 + d]):
+            prev_k = k + 1
+        else:
+            prev_k = k - 1
+        prev_x = v[prev_k + d] if d else 0
+        prev_y = prev_x - prev_k
+        while x > prev_x and y > prev_y:
+            points.append((x, y))
+            x -= 1
+            y -= 1
+        if d:
+            points.append((x, y))
+        x, y = prev_x, prev_y
+    points.reverse()
+    return points
+
+
+def word_diff(original_paragraphs, modified_paragraphs, blocks=None):
+    """Show how paragraphs changed, in the style of git diff --word-diff=plain.
+
+    Paragraphs are matched first (a patience diff of their hashes), so only
+    the paragraphs that changed are diffed further, each against the
+    paragraph that replaced it where the counts match, by words and then
+    characters (see _render()): removed text is shown as [-text-], added
+    text as {+text+} and kept text as is.
+
+    Args:
+        original_paragraphs: Paragraph texts of the original document, as a
+            list or as an {index: text} dict holding at least the paragraphs
+            in blocks
+        modified_paragraphs: Paragraph texts of the modified document, likewise
+        blocks: Where the paragraphs differ, if already known (the result of
+            diff_sequences() over the paragraphs or their hashes)
+
+    Returns:
+        str: One line per changed paragraph (empty if nothing changed)
+    """
+    if blocks is None:
+        blocks = diff_sequences(
+            [hash(p) for p in original_paragraphs],
+            [hash(p) for p in modified_paragraphs],
+            patience=True,
+        )
+
+    lines = []
+    for i1, i2, j1, j2 in blocks:
+        original = [original_paragraphs[i] for i in range(i1, i2)]
+        modified = [modified_paragraphs[j] for j in range(j1, j2)]
+        if not modified:
+            rendered = [f"[-{p}-]" for p in original]
+        elif not original:
+            rendered = [f"{{+{p}+}}" for p in modified]
+        elif len(original) == len(modified):
+            rendered = [_render(o, m) for o, m in zip(original, modified)]
+        else:
+            rendered = [_render("\n".join(original), "\n".join(modified))]
+        for text in rendered:
+            lines.extend(line for line in text.split("\n") if line.strip())
+    return "\n".join(lines)
+
+
+def _render(original, modified):
+    """Mark up the differences between two texts.
+
+    The texts are diffed by words, then each changed run of words short
+    enough to be worth it by characters, so "Paragraph" -> "Paragxyzh"
+    shows as Parag[-rap-]{+xyz+}h rather than as a whole word replaced.
+    """
+    a, b = WORD_PATTERN.findall(original), WORD_PATTERN.findall(modified)
+
+    # Runs of words changed around the same whitespace are one change
+    blocks = []
+    for block in diff_sequences(a, b):
+        if blocks and "".join(a[blocks[-1][1] : block[0]]).isspace():
+            blocks[-1] = (blocks[-1][0], block[1], blocks[-1][2], block[3])
+        else:
+            blocks.append(block)
+
+    parts = []
+    i = 0
+    for i1, i2, j1, j2 in blocks:
+        parts.append("".join(a[i:i1]))
+        parts.append(_render_block("".join(a[i1:i2]), "".join(b[j1:j2])))
+        i = i2
+    parts.append("".join(a[i:]))
+    return "".join(parts)
+
+
+def _render_block(removed, added):
+    """Mark up a changed run of words, by characters if it is short."""
+    blocks = [(0, len(removed), 0, len(added))]
+    if removed and added and len(removed) + len(added) <= MAX_REFINED_LENGTH:
+        blocks = diff_sequences(removed, added)
+
+    parts = []
+    i = 0
+    for i1, i2, j1, j2 in blocks:
+        parts.append(removed[i:i1])
+        if i2 > i1:
+            parts.append(_mark(removed[i1:i2], "[-", "-]"))
+        if j2 > j1:
+            parts.append(_mark(added[j1:j2], "{+", "+}"))
+        i = i2
+    parts.append(removed[i:])
+    return "".join(parts)
+
+
+def _mark(text, opening, closing):
+    """Wrap text in markers line by line, so no marker spans a line break."""
+    return "\n".join(
+        f"{opening}{line}{closing}" if line else "" for line in text.split("\n")
+    )
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
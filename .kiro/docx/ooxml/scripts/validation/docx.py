@@ -3,8 +3,7 @@ Validator for Word document XML files against XSD schemas.
 """
 
 import re
-import tempfile
-import zipfile
+import time
 
 import lxml.etree
 
@@ -17,56 +16,70 @@ class DOCXSchemaValidator(BaseSchemaValidator):
     # Word-specific namespace
     WORD_2006_NAMESPACE = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
 
+    # Word-only checks each look at document.xml on its own
+    INCREMENTAL_CHECKS = {
+        **BaseSchemaValidator.INCREMENTAL_CHECKS,
+        "validate_whitespace_preservation": ("parts", (), False),
+        "validate_deletions": ("parts", (), False),
+        "validate_insertions": ("parts", (), False),
+    }
+
     # Word-specific element to relationship type mappings
     # Start with empty mapping - add specific cases as we discover them
     ELEMENT_RELATIONSHIP_TYPES = {}
 
     def validate(self):
         """Run all validation checks and return True if all pass."""
+        start = time.perf_counter()
+
         # Test 0: XML well-formedness
-        if not self.validate_xml():
+        if not self._run_check(self.validate_xml):
             return False
 
         # Test 1: Namespace declarations
         all_valid = True
-        if not self.validate_namespaces():
+        if not self._run_check(self.validate_namespaces):
             all_valid = False
 
         # Test 2: Unique IDs
-        if not self.validate_unique_ids():
+        if not self._run_check(self.validate_unique_ids):
             all_valid = False
 
         # Test 3: Relationship and file reference validation
-        if not self.validate_file_references():
+        if not self._run_check(self.validate_file_references):
             all_valid = False
 
         # Test 4: Content type declarations
-        if not self.validate_content_types():
+        if not self._run_check(self.validate_content_types):
             all_valid = False
 
         # Test 5: XSD schema validation
-        if not self.validate_against_xsd():
+        if not self._run_check(self.validate_against_xsd):
             all_valid = False
 
         # Test 6: Whitespace preservation
-        if not self.validate_whitespace_preservation():
+        if not self._run_check(self.validate_whitespace_preservation):
             all_valid = False
 
         # Test 7: Deletion validation
-        if not self.validate_deletions():
+        if not self._run_check(self.validate_deletions):
             all_valid = False
 
         # Test 8: Insertion validation
-        if not self.validate_insertions():
+        if not self._run_check(self.validate_insertions):
             all_valid = False
 
         # Test 9: Relationship ID reference validation
-        if not self.validate_all_relationship_ids():
+        if not self._run_check(self.validate_all_relationship_ids):
             all_valid = False
 
         # Count and compare paragraphs
         self.compare_paragraph_counts()
 
+        if all_valid:
+            self._save_state()
+
+        self._report_timing(time.perf_counter() - start)
         return all_valid
 
     def validate_whitespace_preservation(self):
@@ -81,7 +94,7 @@ class DOCXSchemaValidator(BaseSchemaValidator):
                 continue
 
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
+                root = self._parse(xml_file).getroot()
 
                 # Find all w:t elements
                 for elem in root.iter(f"{{{self.WORD_2006_NAMESPACE}}}t"):
@@ -102,20 +115,20 @@ class DOCXSchemaValidator(BaseSchemaValidator):
                                     else repr(text)
                                 )
                                 errors.append(
-                                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                    f"Line {elem.sourceline}: w:t element with whitespace missing xml:space='preserve': {text_preview}"
+                                    self._error(
+                                        f"w:t element with whitespace missing xml:space='preserve': {text_preview}",
+                                        xml_file,
+                                        elem.sourceline,
+                                    )
                                 )
 
             except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+                errors.append(self._error(f"Error: {e}", xml_file))
 
         if errors:
-            print(f"FAILED - Found {len(errors)} whitespace preservation violations:")
-            for error in errors:
-                print(error)
-            return False
+            return self._fail(
+                f"Found {len(errors)} whitespace preservation violations:", errors
+            )
         else:
             if self.verbose:
                 print("PASSED - All whitespace is properly preserved")
@@ -134,7 +147,7 @@ class DOCXSchemaValidator(BaseSchemaValidator):
                 continue
 
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
+                root = self._parse(xml_file).getroot()
 
                 # Find all w:t elements that are descendants of w:del elements
                 namespaces = {"w": self.WORD_2006_NAMESPACE}
@@ -151,20 +164,20 @@ class DOCXSchemaValidator(BaseSchemaValidator):
                             else repr(t_elem.text)
                         )
                         errors.append(
-                            f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                            f"Line {t_elem.sourceline}: <w:t> found within <w:del>: {text_preview}"
+                            self._error(
+                                f"<w:t> found within <w:del>: {text_preview}",
+                                xml_file,
+                                t_elem.sourceline,
+                            )
                         )
 
             except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+                errors.append(self._error(f"Error: {e}", xml_file))
 
         if errors:
-            print(f"FAILED - Found {len(errors)} deletion validation violations:")
-            for error in errors:
-                print(error)
-            return False
+            return self._fail(
+                f"Found {len(errors)} deletion validation violations:", errors
+            )
         else:
             if self.verbose:
                 print("PASSED - No w:t elements found within w:del elements")
@@ -180,7 +193,7 @@ class DOCXSchemaValidator(BaseSchemaValidator):
                 continue
 
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
+                root = self._parse(xml_file).getroot()
                 # Count all w:p elements
                 paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
                 count = len(paragraphs)
@@ -194,19 +207,12 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         count = 0
 
         try:
-            # Create temporary directory to unpack original
-            with tempfile.TemporaryDirectory() as temp_dir:
-                # Unpack original docx
-                with zipfile.ZipFile(self.original_file, "r") as zip_ref:
-                    zip_ref.extractall(temp_dir)
+            # Parse document.xml straight from the original zip
+            root = self.original_package.parse("word/document.xml").getroot()
 
-                # Parse document.xml
-                doc_xml_path = temp_dir + "/word/document.xml"
-                root = lxml.etree.parse(doc_xml_path).getroot()
-
-                # Count all w:p elements
-                paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
-                count = len(paragraphs)
+            # Count all w:p elements
+            paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
+            count = len(paragraphs)
 
         except Exception as e:
             print(f"Error counting paragraphs in original document: {e}")
@@ -225,7 +231,7 @@ class DOCXSchemaValidator(BaseSchemaValidator):
                 continue
 
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
+                root = self._parse(xml_file).getroot()
                 namespaces = {"w": self.WORD_2006_NAMESPACE}
 
                 # Find w:delText in w:ins that are NOT within w:del
@@ -241,20 +247,20 @@ class DOCXSchemaValidator(BaseSchemaValidator):
                         else repr(elem.text or "")
                     )
                     errors.append(
-                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                        f"Line {elem.sourceline}: <w:delText> within <w:ins>: {text_preview}"
+                        self._error(
+                            f"<w:delText> within <w:ins>: {text_preview}",
+                            xml_file,
+                            elem.sourceline,
+                        )
                     )
 
             except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+                errors.append(self._error(f"Error: {e}", xml_file))
 
         if errors:
-            print(f"FAILED - Found {len(errors)} insertion validation violations:")
-            for error in errors:
-                print(error)
-            return False
+            return self._fail(
+                f"Found {len(errors)} insertion validation violations:", errors
+            )
         else:
             if self.verbose:
                 print("PASSED - No w:delText elements within w:ins elements")
@@ -262,6 +268,9 @@ class DOCXSchemaValidator(BaseSchemaValidator):
 
     def compare_paragraph_counts(self):
         """Compare paragraph counts between original and new document."""
+        if self.original_file is None:
+            return
+
         original_count = self.count_paragraphs_in_original()
         new_count = self.count_paragraphs_in_unpacked()
 
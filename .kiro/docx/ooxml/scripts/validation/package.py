@@ -0,0 +1,91 @@
+"""
+Read-only access to the original Office file that validators compare against.
+"""
+
+import zipfile
+from pathlib import Path
+
+import lxml.etree
+
+# One OriginalPackage per original file in the process, by resolved path
+_packages = {}
+
+
+def get_original_package(original_file):
+    """Return the shared OriginalPackage for an original Office file.
+
+    Every validator in the process that compares against the same file gets
+    the same instance, so each original part is read, parsed and validated at
+    most once. A file that was replaced on disk gets a fresh instance.
+
+    Args:
+        original_file: Path to the original .docx/.pptx/.xlsx
+
+    Returns:
+        OriginalPackage: The shared accessor for original_file
+    """
+    path = Path(original_file).resolve()
+    stat = path.stat()
+    signature = (stat.st_mtime_ns, stat.st_size)
+    package = _packages.get(path)
+    if package is None or package.signature != signature:
+        package = _packages[path] = OriginalPackage(path, signature)
+    return package
+
+
+class OriginalPackage:
+    """Lazy, in-memory view of the parts of an original Office file.
+
+    Members are read from the zip only when asked for; nothing is extracted
+    to disk. Parsed trees and per-part XSD errors are memoized, and the
+    trees are shared, so callers must not modify them.
+    """
+
+    def __init__(self, path, signature=None):
+        self.path = Path(path)
+        self.signature = signature
+        self._names = None
+        self._trees = {}
+        # (part name, schema path) -> {XSD error message: line}
+        self.xsd_errors = {}
+
+    def names(self):
+        """Return the set of member names in the package."""
+        if self._names is None:
+            with zipfile.ZipFile(self.path) as zf:
+                self._names = {info.filename for info in zf.infolist()}
+        return self._names
+
+    def __contains__(self, name):
+        return name in self.names()
+
+    def read(self, name):
+        """Return the bytes of a member, or None if the package has no such part."""
+        if name not in self:
+            return None
+        with zipfile.ZipFile(self.path) as zf:
+            return zf.read(name)
+
+    def parse(self, name):
+        """Parse a member once and return the shared tree.
+
+        Args:
+            name: Member name, e.g. "word/document.xml"
+
+        Returns:
+            lxml.etree._ElementTree or None: The parsed part, or None if the
+            package has no such part
+
+        Raises:
+            lxml.etree.XMLSyntaxError: If the part is not well-formed
+        """
+        if name not in self._trees:
+            data = self.read(name)
+            if data is None:
+                return None
+            self._trees[name] = lxml.etree.ElementTree(lxml.etree.fromstring(data))
+        return self._trees[name]
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
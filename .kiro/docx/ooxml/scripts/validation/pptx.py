@@ -2,11 +2,19 @@
 Validator for PowerPoint presentation XML files against XSD schemas.
 """
 
+import functools
 import re
+import time
 
 from .base import BaseSchemaValidator
 
 
+@functools.cache
+def _is_id_attribute(name):
+    """Check whether a Clark-notation attribute name is an ID attribute (*id)."""
+    return name.split("}")[-1].lower().endswith("id")
+
+
 class PPTXSchemaValidator(BaseSchemaValidator):
     """Validator for PowerPoint presentation XML files against XSD schemas."""
 
@@ -15,6 +23,26 @@ class PPTXSchemaValidator(BaseSchemaValidator):
         "http://schemas.openxmlformats.org/presentationml/2006/main"
     )
 
+    # Slide checks read the slide master and slide .rels files from disk
+    INCREMENTAL_CHECKS = {
+        **BaseSchemaValidator.INCREMENTAL_CHECKS,
+        "validate_uuid_ids": ("parts", (), False),
+        "validate_slide_layout_ids": (None, ("ppt/slideMasters/*",), True),
+        "validate_no_duplicate_slide_layouts": (None, ("ppt/slides/_rels/*",), True),
+        "validate_notes_slide_references": (None, ("ppt/slides/_rels/*",), True),
+    }
+
+    # UUID-like IDs are checked in the same walk as unique IDs
+    ELEMENT_RULES = {
+        **BaseSchemaValidator.ELEMENT_RULES,
+        "uuid_ids": (None, "_uuid_id_rule", False),
+    }
+
+    # UUID pattern: 8-4-4-4-12 hex digits with optional braces/hyphens
+    UUID_PATTERN = re.compile(
+        r"^[\{\(]?[0-9A-Fa-f]{8}-?[0-9A-Fa-f]{4}-?[0-9A-Fa-f]{4}-?[0-9A-Fa-f]{4}-?[0-9A-Fa-f]{12}[\}\)]?$"
+    )
+
     # PowerPoint-specific element to relationship type mappings
     ELEMENT_RELATIONSHIP_TYPES = {
         "sldid": "slide",
@@ -27,92 +55,92 @@ class PPTXSchemaValidator(BaseSchemaValidator):
 
     def validate(self):
         """Run all validation checks and return True if all pass."""
+        start = time.perf_counter()
+
         # Test 0: XML well-formedness
-        if not self.validate_xml():
+        if not self._run_check(self.validate_xml):
             return False
 
         # Test 1: Namespace declarations
         all_valid = True
-        if not self.validate_namespaces():
+        if not self._run_check(self.validate_namespaces):
             all_valid = False
 
         # Test 2: Unique IDs
-        if not self.validate_unique_ids():
+        if not self._run_check(self.validate_unique_ids):
             all_valid = False
 
         # Test 3: UUID ID validation
-        if not self.validate_uuid_ids():
+        if not self._run_check(self.validate_uuid_ids):
             all_valid = False
 
         # Test 4: Relationship and file reference validation
-        if not self.validate_file_references():
+        if not self._run_check(self.validate_file_references):
             all_valid = False
 
         # Test 5: Slide layout ID validation
-        if not self.validate_slide_layout_ids():
+        if not self._run_check(self.validate_slide_layout_ids):
             all_valid = False
 
         # Test 6: Content type declarations
-        if not self.validate_content_types():
+        if not self._run_check(self.validate_content_types):
             all_valid = False
 
         # Test 7: XSD schema validation
-        if not self.validate_against_xsd():
+        if not self._run_check(self.validate_against_xsd):
             all_valid = False
 
         # Test 8: Notes slide reference validation
-        if not self.validate_notes_slide_references():
+        if not self._run_check(self.validate_notes_slide_references):
             all_valid = False
 
         # Test 9: Relationship ID reference validation
-        if not self.validate_all_relationship_ids():
+        if not self._run_check(self.validate_all_relationship_ids):
             all_valid = False
 
         # Test 10: Duplicate slide layout references validation
-        if not self.validate_no_duplicate_slide_layouts():
+        if not self._run_check(self.validate_no_duplicate_slide_layouts):
             all_valid = False
 
+        if all_valid:
+            self._save_state()
+
+        self._report_timing(time.perf_counter() - start)
         return all_valid
 
+    def _uuid_id_rule(self, elem, local_name, findings):
+        """Record ID attributes of an element that look like UUIDs but are not."""
+        for attr, value in elem.attrib.items():
+            # Check if this is an ID attribute
+            if _is_id_attribute(attr):
+                # Check if value looks like a UUID (has the right length and pattern structure)
+                if len(value) >= 32 and self._looks_like_uuid(value):
+                    # Validate that it contains only hex characters in the right positions
+                    if not self.UUID_PATTERN.match(value):
+                        findings.append((elem.sourceline, value))
+
     def validate_uuid_ids(self):
         """Validate that ID attributes that look like UUIDs contain only hex values."""
-        import lxml.etree
-
         errors = []
-        # UUID pattern: 8-4-4-4-12 hex digits with optional braces/hyphens
-        uuid_pattern = re.compile(
-            r"^[\{\(]?[0-9A-Fa-f]{8}-?[0-9A-Fa-f]{4}-?[0-9A-Fa-f]{4}-?[0-9A-Fa-f]{4}-?[0-9A-Fa-f]{12}[\}\)]?$"
-        )
 
         for xml_file in self.xml_files:
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Check all elements for ID attributes
-                for elem in root.iter():
-                    for attr, value in elem.attrib.items():
-                        # Check if this is an ID attribute
-                        attr_name = attr.split("}")[-1].lower()
-                        if attr_name == "id" or attr_name.endswith("id"):
-                            # Check if value looks like a UUID (has the right length and pattern structure)
-                            if self._looks_like_uuid(value):
-                                # Validate that it contains only hex characters in the right positions
-                                if not uuid_pattern.match(value):
-                                    errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: ID '{value}' appears to be a UUID but contains invalid hex characters"
-                                    )
+                findings = self._walk_part(xml_file)["uuid_ids"]
+            except Exception as e:
+                errors.append(self._error(f"Error: {e}", xml_file))
+                continue
 
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
+            for line, value in findings:
                 errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
+                    self._error(
+                        f"ID '{value}' appears to be a UUID but contains invalid hex characters",
+                        xml_file,
+                        line,
+                    )
                 )
 
         if errors:
-            print(f"FAILED - Found {len(errors)} UUID ID validation errors:")
-            for error in errors:
-                print(error)
-            return False
+            return self._fail(f"Found {len(errors)} UUID ID validation errors:", errors)
         else:
             if self.verbose:
                 print("PASSED - All UUID-like IDs contain valid hex values")
@@ -130,9 +158,10 @@ class PPTXSchemaValidator(BaseSchemaValidator):
         import lxml.etree
 
         errors = []
+        graph = self.relationship_graph
 
         # Find all slide master files
-        slide_masters = list(self.unpacked_dir.glob("ppt/slideMasters/*.xml"))
+        slide_masters = graph.files_in("ppt/slideMasters", ".xml")
 
         if not slide_masters:
             if self.verbose:
@@ -141,35 +170,35 @@ class PPTXSchemaValidator(BaseSchemaValidator):
 
         for slide_master in slide_masters:
             try:
-                # Parse the slide master file
-                root = lxml.etree.parse(str(slide_master)).getroot()
+                # r:id references in the slide master
+                references = graph.references(slide_master)
 
                 # Find the corresponding _rels file for this slide master
-                rels_file = slide_master.parent / "_rels" / f"{slide_master.name}.rels"
+                rels_file = graph.rels_file_for(slide_master)
 
-                if not rels_file.exists():
+                if rels_file is None:
+                    rels_file = slide_master.parent / "_rels" / f"{slide_master.name}.rels"
                     errors.append(
-                        f"  {slide_master.relative_to(self.unpacked_dir)}: "
-                        f"Missing relationships file: {rels_file.relative_to(self.unpacked_dir)}"
+                        self._error(
+                            "Missing relationships file: "
+                            f"{rels_file.relative_to(self.unpacked_dir)}",
+                            slide_master,
+                        )
                     )
                     continue
 
-                # Parse the relationships file
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
-
                 # Build a set of valid relationship IDs that point to slide layouts
-                valid_layout_rids = set()
-                for rel in rels_root.findall(
-                    f".//{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
-                ):
-                    rel_type = rel.get("Type", "")
-                    if "slideLayout" in rel_type:
-                        valid_layout_rids.add(rel.get("Id"))
+                valid_layout_rids = {
+                    rel.id
+                    for rel in graph.relationships(rels_file)
+                    if "slideLayout" in rel.type
+                }
 
                 # Find all sldLayoutId elements in the slide master
-                for sld_layout_id in root.findall(
-                    f".//{{{self.PRESENTATIONML_NAMESPACE}}}sldLayoutId"
-                ):
+                sld_layout_id_tag = f"{{{self.PRESENTATIONML_NAMESPACE}}}sldLayoutId"
+                for sld_layout_id in references:
+                    if sld_layout_id.tag != sld_layout_id_tag:
+                        continue
                     r_id = sld_layout_id.get(
                         f"{{{self.OFFICE_RELATIONSHIPS_NAMESPACE}}}id"
                     )
@@ -177,24 +206,23 @@ class PPTXSchemaValidator(BaseSchemaValidator):
 
                     if r_id and r_id not in valid_layout_rids:
                         errors.append(
-                            f"  {slide_master.relative_to(self.unpacked_dir)}: "
-                            f"Line {sld_layout_id.sourceline}: sldLayoutId with id='{layout_id}' "
-                            f"references r:id='{r_id}' which is not found in slide layout relationships"
+                            self._error(
+                                f"sldLayoutId with id='{layout_id}' "
+                                f"references r:id='{r_id}' which is not found in slide layout relationships",
+                                slide_master,
+                                sld_layout_id.sourceline,
+                            )
                         )
 
             except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {slide_master.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+                errors.append(self._error(f"Error: {e}", slide_master))
 
         if errors:
-            print(f"FAILED - Found {len(errors)} slide layout ID validation errors:")
-            for error in errors:
-                print(error)
-            print(
-                "Remove invalid references or add missing slide layouts to the relationships file."
+            return self._fail(
+                f"Found {len(errors)} slide layout ID validation errors:",
+                errors,
+                hint="Remove invalid references or add missing slide layouts to the relationships file.",
             )
-            return False
         else:
             if self.verbose:
                 print("PASSED - All slide layout IDs reference valid slide layouts")
@@ -202,39 +230,33 @@ class PPTXSchemaValidator(BaseSchemaValidator):
 
     def validate_no_duplicate_slide_layouts(self):
         """Validate that each slide has exactly one slideLayout reference."""
-        import lxml.etree
-
         errors = []
-        slide_rels_files = list(self.unpacked_dir.glob("ppt/slides/_rels/*.xml.rels"))
+        graph = self.relationship_graph
+        slide_rels_files = graph.files_in("ppt/slides/_rels", ".xml.rels")
 
         for rels_file in slide_rels_files:
             try:
-                root = lxml.etree.parse(str(rels_file)).getroot()
-
                 # Find all slideLayout relationships
                 layout_rels = [
                     rel
-                    for rel in root.findall(
-                        f".//{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
-                    )
-                    if "slideLayout" in rel.get("Type", "")
+                    for rel in graph.relationships(rels_file)
+                    if "slideLayout" in rel.type
                 ]
 
                 if len(layout_rels) > 1:
                     errors.append(
-                        f"  {rels_file.relative_to(self.unpacked_dir)}: has {len(layout_rels)} slideLayout references"
+                        self._error(
+                            f"has {len(layout_rels)} slideLayout references", rels_file
+                        )
                     )
 
             except Exception as e:
-                errors.append(
-                    f"  {rels_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+                errors.append(self._error(f"Error: {e}", rels_file))
 
         if errors:
-            print("FAILED - Found slides with duplicate slideLayout references:")
-            for error in errors:
-                print(error)
-            return False
+            return self._fail(
+                "Found slides with duplicate slideLayout references:", errors
+            )
         else:
             if self.verbose:
                 print("PASSED - All slides have exactly one slideLayout reference")
@@ -248,7 +270,8 @@ class PPTXSchemaValidator(BaseSchemaValidator):
         notes_slide_references = {}  # Track which slides reference each notesSlide
 
         # Find all slide relationship files
-        slide_rels_files = list(self.unpacked_dir.glob("ppt/slides/_rels/*.xml.rels"))
+        graph = self.relationship_graph
+        slide_rels_files = graph.files_in("ppt/slides/_rels", ".xml.rels")
 
         if not slide_rels_files:
             if self.verbose:
@@ -257,16 +280,10 @@ class PPTXSchemaValidator(BaseSchemaValidator):
 
         for rels_file in slide_rels_files:
             try:
-                # Parse the relationships file
-                root = lxml.etree.parse(str(rels_file)).getroot()
-
                 # Find all notesSlide relationships
-                for rel in root.findall(
-                    f".//{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
-                ):
-                    rel_type = rel.get("Type", "")
-                    if "notesSlide" in rel_type:
-                        target = rel.get("Target", "")
+                for rel in graph.relationships(rels_file):
+                    if "notesSlide" in rel.type:
+                        target = rel.target
                         if target:
                             # Normalize the target path to handle relative paths
                             normalized_target = target.replace("../", "")
@@ -283,28 +300,28 @@ class PPTXSchemaValidator(BaseSchemaValidator):
                             )
 
             except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {rels_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+                errors.append(self._error(f"Error: {e}", rels_file))
 
         # Check for duplicate references
         for target, references in notes_slide_references.items():
             if len(references) > 1:
                 slide_names = [ref[0] for ref in references]
                 errors.append(
-                    f"  Notes slide '{target}' is referenced by multiple slides: {', '.join(slide_names)}"
+                    self._error(
+                        f"Notes slide '{target}' is referenced by multiple slides: {', '.join(slide_names)}",
+                        details=[
+                            rels_file.relative_to(self.unpacked_dir).as_posix()
+                            for _, rels_file in references
+                        ],
+                    )
                 )
-                for slide_name, rels_file in references:
-                    errors.append(f"    - {rels_file.relative_to(self.unpacked_dir)}")
 
         if errors:
-            print(
-                f"FAILED - Found {len([e for e in errors if not e.startswith('    ')])} notes slide reference validation errors:"
+            return self._fail(
+                f"Found {len(errors)} notes slide reference validation errors:",
+                errors,
+                hint="Each slide may optionally have its own slide file.",
             )
-            for error in errors:
-                print(error)
-            print("Each slide may optionally have its own slide file.")
-            return False
         else:
             if self.verbose:
                 print("PASSED - All notes slide references are unique")
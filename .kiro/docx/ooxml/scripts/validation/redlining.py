@@ -2,117 +2,139 @@
 Validator for tracked changes in Word documents.
 """
 
-import subprocess
-import tempfile
-import zipfile
+import hashlib
+import io
+import xml.etree.ElementTree as ET
 from pathlib import Path
 
+from .diff import diff_sequences, word_diff
+from .package import get_original_package
+from .report import ErrorRecord
+
 
 class RedliningValidator:
-    """Validator for tracked changes in Word documents."""
+    """Validator for tracked changes in Word documents.
+
+    Attributes:
+        errors: ErrorRecords found by the last validate() call
+    """
 
     def __init__(self, unpacked_dir, original_docx, verbose=False):
         self.unpacked_dir = Path(unpacked_dir)
         self.original_docx = Path(original_docx)
         self.verbose = verbose
+        self.errors = []
         self.namespaces = {
             "w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
         }
 
     def validate(self):
-        """Main validation method that returns True if valid, False otherwise."""
+        """Main validation method that returns True if valid, False otherwise.
+
+        Both documents are read once as a stream of parse events, hashing the
+        text of each paragraph as it goes (see _scan_paragraphs()). Matching
+        documents are told apart by their hash sequences alone; only when
+        they differ is the text of the mismatched paragraphs read back, for
+        the report.
+        """
+        self.errors = []
+
         # Verify unpacked directory exists and has correct structure
         modified_file = self.unpacked_dir / "word" / "document.xml"
         if not modified_file.exists():
-            print(f"FAILED - Modified document.xml not found at {modified_file}")
-            return False
+            return self._fail(f"Modified document.xml not found at {modified_file}")
 
         # First, check if there are any tracked changes by Claude to validate
+        modified_error = None
         try:
-            import xml.etree.ElementTree as ET
-
-            tree = ET.parse(modified_file)
-            root = tree.getroot()
-
-            # Check for w:del or w:ins tags authored by Claude
-            del_elements = root.findall(".//w:del", self.namespaces)
-            ins_elements = root.findall(".//w:ins", self.namespaces)
-
-            # Filter to only include changes by Claude
-            claude_del_elements = [
-                elem
-                for elem in del_elements
-                if elem.get(f"{{{self.namespaces['w']}}}author") == "Claude"
-            ]
-            claude_ins_elements = [
-                elem
-                for elem in ins_elements
-                if elem.get(f"{{{self.namespaces['w']}}}author") == "Claude"
-            ]
+            modified_scan = self._scan_paragraphs(modified_file)
 
             # Redlining validation is only needed if tracked changes by Claude have been used.
-            if not claude_del_elements and not claude_ins_elements:
+            if not modified_scan[2]:
                 if self.verbose:
                     print("PASSED - No tracked changes by Claude found.")
                 return True
 
-        except Exception:
-            # If we can't parse the XML, continue with full validation
-            pass
-
-        # Create temporary directory for unpacking original docx
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            # Unpack original docx
-            try:
-                with zipfile.ZipFile(self.original_docx, "r") as zip_ref:
-                    zip_ref.extractall(temp_path)
-            except Exception as e:
-                print(f"FAILED - Error unpacking original docx: {e}")
-                return False
-
-            original_file = temp_path / "word" / "document.xml"
-            if not original_file.exists():
-                print(
-                    f"FAILED - Original document.xml not found in {self.original_docx}"
-                )
-                return False
-
-            # Parse both XML files using xml.etree.ElementTree for redlining validation
-            try:
-                import xml.etree.ElementTree as ET
-
-                modified_tree = ET.parse(modified_file)
-                modified_root = modified_tree.getroot()
-                original_tree = ET.parse(original_file)
-                original_root = original_tree.getroot()
-            except ET.ParseError as e:
-                print(f"FAILED - Error parsing XML files: {e}")
-                return False
-
-            # Remove Claude's tracked changes from both documents
-            self._remove_claude_tracked_changes(original_root)
-            self._remove_claude_tracked_changes(modified_root)
-
-            # Extract and compare text content
-            modified_text = self._extract_text_content(modified_root)
-            original_text = self._extract_text_content(original_root)
-
-            if modified_text != original_text:
-                # Show detailed character-level differences for each paragraph
-                error_message = self._generate_detailed_diff(
-                    original_text, modified_text
-                )
-                print(error_message)
-                return False
-
-            if self.verbose:
-                print("PASSED - All changes by Claude are properly tracked")
-            return True
-
-    def _generate_detailed_diff(self, original_text, modified_text):
-        """Generate detailed word-level differences using git word diff."""
+        except ET.ParseError as e:
+            # Reported once the original has been read
+            modified_error = e
+
+        # Read the original document.xml straight from the zip
+        try:
+            original_content = get_original_package(self.original_docx).read(
+                "word/document.xml"
+            )
+        except Exception as e:
+            return self._fail(f"Error unpacking original docx: {e}")
+
+        if original_content is None:
+            return self._fail(
+                f"Original document.xml not found in {self.original_docx}"
+            )
+
+        # Hash the paragraphs of the original, with Claude's tracked changes removed
+        try:
+            if modified_error is not None:
+                raise modified_error
+            original_scan = self._scan_paragraphs(io.BytesIO(original_content))
+        except ET.ParseError as e:
+            return self._fail(f"Error parsing XML files: {e}")
+
+        # Compare paragraph hashes (empty paragraphs are skipped)
+        original_slots = [i for i, digest in enumerate(original_scan[0]) if digest]
+        modified_slots = [i for i, digest in enumerate(modified_scan[0]) if digest]
+        original_hashes = [original_scan[0][i] for i in original_slots]
+        modified_hashes = [modified_scan[0][i] for i in modified_slots]
+
+        if original_hashes != modified_hashes:
+            # Read back only the paragraphs in the mismatched windows
+            blocks = diff_sequences(original_hashes, modified_hashes, patience=True)
+            original_paragraphs = self._read_paragraphs(
+                io.BytesIO(original_content),
+                original_slots,
+                [i for i1, i2, _, _ in blocks for i in range(i1, i2)],
+            )
+            modified_paragraphs = self._read_paragraphs(
+                modified_file,
+                modified_slots,
+                [j for _, _, j1, j2 in blocks for j in range(j1, j2)],
+            )
+
+            # Show detailed character-level differences for each paragraph
+            diff = word_diff(original_paragraphs, modified_paragraphs, blocks)
+            return self._fail(
+                "Document text doesn't match after removing Claude's tracked changes",
+                file="word/document.xml",
+                details=diff.split("\n") if diff else (),
+                text=self._generate_detailed_diff(diff),
+            )
+
+        if self.verbose:
+            print("PASSED - All changes by Claude are properly tracked")
+        return True
+
+    def _fail(self, message, file=None, details=(), text=None):
+        """Record an error and print it as a FAILED message.
+
+        Args:
+            message: What is wrong
+            file: Part the error is in, if any
+            details: Further lines about the error
+            text: Printed instead of "FAILED - <message>"
+
+        Returns:
+            bool: False, for validate() to return
+        """
+        self.errors.append(ErrorRecord(message, file, details=details))
+        print(text if text is not None else f"FAILED - {message}")
+        return False
+
+    def _generate_detailed_diff(self, diff):
+        """Generate the report of paragraphs whose text changed.
+
+        Args:
+            diff: Word diff of the changed paragraphs (see word_diff())
+        """
         error_parts = [
             "FAILED - Document text doesn't match after removing Claude's tracked changes",
             "",
@@ -127,152 +149,100 @@ class RedliningValidator:
             "",
         ]
 
-        # Show git word diff
-        git_diff = self._get_git_word_diff(original_text, modified_text)
-        if git_diff:
-            error_parts.extend(["Differences:", "============", git_diff])
-        else:
-            error_parts.append("Unable to generate word diff (git not available)")
+        # Show word diff
+        if diff:
+            error_parts.extend(["Differences:", "============", diff])
 
         return "\n".join(error_parts)
 
-    def _get_git_word_diff(self, original_text, modified_text):
-        """Generate word diff using git with character-level precision."""
-        try:
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = Path(temp_dir)
-
-                # Create two files
-                original_file = temp_path / "original.txt"
-                modified_file = temp_path / "modified.txt"
-
-                original_file.write_text(original_text, encoding="utf-8")
-                modified_file.write_text(modified_text, encoding="utf-8")
-
-                # Try character-level diff first for precise differences
-                result = subprocess.run(
-                    [
-                        "git",
-                        "diff",
-                        "--word-diff=plain",
-                        "--word-diff-regex=.",  # Character-by-character diff
-                        "-U0",  # Zero lines of context - show only changed lines
-                        "--no-index",
-                        str(original_file),
-                        str(modified_file),
-                    ],
-                    capture_output=True,
-                    text=True,
-                )
-
-                if result.stdout.strip():
-                    # Clean up the output - remove git diff header lines
-                    lines = result.stdout.split("\n")
-                    # Skip the header lines (diff --git, index, +++, ---, @@)
-                    content_lines = []
-                    in_content = False
-                    for line in lines:
-                        if line.startswith("@@"):
-                            in_content = True
-                            continue
-                        if in_content and line.strip():
-                            content_lines.append(line)
-
-                    if content_lines:
-                        return "\n".join(content_lines)
-
-                # Fallback to word-level diff if character-level is too verbose
-                result = subprocess.run(
-                    [
-                        "git",
-                        "diff",
-                        "--word-diff=plain",
-                        "-U0",  # Zero lines of context
-                        "--no-index",
-                        str(original_file),
-                        str(modified_file),
-                    ],
-                    capture_output=True,
-                    text=True,
-                )
-
-                if result.stdout.strip():
-                    lines = result.stdout.split("\n")
-                    content_lines = []
-                    in_content = False
-                    for line in lines:
-                        if line.startswith("@@"):
-                            in_content = True
-                            continue
-                        if in_content and line.strip():
-                            content_lines.append(line)
-                    return "\n".join(content_lines)
-
-        except (subprocess.CalledProcessError, FileNotFoundError, Exception):
-            # Git not available or other error, return None to use fallback
-            pass
-
-        return None
-
-    def _remove_claude_tracked_changes(self, root):
-        """Remove tracked changes authored by Claude from the XML root."""
-        ins_tag = f"{{{self.namespaces['w']}}}ins"
-        del_tag = f"{{{self.namespaces['w']}}}del"
-        author_attr = f"{{{self.namespaces['w']}}}author"
-
-        # Remove w:ins elements
-        for parent in root.iter():
-            to_remove = []
-            for child in parent:
-                if child.tag == ins_tag and child.get(author_attr) == "Claude":
-                    to_remove.append(child)
-            for elem in to_remove:
-                parent.remove(elem)
-
-        # Unwrap content in w:del elements where author is "Claude"
-        deltext_tag = f"{{{self.namespaces['w']}}}delText"
-        t_tag = f"{{{self.namespaces['w']}}}t"
-
-        for parent in root.iter():
-            to_process = []
-            for child in parent:
-                if child.tag == del_tag and child.get(author_attr) == "Claude":
-                    to_process.append((child, list(parent).index(child)))
-
-            # Process in reverse order to maintain indices
-            for del_elem, del_index in reversed(to_process):
-                # Convert w:delText to w:t before moving
-                for elem in del_elem.iter():
-                    if elem.tag == deltext_tag:
-                        elem.tag = t_tag
-
-                # Move all children of w:del to its parent before removing w:del
-                for child in reversed(list(del_elem)):
-                    parent.insert(del_index, child)
-                parent.remove(del_elem)
-
-    def _extract_text_content(self, root):
-        """Extract text content from Word XML, preserving paragraph structure.
-
-        Empty paragraphs are skipped to avoid false positives when tracked
-        insertions add only structural elements without text content.
+    def _scan_paragraphs(self, source, wanted=()):
+        """Hash the text of each paragraph as if Claude's tracked changes were removed.
+
+        The document is read as a stream of parse events and never built as a
+        tree. Text inside a <w:ins> by Claude is left out, and <w:delText>
+        inside a <w:del> by Claude counts as text, as if the insertion were
+        removed and the deletion unwrapped. A paragraph's text is all <w:t>
+        text inside it, including that of paragraphs nested in it.
+
+        Args:
+            source: Path or binary file object of a document.xml
+            wanted: Paragraph slots (see Returns) whose text to keep as well
+
+        Returns:
+            tuple: (digest of each paragraph in document order, or None if it
+                has no text; {slot: text} for the wanted slots; whether any
+                tracked change by Claude was found)
+
+        Raises:
+            xml.etree.ElementTree.ParseError: If the document is not well-formed
+        """
+        w = self.namespaces["w"]
+        p_tag = f"{{{w}}}p"
+        t_tag = f"{{{w}}}t"
+        deltext_tag = f"{{{w}}}delText"
+        change_tags = {f"{{{w}}}ins", f"{{{w}}}del"}
+        del_tag = f"{{{w}}}del"
+        author_attr = f"{{{w}}}author"
+
+        digests = []
+        texts = {}
+        open_paragraphs = []  # [slot, hasher, has text, text parts or None]
+        claude_changes = False
+        # Per open element: (inside a <w:ins> by Claude, inside a <w:del> by Claude)
+        states = [(False, False)]
+
+        for event, elem in ET.iterparse(source, events=("start", "end")):
+            tag = elem.tag
+            if event == "start":
+                removed, unwrapped = states[-1]
+                if tag in change_tags and elem.get(author_attr) == "Claude":
+                    claude_changes = True
+                    if tag == del_tag:
+                        unwrapped = True
+                    else:
+                        removed = True
+                states.append((removed, unwrapped))
+                if tag == p_tag and not removed:
+                    slot = len(digests)
+                    digests.append(None)
+                    parts = [] if slot in wanted else None
+                    open_paragraphs.append([slot, hashlib.blake2b(), False, parts])
+                continue
+
+            removed, unwrapped = states.pop()
+            if not removed:
+                text = elem.text
+                if text and (tag == t_tag or (tag == deltext_tag and unwrapped)):
+                    data = text.encode("utf-8")
+                    for paragraph in open_paragraphs:
+                        paragraph[1].update(data)
+                        paragraph[2] = True
+                        if paragraph[3] is not None:
+                            paragraph[3].append(text)
+                elif tag == p_tag:
+                    slot, hasher, has_text, parts = open_paragraphs.pop()
+                    if has_text:
+                        digests[slot] = hasher.digest()
+                        if parts is not None:
+                            texts[slot] = "".join(parts)
+            elem.clear()
+
+        return digests, texts, claude_changes
+
+    def _read_paragraphs(self, source, slots, indexes):
+        """Read back the text of some non-empty paragraphs.
+
+        Args:
+            source: Path or binary file object of a document.xml
+            slots: Slot in _scan_paragraphs() order of each non-empty paragraph
+            indexes: Indexes of the non-empty paragraphs to read
+
+        Returns:
+            dict: index -> paragraph text
         """
-        p_tag = f"{{{self.namespaces['w']}}}p"
-        t_tag = f"{{{self.namespaces['w']}}}t"
-
-        paragraphs = []
-        for p_elem in root.findall(f".//{p_tag}"):
-            # Get all text elements within this paragraph
-            text_parts = []
-            for t_elem in p_elem.findall(f".//{t_tag}"):
-                if t_elem.text:
-                    text_parts.append(t_elem.text)
-            paragraph_text = "".join(text_parts)
-            # Skip empty paragraphs - they don't affect content validation
-            if paragraph_text:
-                paragraphs.append(paragraph_text)
-
-        return "\n".join(paragraphs)
+        wanted = {slots[i]: i for i in indexes}
+        _, texts, _ = self._scan_paragraphs(source, wanted)
+        return {wanted[slot]: text for slot, text in texts.items()}
 
 
 if __name__ == "__main__":
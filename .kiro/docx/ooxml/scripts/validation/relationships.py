@@ -0,0 +1,152 @@
+"""
+Relationship graph of an unpacked Office package.
+"""
+
+import posixpath
+
+PACKAGE_RELATIONSHIPS_NAMESPACE = (
+    "http://schemas.openxmlformats.org/package/2006/relationships"
+)
+OFFICE_RELATIONSHIPS_NAMESPACE = (
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+)
+
+
+class RelationshipGraph:
+    """Parts, relationships and r:id references of an unpacked package.
+
+    The directory is walked once when the graph is built; .rels files and
+    parts are parsed on first use through the validator's shared tree cache,
+    and what is read from them is kept, so every relationship check in a run
+    queries the same graph instead of re-reading the package. Target paths
+    are resolved by name against the files found in the walk, without
+    touching the filesystem.
+
+    Attributes:
+        unpacked_dir: Root of the unpacked package
+        files: Every file in the package, in directory walk order
+        rels_files: The .rels files among them, in the same order
+    """
+
+    def __init__(self, unpacked_dir, parse, examined=None):
+        """
+        Args:
+            unpacked_dir: Root of the unpacked package (resolved)
+            parse: Callable returning the parsed tree for a path in the package
+            examined: Called with every file whose relationships or references
+                are looked up, whether or not they were already read
+        """
+        self.unpacked_dir = unpacked_dir
+        self._parse = parse
+        self._examined = examined
+        self.files = [path for path in unpacked_dir.rglob("*") if path.is_file()]
+        self.rels_files = [path for path in self.files if path.name.endswith(".rels")]
+        self._names = {
+            path: path.relative_to(unpacked_dir).as_posix() for path in self.files
+        }
+        self._files_by_name = {name: path for path, name in self._names.items()}
+        self._relationships = {}
+        self._references = {}
+
+    def name(self, path):
+        """Return the part name of a path in the package (e.g. "word/document.xml")."""
+        name = self._names.get(path)
+        if name is None:
+            name = path.relative_to(self.unpacked_dir).as_posix()
+        return name
+
+    def files_in(self, directory, suffix):
+        """Return the files directly inside a package directory with a suffix."""
+        return [
+            path
+            for path, name in self._names.items()
+            if posixpath.dirname(name) == directory and name.endswith(suffix)
+        ]
+
+    def rels_file_for(self, part):
+        """Return the .rels file of a part, or None if it has none."""
+        directory, filename = posixpath.split(self.name(part))
+        rels_name = posixpath.join(directory, "_rels", f"{filename}.rels")
+        return self._files_by_name.get(rels_name)
+
+    def relationships(self, rels_file):
+        """Return the relationships declared in a .rels file, in document order.
+
+        Raises:
+            Exception: Whatever parsing the .rels file raises
+        """
+        if self._examined is not None:
+            self._examined(rels_file)
+        relationships = self._relationships.get(rels_file)
+        if relationships is None:
+            root = self._parse(rels_file).getroot()
+
+            # Targets in the root .rels are relative to the package root, others
+            # to the folder holding the _rels folder
+            # (e.g. word/_rels/document.xml.rels -> word/)
+            if rels_file.name == ".rels":
+                base = ""
+            else:
+                base = posixpath.dirname(posixpath.dirname(self.name(rels_file)))
+
+            relationships = [
+                Relationship(rel, base, self._files_by_name)
+                for rel in root.iter(
+                    f"{{{PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
+                )
+            ]
+            self._relationships[rels_file] = relationships
+        return relationships
+
+    def references(self, part):
+        """Return the elements of a part carrying an r:id attribute, in document order.
+
+        Raises:
+            Exception: Whatever parsing the part raises
+        """
+        if self._examined is not None:
+            self._examined(part)
+        references = self._references.get(part)
+        if references is None:
+            references = find_references(self._parse(part).getroot())
+            self._references[part] = references
+        return references
+
+
+def find_references(root):
+    """Return the elements of root's document carrying an r:id attribute, in order.
+
+    This is what counts as a relationship reference for every r:id check.
+    """
+    return root.xpath("//*[@r:id]", namespaces={"r": OFFICE_RELATIONSHIPS_NAMESPACE})
+
+
+class Relationship:
+    """One <Relationship> entry of a .rels file.
+
+    Attributes:
+        id: The Id attribute (None if missing)
+        type: The Type attribute ("" if missing)
+        target: The Target attribute (None if missing)
+        sourceline: Line of the entry in the .rels file
+        internal: Whether the target is a part of the package (not a URL)
+        target_part: Path of the target file, or None if it is external or
+            does not exist in the package
+    """
+
+    def __init__(self, rel, base, files_by_name):
+        self.id = rel.get("Id")
+        self.type = rel.get("Type", "")
+        self.target = rel.get("Target")
+        self.sourceline = rel.sourceline
+        self.internal = bool(self.target) and not self.target.startswith(
+            ("http", "mailto:")
+        )
+        self.target_part = None
+        if self.internal:
+            name = posixpath.normpath(posixpath.join(base, self.target))
+            self.target_part = files_by_name.get(name)
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -0,0 +1,248 @@
+"""
+Structured results of validation checks, and JSON/JUnit/profile reporting.
+"""
+
+import json
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+
+class ErrorRecord:
+    """One problem found by a check.
+
+    Checks build these as they go; what they print under their FAILED line
+    is a rendering of them (see render()).
+
+    Attributes:
+        message: What is wrong
+        file: Part the error is in, relative to the package root (e.g.
+            "word/document.xml"), or None if it is not about one part
+        line: Line in that part, or None
+        details: Further lines about the error (e.g. the parts involved)
+    """
+
+    def __init__(self, message, file=None, line=None, details=()):
+        self.message = message
+        self.file = file
+        self.line = line
+        self.details = list(details)
+
+    def render(self):
+        """Return the lines printed for the error, indented under a FAILED line."""
+        prefix = ""
+        if self.file is not None:
+            prefix = f"{self.file}: "
+            if self.line is not None:
+                prefix += f"Line {self.line}: "
+        return [f"  {prefix}{self.message}"] + [
+            f"    - {detail}" for detail in self.details
+        ]
+
+    def to_dict(self):
+        """Return the error as JSON-serializable data."""
+        return {
+            "file": self.file,
+            "line": self.line,
+            "message": self.message,
+            "details": self.details,
+        }
+
+
+class CheckResult:
+    """Outcome of one validate_* check.
+
+    Attributes:
+        document: Label of the document checked, when several are (else None)
+        validator: Name of the validator class
+        name: Name of the check (e.g. "validate_xml")
+        passed: What the check returned (True if it was skipped)
+        skipped: Whether an incremental run skipped the check
+        duration: Wall-clock seconds spent in the check
+        files: Number of files the check examined
+        parses: Number of files first parsed during the check
+        errors: ErrorRecords the check found
+    """
+
+    def __init__(self, validator, name):
+        self.document = None
+        self.validator = validator
+        self.name = name
+        self.passed = True
+        self.skipped = False
+        self.duration = 0.0
+        self.files = 0
+        self.parses = 0
+        self.errors = []
+
+    def run(self, check):
+        """Call check() and record how long it took.
+
+        Args:
+            check: Callable returning True if the check passed
+
+        Returns:
+            bool: The check's result
+        """
+        start = time.perf_counter()
+        try:
+            self.passed = bool(check())
+        finally:
+            self.duration = time.perf_counter() - start
+        return self.passed
+
+    def to_dict(self):
+        """Return the result as JSON-serializable data."""
+        return {
+            "document": self.document,
+            "validator": self.validator,
+            "name": self.name,
+            "passed": self.passed,
+            "skipped": self.skipped,
+            "duration": round(self.duration, 6),
+            "files": self.files,
+            "parses": self.parses,
+            "errors": [error.to_dict() for error in self.errors],
+        }
+
+
+class ValidationReport:
+    """Check results and per-file timings of one or more validators."""
+
+    def __init__(self):
+        self.results = []
+        # file name (prefixed with "<document>/" for labelled documents)
+        # -> {phase: seconds}
+        self.file_times = {}
+
+    @property
+    def passed(self):
+        return all(result.passed for result in self.results)
+
+    def add_validator(self, validator, document=None):
+        """Add the results and file timings recorded by a BaseSchemaValidator.
+
+        Args:
+            validator: BaseSchemaValidator that has been run
+            document: Label for its results when the report covers several
+                documents
+        """
+        file_times = {}
+        for path, phases in validator.file_times.items():
+            name = path.relative_to(validator.unpacked_dir).as_posix()
+            file_times[f"{document}/{name}" if document else name] = phases
+        for result in validator.results:
+            result.document = document
+        self.add_results(validator.results, file_times)
+
+    def add_results(self, results, file_times):
+        """Add CheckResults and {file name: {phase: seconds}} timings."""
+        self.results.extend(results)
+        for name, phases in file_times.items():
+            times = self.file_times.setdefault(name, {})
+            for phase, seconds in phases.items():
+                times[phase] = times.get(phase, 0.0) + seconds
+
+    def documents(self):
+        """Return {document: passed} for labelled results, in first-seen order."""
+        documents = {}
+        for result in self.results:
+            if result.document is not None:
+                documents[result.document] = (
+                    documents.get(result.document, True) and result.passed
+                )
+        return documents
+
+    def to_dict(self):
+        """Return the report as JSON-serializable data."""
+        return {
+            "passed": self.passed,
+            "duration": round(sum(result.duration for result in self.results), 6),
+            "documents": self.documents(),
+            "checks": [result.to_dict() for result in self.results],
+            "files": {
+                name: {phase: round(seconds, 6) for phase, seconds in phases.items()}
+                for name, phases in self.file_times.items()
+            },
+        }
+
+    def write_json(self, path):
+        """Write the report as JSON."""
+        Path(path).write_text(json.dumps(self.to_dict(), indent=2) + "\n")
+
+    def write_junit(self, path):
+        """Write the report as JUnit XML (a testsuite per validator, a testcase per check)."""
+        testsuites = ET.Element("testsuites")
+        suites = {}
+        for result in self.results:
+            suite_name = _label(result.document, result.validator)
+            suite = suites.get(suite_name)
+            if suite is None:
+                suite = suites[suite_name] = ET.SubElement(
+                    testsuites,
+                    "testsuite",
+                    name=suite_name,
+                    tests="0",
+                    failures="0",
+                    skipped="0",
+                    time="0",
+                )
+            suite.set("tests", str(int(suite.get("tests")) + 1))
+            suite.set("time", f"{float(suite.get('time')) + result.duration:.6f}")
+
+            testcase = ET.SubElement(
+                suite,
+                "testcase",
+                classname=suite_name,
+                name=result.name,
+                time=f"{result.duration:.6f}",
+            )
+            if result.skipped:
+                suite.set("skipped", str(int(suite.get("skipped")) + 1))
+                ET.SubElement(testcase, "skipped", message="unchanged since last run")
+            elif not result.passed:
+                suite.set("failures", str(int(suite.get("failures")) + 1))
+                failure = ET.SubElement(
+                    testcase, "failure", message=f"{len(result.errors)} error(s)"
+                )
+                failure.text = "\n".join(
+                    line for error in result.errors for line in error.render()
+                )
+        ET.ElementTree(testsuites).write(path, encoding="utf-8", xml_declaration=True)
+
+    def print_profile(self, top=20):
+        """Print where the time went, per check and for the slowest files."""
+        print("\nProfile by check:")
+        for result in sorted(self.results, key=lambda r: r.duration, reverse=True):
+            if result.skipped:
+                status = "skipped"
+            else:
+                status = "ok" if result.passed else "FAILED"
+            print(
+                f"  {result.duration:8.3f}s  "
+                f"{_label(result.document, result.validator)}.{result.name} "
+                f"({result.files} files, {result.parses} parsed, {status})"
+            )
+
+        if self.file_times:
+            print(f"\nProfile by file (slowest {top}):")
+            slowest = sorted(
+                self.file_times.items(),
+                key=lambda item: sum(item[1].values()),
+                reverse=True,
+            )
+            for name, phases in slowest[:top]:
+                breakdown = ", ".join(
+                    f"{phase} {seconds:.3f}s"
+                    for phase, seconds in sorted(phases.items())
+                )
+                print(f"  {sum(phases.values()):8.3f}s  {name} ({breakdown})")
+
+
+def _label(document, validator):
+    """Name a validator's results, prefixed with their document if labelled."""
+    return f"{document}: {validator}" if document else validator
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -0,0 +1,422 @@
+"""
+Validator for Excel workbook XML files against XSD schemas.
+"""
+
+import contextlib
+import time
+
+import lxml.etree
+
+from .base import BaseSchemaValidator
+from .relationships import find_references
+
+
+class XLSXSchemaValidator(BaseSchemaValidator):
+    """Validator for Excel workbook XML files against XSD schemas.
+
+    Worksheets larger than STREAMING_THRESHOLD are never loaded as trees:
+    the checks that need whole trees leave them out, and validate_worksheets()
+    reads them with iterparse, clearing each row once it has been checked, so
+    memory stays bounded however many rows a sheet has.
+    """
+
+    # SpreadsheetML namespace
+    SPREADSHEETML_NAMESPACE = (
+        "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+    )
+
+    # Worksheet parts at least this large (in bytes) are streamed
+    STREAMING_THRESHOLD = 8 * 1024 * 1024
+
+    # Cell errors listed per worksheet before the rest are only counted
+    MAX_CELL_ERRORS = 20
+
+    # Shared string indexes are bounded by the shared strings part
+    INCREMENTAL_CHECKS = {
+        **BaseSchemaValidator.INCREMENTAL_CHECKS,
+        "validate_worksheets": (
+            "parts+rels",
+            (
+                "xl/sharedStrings.xml",
+                "xl/_rels/workbook.xml.rels",
+                "[[]Content_Types].xml",
+            ),
+            False,
+        ),
+    }
+
+    # Excel-specific element to relationship type mappings
+    # Start with empty mapping - add specific cases as we discover them
+    ELEMENT_RELATIONSHIP_TYPES = {}
+
+    def __init__(self, unpacked_dir, *args, **kwargs):
+        super().__init__(unpacked_dir, *args, **kwargs)
+
+        # Worksheets only validate_worksheets() reads, and only by streaming
+        self.streamed_parts = {
+            xml_file
+            for xml_file in self.xml_files
+            if self._is_worksheet(xml_file)
+            and xml_file.stat().st_size >= self.STREAMING_THRESHOLD
+        }
+        # (number of <si>, shared strings part) once counted
+        # (see _shared_string_count())
+        self._shared_strings = None
+
+    def validate(self):
+        """Run all validation checks and return True if all pass."""
+        start = time.perf_counter()
+
+        # Test 0: XML well-formedness
+        if not self._run_check(self.validate_xml):
+            return False
+
+        # Test 1: Namespace declarations
+        all_valid = True
+        if not self._run_check(self.validate_namespaces):
+            all_valid = False
+
+        # Test 2: Unique IDs
+        if not self._run_check(self.validate_unique_ids):
+            all_valid = False
+
+        # Test 3: Relationship and file reference validation
+        if not self._run_check(self.validate_file_references):
+            all_valid = False
+
+        # Test 4: Content type declarations
+        if not self._run_check(self.validate_content_types):
+            all_valid = False
+
+        # Test 5: XSD schema validation
+        if not self._run_check(self.validate_against_xsd):
+            all_valid = False
+
+        # Test 6: Worksheet cells (and streamed worksheets as a whole)
+        if not self._run_check(self.validate_worksheets, streamed=True):
+            all_valid = False
+
+        # Test 7: Relationship ID reference validation
+        if not self._run_check(self.validate_all_relationship_ids):
+            all_valid = False
+
+        if all_valid:
+            self._save_state()
+
+        self._report_timing(time.perf_counter() - start)
+        return all_valid
+
+    def validate_structure(self):
+        """Run the structural checks, streaming large worksheets (see base class)."""
+        with self._without_streamed_parts():
+            all_valid = super().validate_structure()
+        # Streamed worksheets were left out of the checks above
+        if all_valid:
+            all_valid = self.validate_worksheets()
+        return all_valid
+
+    def _run_check(self, check, streamed=False):
+        """Run a check, leaving streamed worksheets to validate_worksheets().
+
+        Args:
+            check: Bound validate_* method
+            streamed: Whether the check reads the streamed worksheets itself;
+                otherwise they are left out of xml_files while it runs
+        """
+        if streamed:
+            return super()._run_check(check)
+        with self._without_streamed_parts():
+            return super()._run_check(check)
+
+    @contextlib.contextmanager
+    def _without_streamed_parts(self):
+        """Temporarily remove the streamed worksheets from xml_files."""
+        all_files = self.xml_files
+        if self.streamed_parts:
+            self.xml_files = [f for f in all_files if f not in self.streamed_parts]
+        try:
+            yield
+        finally:
+            self.xml_files = all_files
+
+    def _is_worksheet(self, xml_file):
+        """Check whether a file is a worksheet part (xl/worksheets/*.xml)."""
+        return (
+            xml_file.suffix == ".xml"
+            and xml_file.parent.name == "worksheets"
+            and xml_file.parent.parent == self.unpacked_dir / "xl"
+        )
+
+    def _shared_string_count(self):
+        """Return the number of shared strings, or None if there is no such part.
+
+        The shared strings part is found through the workbook's relationships
+        and its <si> entries are counted once per run, so checking a cell's
+        index is a comparison rather than a lookup in the part.
+
+        Raises:
+            Exception: Whatever reading the workbook relationships or the
+                shared strings part raises
+        """
+        if self._shared_strings is None:
+            graph = self.relationship_graph
+            shared_strings = None
+            rels_file = graph.rels_file_for(self.unpacked_dir / "xl" / "workbook.xml")
+            if rels_file is not None:
+                for rel in graph.relationships(rels_file):
+                    if rel.type.endswith("/sharedStrings"):
+                        shared_strings = rel.target_part
+                        break
+
+            count = None
+            if shared_strings is not None:
+                si_tag = f"{{{self.SPREADSHEETML_NAMESPACE}}}si"
+                count = 0
+                for _, si in lxml.etree.iterparse(
+                    str(shared_strings), events=("end",), tag=si_tag
+                ):
+                    count += 1
+                    _release(si)
+            self._shared_strings = (count, shared_strings)
+        count, shared_strings = self._shared_strings
+        if shared_strings is not None:
+            self._examined.add(shared_strings)
+        return count
+
+    def _cell_error(self, cell, count):
+        """Return what is wrong with a cell's shared string index, or None."""
+        if cell.get("t") != "s":
+            return None
+        value = cell.find(f"{{{self.SPREADSHEETML_NAMESPACE}}}v")
+        if value is None or not value.text:
+            return None
+
+        reference = cell.get("r", "")
+        try:
+            index = int(value.text)
+        except ValueError:
+            return (
+                f"Cell {reference} has shared string index '{value.text}', "
+                "which is not a number"
+            )
+        if count is None:
+            return (
+                f"Cell {reference} references shared string {index} "
+                "but the workbook has no shared strings part"
+            )
+        if not 0 <= index < count:
+            return (
+                f"Cell {reference} references shared string {index} "
+                f"but sharedStrings.xml has {count} strings"
+            )
+        return None
+
+    def validate_worksheets(self):
+        """Validate worksheet cells, streaming worksheets too large to load.
+
+        Every t="s" cell must hold the index of an existing shared string.
+        Streamed worksheets get the checks the other parts had from the tree
+        checks as well: well-formedness, Ignorable namespace prefixes, the
+        content type declaration and r:id references (see _stream_worksheet()).
+        Errors are listed per worksheet in document order.
+        """
+        errors = []
+        error_count = 0
+        relationship_errors = False
+        worksheets = [f for f in self.xml_files if self._is_worksheet(f)]
+
+        if not worksheets:
+            if self.verbose:
+                print("PASSED - No worksheets found")
+            return True
+
+        try:
+            count = self._shared_string_count()
+        except Exception as e:
+            return self._fail(
+                f"Could not count shared strings: {e}",
+                [self._error(f"Could not count shared strings: {e}")],
+                lines=[],
+            )
+
+        cell_tag = f"{{{self.SPREADSHEETML_NAMESPACE}}}c"
+        for worksheet in worksheets:
+            start = time.perf_counter()
+            listed = []  # (line, message) of the first cell errors
+            try:
+                if worksheet in self.streamed_parts:
+                    file_errors, rid_errors, found = self._stream_worksheet(
+                        worksheet, count, listed
+                    )
+                    relationship_errors = relationship_errors or bool(rid_errors)
+                    file_errors += rid_errors
+                else:
+                    root = self._parse(worksheet).getroot()
+                    file_errors = []
+                    found = self._check_cells(root.iter(cell_tag), count, listed)
+            except lxml.etree.XMLSyntaxError as e:
+                file_errors = [self._error(e.msg, worksheet, e.lineno)]
+                listed, found = [], 0
+            except Exception as e:
+                file_errors = [self._error(f"Error: {e}", worksheet)]
+                listed, found = [], 0
+            if worksheet in self.streamed_parts:
+                self.file_times.setdefault(worksheet, {})["stream"] = (
+                    time.perf_counter() - start
+                )
+
+            # Errors in the worksheet by line, after those elsewhere (its .rels)
+            path_str = worksheet.relative_to(self.unpacked_dir).as_posix()
+            errors.extend(
+                sorted(
+                    file_errors
+                    + [self._error(message, worksheet, line) for line, message in listed],
+                    key=lambda error: (error.file == path_str, error.line or 0),
+                )
+            )
+            if found > len(listed):
+                errors.append(
+                    self._error(f"... and {found - len(listed)} more cell errors", worksheet)
+                )
+            error_count += len(file_errors) + found
+
+        if errors:
+            return self._fail(
+                f"Found {error_count} worksheet errors:",
+                errors,
+                hint=self.RELATIONSHIP_ID_HINT if relationship_errors else None,
+            )
+        else:
+            if self.verbose:
+                print(
+                    f"PASSED - All {len(worksheets)} worksheets reference valid shared strings"
+                )
+            return True
+
+    def _check_cells(self, cells, count, listed):
+        """Check the shared string index of cells and return how many are wrong.
+
+        The first MAX_CELL_ERRORS errors are appended to listed as
+        (line, message); the rest are only counted.
+        """
+        found = 0
+        for cell in cells:
+            error = self._cell_error(cell, count)
+            if error is not None:
+                found += 1
+                if len(listed) < self.MAX_CELL_ERRORS:
+                    listed.append((cell.sourceline, error))
+        return found
+
+    def _stream_worksheet(self, worksheet, count, listed):
+        """Check a streamed worksheet in one pass, one row in memory at a time.
+
+        Rows are freed once their cells are checked; everything else in the
+        worksheet is small and kept until the end, when its r:id references
+        are found the way validate_all_relationship_ids() finds them (see
+        find_references()). Elements inside rows are not searched for r:id
+        attributes: SpreadsheetML puts none there.
+
+        Args:
+            worksheet: Path to the worksheet part
+            count: Number of shared strings (None if there are none)
+            listed: List the first cell errors are appended to
+                (see _check_cells())
+
+        Returns:
+            tuple: (ErrorRecords other than cell and relationship ID errors,
+                relationship ID ErrorRecords, number of cell errors)
+
+        Raises:
+            lxml.etree.XMLSyntaxError: If the worksheet is not well-formed
+        """
+        errors = []
+        path_str = worksheet.relative_to(self.unpacked_dir).as_posix()
+        self._examined.add(worksheet)
+
+        # The root element (with its namespace declarations) comes first
+        for _, root in lxml.etree.iterparse(str(worksheet), events=("start",)):
+            break
+        declared = set(root.nsmap) - {None}
+        for attr_val in [v for k, v in root.attrib.items() if k.endswith("Ignorable")]:
+            errors.extend(
+                self._error(f"Namespace '{ns}' in Ignorable but not declared", worksheet)
+                for ns in set(attr_val.split()) - declared
+            )
+        root_name = lxml.etree.QName(root).localname
+        if root_name == "worksheet" and path_str not in self._declared_parts():
+            errors.append(
+                self._error(
+                    f"File with <{root_name}> root not declared in [Content_Types].xml",
+                    worksheet,
+                )
+            )
+
+        # Valid relationship IDs of the worksheet
+        rid_errors = []
+        graph = self.relationship_graph
+        rels_file = graph.rels_file_for(worksheet)
+        rids = None
+        if rels_file is not None:
+            rids = set()
+            for rel in graph.relationships(rels_file):
+                if rel.id:
+                    if rel.id in rids:
+                        rid_errors.append(
+                            self._error(
+                                f"Duplicate relationship ID '{rel.id}' (IDs must be unique)",
+                                rels_file,
+                                rel.sourceline,
+                            )
+                        )
+                    rids.add(rel.id)
+
+        # Rows, each freed with the rows before it once its cells are checked
+        row_tag = f"{{{self.SPREADSHEETML_NAMESPACE}}}row"
+        cell_tag = f"{{{self.SPREADSHEETML_NAMESPACE}}}c"
+        found = 0
+        rows = lxml.etree.iterparse(str(worksheet), events=("end",), tag=row_tag)
+        for _, row in rows:
+            found += self._check_cells(row.iterchildren(cell_tag), count, listed)
+            _release(row)
+
+        # What is left of the tree: everything but the rows
+        if rids is not None:
+            rid_name = f"{{{self.OFFICE_RELATIONSHIPS_NAMESPACE}}}id"
+            for elem in find_references(rows.root):
+                rid = elem.get(rid_name)
+                if rid and rid not in rids:
+                    rid_errors.append(
+                        self._error(
+                            f"<{lxml.etree.QName(elem).localname}> references non-existent relationship '{rid}' "
+                            f"(valid IDs: {', '.join(sorted(rids)[:5])}{'...' if len(rids) > 5 else ''})",
+                            worksheet,
+                            elem.sourceline,
+                        )
+                    )
+        return errors, rid_errors, found
+
+    def _declared_parts(self):
+        """Return the part names with an Override in [Content_Types].xml."""
+        content_types_file = self.unpacked_dir / "[Content_Types].xml"
+        if not content_types_file.exists():
+            return set()
+        root = self._parse(content_types_file).getroot()
+        return {
+            override.get("PartName").lstrip("/")
+            for override in root.iter(f"{{{self.CONTENT_TYPES_NAMESPACE}}}Override")
+            if override.get("PartName") is not None
+        }
+
+
+def _release(elem):
+    """Free an element handled by iterparse, and its siblings read before it."""
+    elem.clear(keep_tail=True)
+    parent = elem.getparent()
+    if parent is not None:
+        while elem.getprevious() is not None:
+            del parent[0]
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
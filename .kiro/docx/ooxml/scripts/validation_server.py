@@ -0,0 +1,438 @@
+"""
+Validation server for pack.py: soffice conversions run one at a time on a
+worker thread, through a warm office process (UnoBackend), a fresh soffice per
+document (SubprocessBackend) or a stand-in that only checks the zip
+(FakeBackend).
+"""
+
+import atexit
+import os
+import queue
+import shutil
+import signal
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+import xml.parsers.expat
+import zipfile
+from concurrent.futures import Future
+from pathlib import Path
+
+try:
+    from .xml_stream import is_xml_part
+except ImportError:
+    # Run as a script from ooxml/scripts
+    from xml_stream import is_xml_part
+
+# Process-wide server handed out by get_validation_server()
+_validation_server = None
+
+
+def get_validation_server():
+    """Return the process-wide ValidationServer, creating it on first use.
+
+    Uses a UnoBackend when the LibreOffice Python bindings are importable and a
+    SubprocessBackend otherwise. Returns None if soffice is not installed and no
+    server was set with set_validation_server().
+    """
+    global _validation_server
+    if _validation_server is None:
+        if shutil.which("soffice") is None:
+            return None
+        try:
+            import uno  # noqa: F401
+
+            backend = UnoBackend()
+        except ImportError:
+            backend = SubprocessBackend()
+        set_validation_server(ValidationServer(backend))
+    return _validation_server
+
+
+def set_validation_server(server):
+    """Replace the process-wide ValidationServer (e.g. with a FakeBackend one).
+
+    The previous server, if any, is closed.
+    """
+    global _validation_server
+    if _validation_server is not None and _validation_server is not server:
+        _validation_server.close()
+    _validation_server = server
+
+
+@atexit.register
+def _close_validation_server():
+    """Close whichever server is current when the interpreter exits."""
+    if _validation_server is not None:
+        _validation_server.close()
+
+
+class ConversionError(Exception):
+    """Raised by a backend when a document does not convert."""
+
+
+class ValidationServer:
+    """Runs soffice conversions one at a time from a queue on a worker thread.
+
+    The backend is started before each job, under its own start-up timeout.
+    The conversion then gets a watchdog: when its timeout expires the backend
+    is aborted (which kills a stuck office process) and the job fails with a
+    timeout error; the backend restarts itself for the next job.
+
+    Example:
+        server = ValidationServer(UnoBackend())
+        futures = [server.submit(path) for path in paths]
+        errors = [f.result() for f in futures]  # None for each valid file
+    """
+
+    def __init__(self, backend, timeout=10):
+        """
+        Args:
+            backend: Backend doing the conversions (UnoBackend, SubprocessBackend
+                or FakeBackend)
+            timeout: Default per-job timeout in seconds (default: 10)
+        """
+        self.backend = backend
+        self.timeout = timeout
+        self._queue = queue.Queue()
+        self._worker = None
+        self._lock = threading.Lock()
+
+    def submit(self, doc_path, timeout=None):
+        """Queue a document for conversion.
+
+        Args:
+            doc_path: Path to the Office file
+            timeout: Seconds the conversion may take (default: the server's)
+
+        Returns:
+            Future resolving to None on success or an error message
+        """
+        future = Future()
+        self._queue.put((Path(doc_path), timeout or self.timeout, future))
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, daemon=True)
+                self._worker.start()
+        return future
+
+    def validate(self, doc_path, timeout=None):
+        """Convert a document and return True if it converted."""
+        return self.submit(doc_path, timeout).result() is None
+
+    def close(self):
+        """Finish queued jobs, stop the worker and shut the backend down."""
+        with self._lock:
+            worker, self._worker = self._worker, None
+        if worker is not None:
+            self._queue.put(None)
+            worker.join()
+        self.backend.close()
+
+    def _run(self):
+        while (job := self._queue.get()) is not None:
+            doc_path, timeout, future = job
+            if future.set_running_or_notify_cancel():
+                future.set_result(self._convert(doc_path, timeout))
+
+    def _convert(self, doc_path, timeout):
+        """Run one conversion under a watchdog; return None or an error message.
+
+        The backend is started first, outside the watchdog, so an office
+        start-up is bounded by the backend's own start-up timeout rather than
+        the job's.
+        """
+        try:
+            self.backend.start()
+        except Exception as e:
+            return str(e) or type(e).__name__
+
+        # The watchdog only aborts a conversion that is still running: once
+        # convert() has returned, a late expiry is ignored
+        lock = threading.Lock()
+        finished = False
+        timed_out = False
+
+        def expire():
+            nonlocal timed_out
+            with lock:
+                if finished:
+                    return
+                timed_out = True
+            self.backend.abort()
+
+        def finish():
+            nonlocal finished
+            with lock:
+                finished = True
+                return timed_out
+
+        watchdog = threading.Timer(timeout, expire)
+        watchdog.start()
+        try:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                try:
+                    self.backend.convert(doc_path, Path(temp_dir))
+                except Exception:
+                    if finish():
+                        return "Timeout during conversion"
+                    raise
+                finish()
+                if not (Path(temp_dir) / f"{doc_path.stem}.html").exists():
+                    raise ConversionError("Document validation failed")
+        except Exception as e:
+            return str(e) or type(e).__name__
+        finally:
+            watchdog.cancel()
+        return None
+
+
+class SubprocessBackend:
+    """Starts a fresh `soffice --convert-to` process for every conversion."""
+
+    FILTERS = {
+        ".docx": "html:HTML",
+        ".pptx": "html:impress_html_Export",
+        ".xlsx": "html:HTML (StarCalc)",
+    }
+
+    def __init__(self):
+        self._process = None
+
+    def start(self):
+        """Nothing to start: every conversion runs its own process."""
+
+    def convert(self, doc_path, out_dir):
+        """Convert doc_path to HTML in out_dir, raising ConversionError on failure."""
+        self._process = subprocess.Popen(
+            [
+                "soffice",
+                "--headless",
+                "--convert-to",
+                self.FILTERS[doc_path.suffix.lower()],
+                "--outdir",
+                str(out_dir),
+                str(doc_path),
+            ],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            start_new_session=True,
+        )
+        _, stderr = self._process.communicate()
+        if not (out_dir / f"{doc_path.stem}.html").exists():
+            raise ConversionError(stderr.strip() or "Document validation failed")
+
+    def abort(self):
+        """Kill the running conversion."""
+        if self._process is not None:
+            _kill_process_group(self._process)
+
+    def close(self):
+        self.abort()
+
+
+class UnoBackend:
+    """Keeps one headless office process running and converts through UNO.
+
+    The office is started on first use with its own profile and a local socket
+    listener, and restarted after it dies or a conversion is aborted, so only
+    the first conversion (and the first after a timeout) pays for start-up.
+    Requires the LibreOffice Python bindings (the `uno` module).
+
+    abort() is called from the server's watchdog thread while a conversion may
+    be starting the office, so the process and Desktop are only read and
+    replaced under a lock, and a start-up that was aborted part way fails
+    instead of publishing its Desktop.
+    """
+
+    FILTERS = {
+        ".docx": "HTML (StarWriter)",
+        ".pptx": "impress_html_Export",
+        ".xlsx": "HTML (StarCalc)",
+    }
+
+    def __init__(self, startup_timeout=30):
+        """
+        Args:
+            startup_timeout: Seconds to wait for the office to accept connections
+        """
+        self.startup_timeout = startup_timeout
+        self._process = None
+        self._desktop = None
+        self._profile_dir = None
+        # Guards _process and _desktop; _aborts counts abort() calls so a
+        # start-up can tell it was aborted while it waited for the office
+        self._lock = threading.Lock()
+        self._aborts = 0
+
+    def start(self):
+        """Start the office process if it is not running, raising ConversionError
+        if it does not accept connections within startup_timeout."""
+        self._ensure_started()
+
+    def convert(self, doc_path, out_dir):
+        """Convert doc_path to HTML in out_dir, raising ConversionError on failure."""
+        import uno
+
+        desktop = self._ensure_started()
+        document = desktop.loadComponentFromURL(
+            uno.systemPathToFileUrl(str(doc_path.resolve())),
+            "_blank",
+            0,
+            _uno_properties(Hidden=True, ReadOnly=True),
+        )
+        if document is None:
+            raise ConversionError("Document could not be loaded")
+        try:
+            out_file = (out_dir / f"{doc_path.stem}.html").resolve()
+            document.storeToURL(
+                uno.systemPathToFileUrl(str(out_file)),
+                _uno_properties(FilterName=self.FILTERS[doc_path.suffix.lower()]),
+            )
+        finally:
+            document.close(True)
+
+    def abort(self):
+        """Kill the office process; the next conversion starts a new one."""
+        with self._lock:
+            process, self._process = self._process, None
+            self._desktop = None
+            self._aborts += 1
+        if process is not None:
+            _kill_process_group(process)
+            process.wait()
+
+    def close(self):
+        self.abort()
+        if self._profile_dir is not None:
+            shutil.rmtree(self._profile_dir, ignore_errors=True)
+            self._profile_dir = None
+
+    def _ensure_started(self):
+        """Return the office Desktop, starting the office process if needed."""
+        import uno
+        from com.sun.star.connection import NoConnectException
+
+        with self._lock:
+            if self._desktop is not None and self._process.poll() is None:
+                return self._desktop
+        self.abort()
+
+        if self._profile_dir is None:
+            self._profile_dir = tempfile.mkdtemp(prefix="soffice_profile_")
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]
+        connection = (
+            f"socket,host=127.0.0.1,port={port};urp;StarOffice.ComponentContext"
+        )
+        with self._lock:
+            process = self._process = subprocess.Popen(
+                [
+                    "soffice",
+                    "--headless",
+                    "--invisible",
+                    "--nologo",
+                    "--norestore",
+                    "--nodefault",
+                    f"-env:UserInstallation={Path(self._profile_dir).as_uri()}",
+                    f"--accept={connection}",
+                ],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True,
+            )
+            aborts = self._aborts
+
+        local = uno.getComponentContext()
+        resolver = local.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local
+        )
+        deadline = time.monotonic() + self.startup_timeout
+        while True:
+            try:
+                context = resolver.resolve(f"uno:{connection}")
+                break
+            except NoConnectException:
+                if process.poll() is not None or time.monotonic() > deadline:
+                    self.abort()
+                    raise ConversionError("soffice did not start")
+                time.sleep(0.1)
+        desktop = context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.frame.Desktop", context
+        )
+        with self._lock:
+            if self._aborts != aborts:
+                raise ConversionError("Conversion aborted")
+            self._desktop = desktop
+        return desktop
+
+
+def _kill_process_group(process):
+    """Kill a process started with start_new_session=True and everything it
+    spawned (soffice runs the real office as a child process)."""
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (AttributeError, OSError):
+        # No process groups (Windows), or the group is already gone
+        if process.poll() is None:
+            process.kill()
+
+
+def _uno_properties(**values):
+    """Build a tuple of UNO PropertyValues from keyword arguments."""
+    from com.sun.star.beans import PropertyValue
+
+    return tuple(
+        PropertyValue(Name=name, Value=value) for name, value in values.items()
+    )
+
+
+class FakeBackend:
+    """Stand-in backend for tests and machines without soffice.
+
+    A document "converts" if it is a zip holding [Content_Types].xml and
+    well-formed XML parts; an HTML stub is written like a real conversion would.
+    """
+
+    def __init__(self, delay=0.0):
+        """
+        Args:
+            delay: Seconds each conversion takes, to exercise timeouts
+        """
+        self.delay = delay
+        self.converted = []
+        self._aborted = threading.Event()
+
+    def start(self):
+        pass
+
+    def convert(self, doc_path, out_dir):
+        """Check doc_path and write an HTML stub, raising ConversionError on failure."""
+        self._aborted.clear()
+        if self._aborted.wait(self.delay):
+            raise ConversionError("Conversion aborted")
+        try:
+            with zipfile.ZipFile(doc_path) as zf:
+                if "[Content_Types].xml" not in zf.namelist():
+                    raise ConversionError("Missing [Content_Types].xml")
+                for name in zf.namelist():
+                    if is_xml_part(name):
+                        xml.parsers.expat.ParserCreate().Parse(zf.read(name), True)
+        except (zipfile.BadZipFile, xml.parsers.expat.ExpatError) as e:
+            raise ConversionError(f"{doc_path.name}: {e}") from e
+        (out_dir / f"{doc_path.stem}.html").write_text("<html></html>")
+        self.converted.append(doc_path)
+
+    def abort(self):
+        self._aborted.set()
+
+    def close(self):
+        pass
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
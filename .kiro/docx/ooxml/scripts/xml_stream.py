@@ -0,0 +1,88 @@
+"""
+Helpers shared by the streaming XML writers of pack.py and unpack.py.
+
+Both read parts as expat events instead of building a minidom tree, and must
+write exactly what minidom would (toxml() when packing, toprettyxml() when
+unpacking). Parsing, names, start tags and escaping work the same either way.
+"""
+
+import xml.parsers.expat
+
+
+class NeedsDom(Exception):
+    """Raised by a streaming writer for input it leaves to minidom (a DOCTYPE)."""
+
+
+def is_xml_part(name):
+    """Check whether a part name is one that gets reformatted (*.xml, *.rels)."""
+    return name.endswith((".xml", ".rels"))
+
+
+def create_parser(ns_decls):
+    """Create an expat parser set up for a streaming writer.
+
+    Element and attribute names are reported as "uri local prefix" (see
+    qname()), attributes as a flat [name, value, ...] list in document order
+    and adjacent text as one call. Namespace declarations are appended to
+    ns_decls as (prefix, uri) pairs, for the next start_tag() to consume.
+    A DOCTYPE raises NeedsDom.
+
+    Args:
+        ns_decls: List to collect pending namespace declarations in
+    """
+    parser = xml.parsers.expat.ParserCreate(namespace_separator=" ")
+    parser.namespace_prefixes = True
+    parser.ordered_attributes = True
+    parser.buffer_text = True
+    parser.StartNamespaceDeclHandler = lambda prefix, uri: ns_decls.append(
+        (prefix, uri)
+    )
+    parser.StartDoctypeDeclHandler = _refuse_doctype
+    return parser
+
+
+def _refuse_doctype(*args):
+    raise NeedsDom()
+
+
+def start_tag(qualified_name, ns_decls, attrs):
+    """Write a start tag, without its closing > or />, the way minidom does.
+
+    Namespace declarations come first, then the attributes in document order.
+    ns_decls is cleared.
+
+    Args:
+        qualified_name: The element's prefix:local name
+        ns_decls: Pending (prefix, uri) declarations from create_parser()
+        attrs: Flat [name, value, ...] attribute list as expat reports it
+    """
+    pieces = ["<" + qualified_name]
+    for prefix, uri in ns_decls:
+        attr = f"xmlns:{prefix}" if prefix else "xmlns"
+        pieces.append(f' {attr}="{escape(uri or "")}"')
+    ns_decls.clear()
+    for i in range(0, len(attrs), 2):
+        pieces.append(f' {qname(attrs[i])}="{escape(attrs[i + 1])}"')
+    return "".join(pieces)
+
+
+def qname(name):
+    """Rebuild prefix:local from an expat "uri local prefix" name."""
+    parts = name.split(" ")
+    if len(parts) == 3:
+        return f"{parts[2]}:{parts[1]}"
+    return parts[-1]
+
+
+def escape(data):
+    """Escape text or an attribute value the way minidom writes it."""
+    return (
+        data.replace("&", "&amp;")
+        .replace("<", "&lt;")
+        .replace('"', "&quot;")
+        .replace(">", "&gt;")
+    )
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
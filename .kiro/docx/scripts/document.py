@@ -9,6 +9,12 @@ Usage:
     doc = Document('workspace/unpacked')
     doc = Document('workspace/unpacked', author="John Doe", initials="JD")
 
+    # Copy-on-write working tree, validated against the original .docx as-is
+    doc = Document('workspace/unpacked', lazy=True, original_docx='input.docx')
+
+    # Work on a .docx directly; only accessed parts are parsed, only edited ones written
+    doc = Document.open_docx('input.docx')
+
     # Find nodes
     node = doc["word/document.xml"].get_node(tag="w:del", attrs={"w:id": "1"})
     node = doc["word/document.xml"].get_node(tag="w:p", line_number=10)
@@ -22,19 +28,29 @@ Usage:
     doc["word/document.xml"].revert_insertion(ins_node)  # Reject insertion
     doc["word/document.xml"].revert_deletion(del_node)  # Reject deletion
 
+    # Group many edits; comment side files are written once on exit
+    with doc.batch():
+        for node in nodes:
+            doc.add_comment(start=node, end=node, text="Comment text")
+
     # Save
     doc.save()
+    doc.save_docx('output.docx')  # for open_docx() documents
 """
 
 import html
+import os
 import random
 import shutil
 import tempfile
+import zipfile
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Optional
 
 from defusedxml import minidom
-from ooxml.scripts.pack import pack_document
+from ooxml.scripts.pack import pack_document, update_package
 from ooxml.scripts.validation.docx import DOCXSchemaValidator
 from ooxml.scripts.validation.redlining import RedliningValidator
 
@@ -57,7 +73,12 @@ class DocxXMLEditor(XMLEditor):
     """
 
     def __init__(
-        self, xml_path, rsid: str, author: str = "Claude", initials: str = "C"
+        self,
+        xml_path,
+        rsid: str,
+        author: str = "Claude",
+        initials: str = "C",
+        content: Optional[bytes] = None,
     ):
         """Initialize with required RSID and optional author.
 
@@ -66,17 +87,23 @@ class DocxXMLEditor(XMLEditor):
             rsid: RSID to automatically apply to new elements
             author: Author name for tracked changes and comments (default: "Claude")
             initials: Author initials (default: "C")
+            content: Optional XML bytes to parse instead of reading xml_path
         """
-        super().__init__(xml_path)
+        super().__init__(xml_path, content=content)
         self.rsid = rsid
         self.author = author
         self.initials = initials
 
+        # While a Document.batch() is open the next w:id is carried across
+        # insertions instead of rescanning every w:ins/w:del each time
+        self._cache_change_ids = False
+        self._next_change_id = None
+
     def _get_next_change_id(self):
         """Get the next available change ID by checking all tracked change elements."""
         max_id = -1
         for tag in ("w:ins", "w:del"):
-            elements = self.dom.getElementsByTagName(tag)
+            elements = self._dom.getElementsByTagName(tag)
             for elem in elements:
                 change_id = elem.getAttribute("w:id")
                 if change_id:
@@ -88,7 +115,7 @@ class DocxXMLEditor(XMLEditor):
 
     def _ensure_w16du_namespace(self):
         """Ensure w16du namespace is declared on the root element."""
-        root = self.dom.documentElement
+        root = self._dom.documentElement
         if not root.hasAttribute("xmlns:w16du"):  # type: ignore
             root.setAttribute(  # type: ignore
                 "xmlns:w16du",
@@ -97,7 +124,7 @@ class DocxXMLEditor(XMLEditor):
 
     def _ensure_w16cex_namespace(self):
         """Ensure w16cex namespace is declared on the root element."""
-        root = self.dom.documentElement
+        root = self._dom.documentElement
         if not root.hasAttribute("xmlns:w16cex"):  # type: ignore
             root.setAttribute(  # type: ignore
                 "xmlns:w16cex",
@@ -106,7 +133,7 @@ class DocxXMLEditor(XMLEditor):
 
     def _ensure_w14_namespace(self):
         """Ensure w14 namespace is declared on the root element."""
-        root = self.dom.documentElement
+        root = self._dom.documentElement
         if not root.hasAttribute("xmlns:w14"):  # type: ignore
             root.setAttribute(  # type: ignore
                 "xmlns:w14",
@@ -140,6 +167,9 @@ class DocxXMLEditor(XMLEditor):
                 parent = parent.parentNode
             return False
 
+        # Next free w:id, resolved on first use with a single scan of the DOM
+        next_change_id = self._next_change_id if self._cache_change_ids else None
+
         def add_rsid_to_p(elem):
             if not elem.hasAttribute("w:rsidR"):
                 elem.setAttribute("w:rsidR", self.rsid)
@@ -155,9 +185,9 @@ class DocxXMLEditor(XMLEditor):
                 self._ensure_w14_namespace()
                 elem.setAttribute("w14:textId", _generate_hex_id())
 
-        def add_rsid_to_r(elem):
+        def add_rsid_to_r(elem, inside_del):
             # Use w:rsidDel for <w:r> inside <w:del>, otherwise w:rsidR
-            if is_inside_deletion(elem):
+            if inside_del:
                 if not elem.hasAttribute("w:rsidDel"):
                     elem.setAttribute("w:rsidDel", self.rsid)
             else:
@@ -165,9 +195,20 @@ class DocxXMLEditor(XMLEditor):
                     elem.setAttribute("w:rsidR", self.rsid)
 
         def add_tracked_change_attrs(elem):
+            nonlocal next_change_id
             # Auto-assign w:id if not present
             if not elem.hasAttribute("w:id"):
-                elem.setAttribute("w:id", str(self._get_next_change_id()))
+                if next_change_id is None:
+                    next_change_id = self._get_next_change_id()
+                elem.setAttribute("w:id", str(next_change_id))
+                next_change_id += 1
+            elif next_change_id is not None:
+                # Keep the running counter ahead of explicitly supplied IDs
+                try:
+                    explicit_id = int(elem.getAttribute("w:id"))
+                    next_change_id = max(next_change_id, explicit_id + 1)
+                except ValueError:
+                    pass
             if not elem.hasAttribute("w:author"):
                 elem.setAttribute("w:author", self.author)
             if not elem.hasAttribute("w:date"):
@@ -204,15 +245,48 @@ class DocxXMLEditor(XMLEditor):
                     if not elem.hasAttribute("xml:space"):
                         elem.setAttribute("xml:space", "preserve")
 
+        def walk(elem, inside_del, ins_elems, del_elems, cex_elems):
+            # Single pre-order pass over descendants. Tracked changes and
+            # commentExtensible elements are collected and handled afterwards so
+            # IDs and namespace declarations are assigned in the same order as
+            # the per-tag passes this replaces (w:p, w:r, w:t, w:ins, w:del, ...).
+            for child in elem.childNodes:
+                if child.nodeType != child.ELEMENT_NODE:
+                    continue
+                tag = child.tagName
+                if tag == "w:p":
+                    add_rsid_to_p(child)
+                elif tag == "w:r":
+                    add_rsid_to_r(child, inside_del)
+                elif tag == "w:t":
+                    add_xml_space_to_t(child)
+                elif tag == "w:ins":
+                    ins_elems.append(child)
+                elif tag == "w:del":
+                    del_elems.append(child)
+                elif tag == "w:comment":
+                    add_comment_attrs(child)
+                elif tag == "w16cex:commentExtensible":
+                    cex_elems.append(child)
+                walk(
+                    child,
+                    inside_del or tag == "w:del",
+                    ins_elems,
+                    del_elems,
+                    cex_elems,
+                )
+
         for node in nodes:
             if node.nodeType != node.ELEMENT_NODE:
                 continue
 
+            node_inside_del = is_inside_deletion(node)
+
             # Handle the node itself
             if node.tagName == "w:p":
                 add_rsid_to_p(node)
             elif node.tagName == "w:r":
-                add_rsid_to_r(node)
+                add_rsid_to_r(node, node_inside_del)
             elif node.tagName == "w:t":
                 add_xml_space_to_t(node)
             elif node.tagName in ("w:ins", "w:del"):
@@ -222,21 +296,23 @@ class DocxXMLEditor(XMLEditor):
             elif node.tagName == "w16cex:commentExtensible":
                 add_comment_extensible_date(node)
 
-            # Process descendants (getElementsByTagName doesn't return the element itself)
-            for elem in node.getElementsByTagName("w:p"):
-                add_rsid_to_p(elem)
-            for elem in node.getElementsByTagName("w:r"):
-                add_rsid_to_r(elem)
-            for elem in node.getElementsByTagName("w:t"):
-                add_xml_space_to_t(elem)
-            for tag in ("w:ins", "w:del"):
-                for elem in node.getElementsByTagName(tag):
-                    add_tracked_change_attrs(elem)
-            for elem in node.getElementsByTagName("w:comment"):
-                add_comment_attrs(elem)
-            for elem in node.getElementsByTagName("w16cex:commentExtensible"):
+            # Process descendants in one traversal
+            ins_elems, del_elems, cex_elems = [], [], []
+            walk(
+                node,
+                node_inside_del or node.tagName == "w:del",
+                ins_elems,
+                del_elems,
+                cex_elems,
+            )
+            for elem in ins_elems + del_elems:
+                add_tracked_change_attrs(elem)
+            for elem in cex_elems:
                 add_comment_extensible_date(elem)
 
+        if self._cache_change_ids:
+            self._next_change_id = next_change_id
+
     def replace_node(self, elem, new_content):
         """Replace node with automatic attribute injection."""
         nodes = super().replace_node(elem, new_content)
@@ -306,7 +382,7 @@ class DocxXMLEditor(XMLEditor):
                 continue
 
             # Create deletion wrapper
-            del_wrapper = self.dom.createElement("w:del")
+            del_wrapper = self._dom.createElement("w:del")
 
             # Process each run
             for run in runs:
@@ -318,7 +394,7 @@ class DocxXMLEditor(XMLEditor):
                     run.setAttribute("w:rsidDel", self.rsid)
 
                 for t_elem in list(run.getElementsByTagName("w:t")):
-                    del_text = self.dom.createElement("w:delText")
+                    del_text = self._dom.createElement("w:delText")
                     # Copy ALL child nodes (not just firstChild) to handle entities
                     while t_elem.firstChild:
                         del_text.appendChild(t_elem.firstChild)
@@ -336,6 +412,7 @@ class DocxXMLEditor(XMLEditor):
 
             # Inject attributes to the deletion wrapper
             self._inject_attributes_to_nodes([del_wrapper])
+            self.dirty = True
 
         return [elem]
 
@@ -391,7 +468,7 @@ class DocxXMLEditor(XMLEditor):
                 continue
 
             # Create insertion wrapper
-            ins_elem = self.dom.createElement("w:ins")
+            ins_elem = self._dom.createElement("w:ins")
 
             for run in runs:
                 # Clone the run
@@ -399,7 +476,7 @@ class DocxXMLEditor(XMLEditor):
 
                 # Convert w:delText → w:t
                 for del_text in list(new_run.getElementsByTagName("w:delText")):
-                    t_elem = self.dom.createElement("w:t")
+                    t_elem = self._dom.createElement("w:t")
                     # Copy ALL child nodes (not just firstChild) to handle entities
                     while del_text.firstChild:
                         t_elem.appendChild(del_text.firstChild)
@@ -502,7 +579,7 @@ class DocxXMLEditor(XMLEditor):
 
             # Convert w:t → w:delText
             for t_elem in list(elem.getElementsByTagName("w:t")):
-                del_text = self.dom.createElement("w:delText")
+                del_text = self._dom.createElement("w:delText")
                 # Copy ALL child nodes (not just firstChild) to handle entities
                 while t_elem.firstChild:
                     del_text.appendChild(t_elem.firstChild)
@@ -520,7 +597,7 @@ class DocxXMLEditor(XMLEditor):
                 elem.setAttribute("w:rsidDel", self.rsid)
 
             # Wrap in w:del
-            del_wrapper = self.dom.createElement("w:del")
+            del_wrapper = self._dom.createElement("w:del")
             parent = elem.parentNode
             parent.insertBefore(del_wrapper, elem)
             parent.removeChild(elem)
@@ -528,6 +605,7 @@ class DocxXMLEditor(XMLEditor):
 
             # Inject attributes to the deletion wrapper
             self._inject_attributes_to_nodes([del_wrapper])
+            self.dirty = True
 
             return del_wrapper
 
@@ -546,20 +624,20 @@ class DocxXMLEditor(XMLEditor):
                 rPr_list = pPr.getElementsByTagName("w:rPr")
 
                 if not rPr_list:
-                    rPr = self.dom.createElement("w:rPr")
+                    rPr = self._dom.createElement("w:rPr")
                     pPr.appendChild(rPr)
                 else:
                     rPr = rPr_list[0]
 
                 # Add <w:del/> marker
-                del_marker = self.dom.createElement("w:del")
+                del_marker = self._dom.createElement("w:del")
                 rPr.insertBefore(
                     del_marker, rPr.firstChild
                 ) if rPr.firstChild else rPr.appendChild(del_marker)
 
             # Convert w:t → w:delText in all runs
             for t_elem in list(elem.getElementsByTagName("w:t")):
-                del_text = self.dom.createElement("w:delText")
+                del_text = self._dom.createElement("w:delText")
                 # Copy ALL child nodes (not just firstChild) to handle entities
                 while t_elem.firstChild:
                     del_text.appendChild(t_elem.firstChild)
@@ -578,7 +656,7 @@ class DocxXMLEditor(XMLEditor):
                     run.setAttribute("w:rsidDel", self.rsid)
 
             # Wrap all non-pPr children in <w:del>
-            del_wrapper = self.dom.createElement("w:del")
+            del_wrapper = self._dom.createElement("w:del")
             for child in [c for c in elem.childNodes if c.nodeName != "w:pPr"]:
                 elem.removeChild(child)
                 del_wrapper.appendChild(child)
@@ -586,6 +664,7 @@ class DocxXMLEditor(XMLEditor):
 
             # Inject attributes to the deletion wrapper
             self._inject_attributes_to_nodes([del_wrapper])
+            self.dirty = True
 
             return elem
 
@@ -609,6 +688,55 @@ def _generate_rsid() -> str:
     return "".join(random.choices("0123456789ABCDEF", k=8))
 
 
+def _link_or_copy(src, dst):
+    """Hard-link src to dst, falling back to a real copy (e.g. across filesystems)."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+    return dst
+
+
+def _replace_file(src, dst):
+    """copy2() src over dst through a temp file beside dst, atomically swapped in."""
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    temp_dst = os.path.join(
+        os.path.dirname(dst), f".{os.path.basename(dst)}.tmp"
+    )
+    shutil.copy2(src, temp_dst)
+    os.replace(temp_dst, dst)
+    return dst
+
+
+def _lazy_temp_dir(original_path):
+    """Create the temp dir for a lazy Document on the same device as original_path.
+
+    Hard links only work within one filesystem. The system temp dir is used if
+    it is on the original's device, else a hidden directory beside the original;
+    if neither applies (e.g. a read-only directory) a system temp dir is
+    returned anyway and files are copied instead of linked.
+    """
+    try:
+        same_device = (
+            os.stat(tempfile.gettempdir()).st_dev == os.stat(original_path).st_dev
+        )
+    except OSError:
+        same_device = False
+    if not same_device:
+        try:
+            return tempfile.mkdtemp(prefix=".docx_", dir=original_path.resolve().parent)
+        except OSError:
+            pass
+    return tempfile.mkdtemp(prefix="docx_")
+
+
+def _is_attached(node) -> bool:
+    """Check that a DOM node is still reachable from its document root."""
+    while node.parentNode is not None:
+        node = node.parentNode
+    return node.nodeType == node.DOCUMENT_NODE
+
+
 class Document:
     """Manages comments in unpacked Word documents."""
 
@@ -619,6 +747,8 @@ class Document:
         track_revisions=False,
         author="Claude",
         initials="C",
+        original_docx=None,
+        lazy=False,
     ):
         """
         Initialize with path to unpacked Word document directory.
@@ -630,21 +760,99 @@ class Document:
             track_revisions: If True, enables track revisions in settings.xml (default: False)
             author: Default author name for comments (default: "Claude")
             initials: Default author initials for comments (default: "C")
+            original_docx: Optional path to the .docx that unpacked_dir was unpacked from.
+                Used directly as the validation baseline instead of repacking unpacked_dir.
+            lazy: If True, the working copy hard-links files from unpacked_dir instead of
+                copying them (parts are replaced, never written in place, once edited), and
+                the validation baseline is only packed when first needed (default: False).
+                Do not modify files under unpacked_path in place in this mode.
         """
         self.original_path = Path(unpacked_dir)
 
         if not self.original_path.exists() or not self.original_path.is_dir():
             raise ValueError(f"Directory not found: {unpacked_dir}")
+        if original_docx is not None and not Path(original_docx).is_file():
+            raise ValueError(f"Original file not found: {original_docx}")
+
+        # Create temporary directory with subdirectories for unpacked content and baseline.
+        # Lazy mode keeps it on the original's device so hard links can be used.
+        if lazy:
+            self.temp_dir = _lazy_temp_dir(self.original_path)
+        else:
+            self.temp_dir = tempfile.mkdtemp(prefix="docx_")
+        self.unpacked_path = Path(self.temp_dir) / "unpacked"
+        shutil.copytree(
+            self.original_path,
+            self.unpacked_path,
+            copy_function=_link_or_copy if lazy else shutil.copy2,
+        )
+
+        # Validation baseline: the caller's .docx, or the original directory packed
+        # into the temp dir (outside unpacked dir) - on first use in lazy mode
+        self._original_docx = Path(original_docx) if original_docx else None
+        if self._original_docx is None and not lazy:
+            self._pack_baseline()
+
+        # Not working on a zip (see open_docx)
+        self._package_path = None
+        self._package_members = None
+
+        self._init_session(rsid, track_revisions, author, initials)
+
+    @classmethod
+    def open_docx(
+        cls,
+        docx_path,
+        rsid=None,
+        track_revisions=False,
+        author="Claude",
+        initials="C",
+    ):
+        """
+        Open a .docx directly, without unpacking it to disk first.
+
+        Parts are parsed straight from the zip only when they are first accessed.
+        Edited and new parts are written to a sparse overlay in the temp dir, and
+        save_docx() copies every other zip member through untouched. The .docx
+        itself is the validation baseline. Use save_docx() instead of save().
+
+        Args:
+            docx_path: Path to the .docx file
+            rsid, track_revisions, author, initials: As for Document()
+
+        Returns:
+            Document working on the zip
+
+        Raises:
+            ValueError: If the file does not exist or is not a zip
+
+        Example:
+            doc = Document.open_docx("input.docx")
+            doc.add_comment(start=node, end=node, text="Comment text")
+            doc.save_docx("output.docx")
+        """
+        docx_path = Path(docx_path)
+        if not docx_path.is_file() or not zipfile.is_zipfile(docx_path):
+            raise ValueError(f"Not a .docx file: {docx_path}")
+
+        self = cls.__new__(cls)
+        self.original_path = None
+        self._package_path = docx_path
+        with zipfile.ZipFile(docx_path) as zf:
+            self._package_members = {
+                info.filename for info in zf.infolist() if not info.is_dir()
+            }
 
-        # Create temporary directory with subdirectories for unpacked content and baseline
         self.temp_dir = tempfile.mkdtemp(prefix="docx_")
         self.unpacked_path = Path(self.temp_dir) / "unpacked"
-        shutil.copytree(self.original_path, self.unpacked_path)
+        self.unpacked_path.mkdir()
+        self._original_docx = docx_path
 
-        # Pack original directory into temporary .docx for validation baseline (outside unpacked dir)
-        self.original_docx = Path(self.temp_dir) / "original.docx"
-        pack_document(self.original_path, self.original_docx, validate=False)
+        self._init_session(rsid, track_revisions, author, initials)
+        return self
 
+    def _init_session(self, rsid, track_revisions, author, initials):
+        """Set up editing state shared by Document() and open_docx()."""
         self.word_path = self.unpacked_path / "word"
 
         # Generate RSID if not provided
@@ -657,6 +865,18 @@ class Document:
 
         # Cache for lazy-loaded editors
         self._editors = {}
+        # Relative paths written to the working tree since the last save() to
+        # the original directory
+        self._written = set()
+
+        # Pending side-file XML while a batch() is open (None outside a batch)
+        self._batch = None
+        # Comment ID -> [w:commentRangeStart], [w:commentReference] lookup, built
+        # on the first reply inside a batch
+        self._comment_anchors = None
+        # Anchor lookups that failed inside a batch -> error message, kept until
+        # the next comment is inserted
+        self._comment_anchor_misses = {}
 
         # Comment file paths
         self.comments_path = self.word_path / "comments.xml"
@@ -702,14 +922,75 @@ class Document:
         """
         if xml_path not in self._editors:
             file_path = self.unpacked_path / xml_path
+            content = None
             if not file_path.exists():
-                raise ValueError(f"XML file not found: {xml_path}")
+                if not self._part_exists(xml_path):
+                    raise ValueError(f"XML file not found: {xml_path}")
+                # Parse the part straight from the zip; it is only written to the
+                # overlay if it changes
+                with zipfile.ZipFile(self._package_path) as zf:
+                    content = zf.read(xml_path)
             # Use DocxXMLEditor with RSID, author, and initials for all editors
-            self._editors[xml_path] = DocxXMLEditor(
-                file_path, rsid=self.rsid, author=self.author, initials=self.initials
+            editor = DocxXMLEditor(
+                file_path,
+                rsid=self.rsid,
+                author=self.author,
+                initials=self.initials,
+                content=content,
             )
+            editor._cache_change_ids = self._batch is not None
+            self._editors[xml_path] = editor
         return self._editors[xml_path]
 
+    @contextmanager
+    def batch(self):
+        """
+        Group many comments, replies and tracked changes into one transaction.
+
+        Inside the block, comment anchors are still placed in document.xml
+        immediately (so returned nodes and IDs are usable right away), but the
+        entries for comments.xml, commentsExtended.xml, commentsIds.xml and
+        commentsExtensible.xml are queued and appended on exit with one fragment
+        parse per part and a single root lookup. Tracked change IDs are handed
+        out from a running counter and reply anchors are resolved from an index,
+        so neither rescans document.xml per call. Nested batches join the
+        outermost one.
+
+        If the block raises, the entries queued so far are still appended
+        before the exception propagates, so every anchor already placed in
+        document.xml keeps its comment and the parts stay consistent.
+
+        The tracked change counter only sees w:ins/w:del added through the
+        editor methods (insert_after(), replace_node() and the like). Ones
+        added by manipulating the DOM directly inside the block are not
+        counted, so their w:id values may be handed out again.
+
+        Example:
+            with doc.batch():
+                for node in nodes:
+                    doc.add_comment(start=node, end=node, text="Please review")
+            doc.save()
+        """
+        if self._batch is not None:
+            yield self
+            return
+
+        self._batch = {}
+        for editor in self._editors.values():
+            editor._cache_change_ids = True
+        try:
+            yield self
+        finally:
+            try:
+                self._flush_batch()
+            finally:
+                self._batch = None
+                self._comment_anchors = None
+                self._comment_anchor_misses = {}
+                for editor in self._editors.values():
+                    editor._cache_change_ids = False
+                    editor._next_change_id = None
+
     def add_comment(self, start, end, text: str) -> int:
         """
         Add a comment spanning from one element to another.
@@ -733,14 +1014,21 @@ class Document:
         timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
         # Add comment ranges to document.xml immediately
-        self._document.insert_before(start, self._comment_range_start_xml(comment_id))
+        start_nodes = self._document.insert_before(
+            start, self._comment_range_start_xml(comment_id)
+        )
 
         # If end node is a paragraph, append comment markup inside it
         # Otherwise insert after it (for run-level anchors)
         if end.tagName == "w:p":
-            self._document.append_to(end, self._comment_range_end_xml(comment_id))
+            end_nodes = self._document.append_to(
+                end, self._comment_range_end_xml(comment_id)
+            )
         else:
-            self._document.insert_after(end, self._comment_range_end_xml(comment_id))
+            end_nodes = self._document.insert_after(
+                end, self._comment_range_end_xml(comment_id)
+            )
+        self._record_comment_anchors(start_nodes + end_nodes)
 
         # Add to comments.xml immediately
         self._add_to_comments_xml(
@@ -790,23 +1078,24 @@ class Document:
         timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
         # Add comment ranges to document.xml immediately
-        parent_start_elem = self._document.get_node(
-            tag="w:commentRangeStart", attrs={"w:id": str(parent_comment_id)}
+        parent_start_elem = self._find_comment_anchor(
+            "w:commentRangeStart", parent_comment_id
         )
-        parent_ref_elem = self._document.get_node(
-            tag="w:commentReference", attrs={"w:id": str(parent_comment_id)}
+        parent_ref_elem = self._find_comment_anchor(
+            "w:commentReference", parent_comment_id
         )
 
-        self._document.insert_after(
+        start_nodes = self._document.insert_after(
             parent_start_elem, self._comment_range_start_xml(comment_id)
         )
         parent_ref_run = parent_ref_elem.parentNode
         self._document.insert_after(
             parent_ref_run, f'<w:commentRangeEnd w:id="{comment_id}"/>'
         )
-        self._document.insert_after(
+        ref_nodes = self._document.insert_after(
             parent_ref_run, self._comment_ref_run_xml(comment_id)
         )
+        self._record_comment_anchors(start_nodes + ref_nodes)
 
         # Add to comments.xml immediately
         self._add_to_comments_xml(
@@ -832,9 +1121,21 @@ class Document:
 
     def __del__(self):
         """Clean up temporary directory on deletion."""
-        if hasattr(self, "temp_dir") and Path(self.temp_dir).exists():
+        if getattr(self, "temp_dir", None) and Path(self.temp_dir).exists():
             shutil.rmtree(self.temp_dir)
 
+    @property
+    def original_docx(self) -> Path:
+        """Path to the .docx used as the validation baseline, packed on first use."""
+        if self._original_docx is None:
+            self._pack_baseline()
+        return self._original_docx
+
+    def _pack_baseline(self):
+        """Pack the original directory into the temp dir as the validation baseline."""
+        self._original_docx = Path(self.temp_dir) / "original.docx"
+        pack_document(self.original_path, self._original_docx, validate=False)
+
     def validate(self) -> None:
         """
         Validate the document against XSD schema and redlining rules.
@@ -842,12 +1143,34 @@ class Document:
         Raises:
             ValueError: If validation fails.
         """
+        if self._package_path is None:
+            self._run_validators(self.unpacked_path)
+            return
+
+        # The overlay only holds changed parts, so lay it over the zip's XML in a
+        # scratch tree. Other members get empty placeholders: the validators only
+        # look at their names.
+        with tempfile.TemporaryDirectory(dir=self.temp_dir) as temp_dir:
+            tree = Path(temp_dir)
+            with zipfile.ZipFile(self._package_path) as zf:
+                for name in self._package_members:
+                    target = tree / name
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    if name.endswith((".xml", ".rels")):
+                        target.write_bytes(zf.read(name))
+                    else:
+                        target.touch()
+            shutil.copytree(self.unpacked_path, tree, dirs_exist_ok=True)
+            self._run_validators(tree)
+
+    def _run_validators(self, unpacked_dir):
+        """Run schema and redlining validation on an unpacked tree."""
         # Create validators with current state
         schema_validator = DOCXSchemaValidator(
-            self.unpacked_path, self.original_docx, verbose=False
+            unpacked_dir, self.original_docx, verbose=False
         )
         redlining_validator = RedliningValidator(
-            self.unpacked_path, self.original_docx, verbose=False
+            unpacked_dir, self.original_docx, verbose=False
         )
 
         # Run validations
@@ -861,19 +1184,23 @@ class Document:
         Save all modified XML files to disk and copy to destination directory.
 
         This persists all changes made via add_comment() and reply_to_comment().
+        Only parts whose content changed are rewritten. Saving back to the
+        original directory copies just the files this Document wrote since the
+        last save there (edited parts and parts created from templates), each
+        through a temp file that is atomically swapped into place; any other
+        destination gets the whole tree.
 
         Args:
             destination: Optional path to save to. If None, saves back to original directory.
             validate: If True, validates document before saving (default: True).
+
+        Raises:
+            ValueError: If the document was opened with open_docx() (use save_docx())
         """
-        # Only ensure comment relationships and content types if comment files exist
-        if self.comments_path.exists():
-            self._ensure_comment_relationships()
-            self._ensure_comment_content_types()
+        if self._package_path is not None:
+            raise ValueError("Document was opened from a .docx; use save_docx()")
 
-        # Save all modified XML files in temp directory
-        for editor in self._editors.values():
-            editor.save()
+        self._write_parts()
 
         # Validate by default
         if validate:
@@ -881,18 +1208,76 @@ class Document:
 
         # Copy contents from temp directory to destination (or original directory)
         target_path = Path(destination) if destination else self.original_path
-        shutil.copytree(self.unpacked_path, target_path, dirs_exist_ok=True)
+        if target_path.resolve() != self.original_path.resolve():
+            shutil.copytree(self.unpacked_path, target_path, dirs_exist_ok=True)
+            return
+
+        # Pin the baseline before overwriting the files it is packed from
+        if self._original_docx is None:
+            self._pack_baseline()
+        # Every other file is still what the working tree was copied from
+        for relative_path in sorted(self._written):
+            _replace_file(
+                self.unpacked_path / relative_path, target_path / relative_path
+            )
+        self._written.clear()
+
+    def save_docx(self, output_file, validate=True) -> None:
+        """
+        Write the edited document as a .docx (for documents from open_docx()).
+
+        Only parts that were changed or added are serialized and compressed;
+        every other zip member is copied over as its raw compressed bytes.
+
+        Args:
+            output_file: Path to the output .docx (may be the file that was opened)
+            validate: If True, validates document before saving (default: True).
+
+        Raises:
+            ValueError: If the document was not opened with open_docx()
+        """
+        if self._package_path is None:
+            raise ValueError("save_docx() requires a document from open_docx()")
+
+        self._write_parts()
+
+        # Validate by default
+        if validate:
+            self.validate()
+
+        # Keep the baseline valid if the source is about to be overwritten
+        output_file = Path(output_file)
+        if output_file.resolve() == self._package_path.resolve():
+            baseline = Path(self.temp_dir) / "original.docx"
+            _link_or_copy(self._package_path, baseline)
+            self._package_path = self._original_docx = baseline
+        update_package(self._package_path, self.unpacked_path, output_file)
+
+    def _write_parts(self):
+        """Flush batched XML, register comment parts and write changed editors."""
+        # Write out anything queued by an open batch() first
+        self._flush_batch()
+
+        # Only ensure comment relationships and content types if comment files exist
+        if self._part_exists("word/comments.xml"):
+            self._ensure_comment_relationships()
+            self._ensure_comment_content_types()
+
+        # Save all modified XML files in temp directory
+        for xml_path, editor in self._editors.items():
+            if editor.save_if_modified():
+                self._written.add(xml_path)
 
     # ==================== Private: Initialization ====================
 
     def _get_next_comment_id(self):
         """Get the next available comment ID."""
-        if not self.comments_path.exists():
+        if not self._part_exists("word/comments.xml"):
             return 0
 
         editor = self["word/comments.xml"]
         max_id = -1
-        for comment_elem in editor.dom.getElementsByTagName("w:comment"):
+        for comment_elem in editor._dom.getElementsByTagName("w:comment"):
             comment_id = comment_elem.getAttribute("w:id")
             if comment_id:
                 try:
@@ -903,13 +1288,13 @@ class Document:
 
     def _load_existing_comments(self):
         """Load existing comments from files to enable replies."""
-        if not self.comments_path.exists():
+        if not self._part_exists("word/comments.xml"):
             return {}
 
         editor = self["word/comments.xml"]
         existing = {}
 
-        for comment_elem in editor.dom.getElementsByTagName("w:comment"):
+        for comment_elem in editor._dom.getElementsByTagName("w:comment"):
             comment_id = comment_elem.getAttribute("w:id")
             if not comment_id:
                 continue
@@ -953,9 +1338,21 @@ class Document:
 
     def _update_people_xml(self, path):
         """Create people.xml if it doesn't exist."""
-        if not path.exists():
-            # Copy from template
-            shutil.copy(TEMPLATE_DIR / "people.xml", path)
+        self._ensure_from_template("people.xml")
+
+    def _part_exists(self, xml_path):
+        """Check for a part in the working tree or, with open_docx(), the zip."""
+        if (self.unpacked_path / xml_path).exists():
+            return True
+        return self._package_members is not None and xml_path in self._package_members
+
+    def _ensure_from_template(self, file_name):
+        """Create word/<file_name> from the template if the document lacks it."""
+        if not self._part_exists(f"word/{file_name}"):
+            path = self.word_path / file_name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy(TEMPLATE_DIR / file_name, path)
+            self._written.add(f"word/{file_name}")
 
     def _add_content_type_for_people(self, path):
         """Add people.xml content type to [Content_Types].xml if not already present."""
@@ -965,7 +1362,7 @@ class Document:
             return
 
         # Add Override element
-        root = editor.dom.documentElement
+        root = editor._dom.documentElement
         override_xml = '<Override PartName="/word/people.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.people+xml"/>'
         editor.append_to(root, override_xml)
 
@@ -976,7 +1373,7 @@ class Document:
         if self._has_relationship(editor, "people.xml"):
             return
 
-        root = editor.dom.documentElement
+        root = editor._dom.documentElement
         root_tag = root.tagName  # type: ignore
         prefix = root_tag.split(":")[0] + ":" if ":" in root_tag else ""
         next_rid = editor.get_next_rid()
@@ -997,14 +1394,14 @@ class Document:
         - rsids: late (after compat)
         """
         editor = self["word/settings.xml"]
-        root = editor.get_node(tag="w:settings")
+        root = editor._dom.documentElement
         prefix = root.tagName.split(":")[0] if ":" in root.tagName else "w"
 
         # Conditionally add trackRevisions if requested
         if track_revisions:
             track_revisions_exists = any(
                 elem.tagName == f"{prefix}:trackRevisions"
-                for elem in editor.dom.getElementsByTagName(f"{prefix}:trackRevisions")
+                for elem in editor._dom.getElementsByTagName(f"{prefix}:trackRevisions")
             )
 
             if not track_revisions_exists:
@@ -1012,7 +1409,7 @@ class Document:
                 # Try to insert before documentProtection, defaultTabStop, or at start
                 inserted = False
                 for tag in [f"{prefix}:documentProtection", f"{prefix}:defaultTabStop"]:
-                    elements = editor.dom.getElementsByTagName(tag)
+                    elements = editor._dom.getElementsByTagName(tag)
                     if elements:
                         editor.insert_before(elements[0], track_rev_xml)
                         inserted = True
@@ -1025,7 +1422,7 @@ class Document:
                         editor.append_to(root, track_rev_xml)
 
         # Always check if rsids section exists
-        rsids_elements = editor.dom.getElementsByTagName(f"{prefix}:rsids")
+        rsids_elements = editor._dom.getElementsByTagName(f"{prefix}:rsids")
 
         if not rsids_elements:
             # Add new rsids section
@@ -1036,13 +1433,13 @@ class Document:
 
             # Try to insert after compat, before clrSchemeMapping, or before closing tag
             inserted = False
-            compat_elements = editor.dom.getElementsByTagName(f"{prefix}:compat")
+            compat_elements = editor._dom.getElementsByTagName(f"{prefix}:compat")
             if compat_elements:
                 editor.insert_after(compat_elements[0], rsids_xml)
                 inserted = True
 
             if not inserted:
-                clr_elements = editor.dom.getElementsByTagName(
+                clr_elements = editor._dom.getElementsByTagName(
                     f"{prefix}:clrSchemeMapping"
                 )
                 if clr_elements:
@@ -1069,12 +1466,6 @@ class Document:
         self, comment_id, para_id, text, author, initials, timestamp
     ):
         """Add a single comment to comments.xml."""
-        if not self.comments_path.exists():
-            shutil.copy(TEMPLATE_DIR / "comments.xml", self.comments_path)
-
-        editor = self["word/comments.xml"]
-        root = editor.get_node(tag="w:comments")
-
         escaped_text = (
             text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
         )
@@ -1086,48 +1477,105 @@ class Document:
     <w:r><w:rPr><w:color w:val="000000"/><w:sz w:val="20"/><w:szCs w:val="20"/></w:rPr><w:t>{escaped_text}</w:t></w:r>
   </w:p>
 </w:comment>'''
-        editor.append_to(root, comment_xml)
+        self._append_to_comment_part("comments.xml", "w:comments", comment_xml)
 
     def _add_to_comments_extended_xml(self, para_id, parent_para_id):
         """Add a single comment to commentsExtended.xml."""
-        if not self.comments_extended_path.exists():
-            shutil.copy(
-                TEMPLATE_DIR / "commentsExtended.xml", self.comments_extended_path
-            )
-
-        editor = self["word/commentsExtended.xml"]
-        root = editor.get_node(tag="w15:commentsEx")
-
         if parent_para_id:
             xml = f'<w15:commentEx w15:paraId="{para_id}" w15:paraIdParent="{parent_para_id}" w15:done="0"/>'
         else:
             xml = f'<w15:commentEx w15:paraId="{para_id}" w15:done="0"/>'
-        editor.append_to(root, xml)
+        self._append_to_comment_part("commentsExtended.xml", "w15:commentsEx", xml)
 
     def _add_to_comments_ids_xml(self, para_id, durable_id):
         """Add a single comment to commentsIds.xml."""
-        if not self.comments_ids_path.exists():
-            shutil.copy(TEMPLATE_DIR / "commentsIds.xml", self.comments_ids_path)
-
-        editor = self["word/commentsIds.xml"]
-        root = editor.get_node(tag="w16cid:commentsIds")
-
         xml = f'<w16cid:commentId w16cid:paraId="{para_id}" w16cid:durableId="{durable_id}"/>'
-        editor.append_to(root, xml)
+        self._append_to_comment_part("commentsIds.xml", "w16cid:commentsIds", xml)
 
     def _add_to_comments_extensible_xml(self, durable_id):
         """Add a single comment to commentsExtensible.xml."""
-        if not self.comments_extensible_path.exists():
-            shutil.copy(
-                TEMPLATE_DIR / "commentsExtensible.xml", self.comments_extensible_path
-            )
+        xml = f'<w16cex:commentExtensible w16cex:durableId="{durable_id}"/>'
+        self._append_to_comment_part(
+            "commentsExtensible.xml", "w16cex:commentsExtensible", xml
+        )
 
-        editor = self["word/commentsExtensible.xml"]
-        root = editor.get_node(tag="w16cex:commentsExtensible")
+    def _append_to_comment_part(self, file_name, root_tag, xml):
+        """Append XML to the root of a word/ comment part, creating it from the
+        template if needed. Inside a batch() the XML is queued instead."""
+        if self._batch is not None:
+            self._batch.setdefault((file_name, root_tag), []).append(xml)
+            return
 
-        xml = f'<w16cex:commentExtensible w16cex:durableId="{durable_id}"/>'
+        self._ensure_from_template(file_name)
+
+        editor = self[f"word/{file_name}"]
+        root = editor.get_node(tag=root_tag)
         editor.append_to(root, xml)
 
+    def _flush_batch(self):
+        """Apply queued comment part XML: one root lookup and one append per part."""
+        if not self._batch:
+            return
+
+        pending, self._batch = self._batch, {}
+        for (file_name, root_tag), fragments in pending.items():
+            self._ensure_from_template(file_name)
+
+            editor = self[f"word/{file_name}"]
+            root = editor.get_node(tag=root_tag)
+            editor.append_to(root, "".join(fragments))
+
+    # ==================== Private: Comment Anchors ====================
+
+    def _find_comment_anchor(self, tag, comment_id):
+        """Find the w:commentRangeStart/w:commentReference for a comment ID.
+
+        Outside a batch this is a plain get_node() lookup. Inside a batch the
+        anchors are served from an index of document.xml that is built once;
+        an entry that is missing, ambiguous or detached is looked up with
+        get_node() instead (so errors are reported the same way) and the
+        result is kept, a failure until the next comment is inserted.
+        """
+        key = (tag, str(comment_id))
+        if self._batch is None:
+            return self._document.get_node(tag=tag, attrs={"w:id": key[1]})
+
+        if key in self._comment_anchor_misses:
+            raise ValueError(self._comment_anchor_misses[key])
+
+        if self._comment_anchors is None:
+            self._comment_anchors = {}
+            self._record_comment_anchors([self._document._dom.documentElement])
+        matches = [
+            elem for elem in self._comment_anchors.get(key, []) if _is_attached(elem)
+        ]
+        if len(matches) == 1:
+            return matches[0]
+
+        try:
+            elem = self._document.get_node(tag=tag, attrs={"w:id": key[1]})
+        except ValueError as e:
+            self._comment_anchor_misses[key] = str(e)
+            raise
+        self._comment_anchors[key] = [elem]
+        return elem
+
+    def _record_comment_anchors(self, nodes):
+        """Add newly inserted comment anchors to the batch index, if one is built."""
+        self._comment_anchor_misses = {}
+        if self._comment_anchors is None:
+            return
+        for node in nodes:
+            if node.nodeType != node.ELEMENT_NODE:
+                continue
+            for tag in ("w:commentRangeStart", "w:commentReference"):
+                elems = [node] if node.tagName == tag else []
+                elems.extend(node.getElementsByTagName(tag))
+                for elem in elems:
+                    self._comment_anchors.setdefault(
+                        (tag, elem.getAttribute("w:id")), []
+                    ).append(elem)
+
     # ==================== Private: XML Fragments ====================
 
     def _comment_range_start_xml(self, comment_id):
@@ -1159,40 +1607,39 @@ class Document:
 
     def _has_relationship(self, editor, target):
         """Check if a relationship with given target exists."""
-        for rel_elem in editor.dom.getElementsByTagName("Relationship"):
+        for rel_elem in editor._dom.getElementsByTagName("Relationship"):
             if rel_elem.getAttribute("Target") == target:
                 return True
         return False
 
     def _has_override(self, editor, part_name):
         """Check if an override with given part name exists."""
-        for override_elem in editor.dom.getElementsByTagName("Override"):
+        for override_elem in editor._dom.getElementsByTagName("Override"):
             if override_elem.getAttribute("PartName") == part_name:
                 return True
         return False
 
     def _has_author(self, editor, author):
         """Check if an author already exists in people.xml."""
-        for person_elem in editor.dom.getElementsByTagName("w15:person"):
+        for person_elem in editor._dom.getElementsByTagName("w15:person"):
             if person_elem.getAttribute("w15:author") == author:
                 return True
         return False
 
     def _add_author_to_people(self, author):
         """Add author to people.xml (called during initialization)."""
-        people_path = self.word_path / "people.xml"
-
         # people.xml should already exist from _setup_tracking
-        if not people_path.exists():
+        if not self._part_exists("word/people.xml"):
             raise ValueError("people.xml should exist after _setup_tracking")
 
         editor = self["word/people.xml"]
-        root = editor.get_node(tag="w15:people")
 
         # Check if author already exists
         if self._has_author(editor, author):
             return
 
+        root = editor.get_node(tag="w15:people")
+
         # Add author with proper XML escaping to prevent injection
         escaped_author = html.escape(author, quote=True)
         person_xml = f'''<w15:person w15:author="{escaped_author}">
@@ -1207,7 +1654,7 @@ class Document:
         if self._has_relationship(editor, "comments.xml"):
             return
 
-        root = editor.dom.documentElement
+        root = editor._dom.documentElement
         root_tag = root.tagName  # type: ignore
         prefix = root_tag.split(":")[0] + ":" if ":" in root_tag else ""
         next_rid_num = int(editor.get_next_rid()[3:])
@@ -1247,7 +1694,7 @@ class Document:
         if self._has_override(editor, "/word/comments.xml"):
             return
 
-        root = editor.dom.documentElement
+        root = editor._dom.documentElement
 
         # Add Override elements
         overrides = [
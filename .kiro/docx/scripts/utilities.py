@@ -28,9 +28,14 @@ Example usage:
 
     # Save changes
     editor.save()
+
+    # Or only write the file if the DOM may have been changed
+    editor.save_if_modified()
 """
 
 import html
+import io
+import os
 from pathlib import Path
 from typing import Optional, Union
 
@@ -50,28 +55,44 @@ class XMLEditor:
         xml_path: Path to the XML file being edited
         encoding: Detected encoding of the XML file ('ascii' or 'utf-8')
         dom: Parsed DOM tree with parse_position attributes on elements
+        dirty: True once the DOM may have been changed: set by the editing methods
+            and whenever the DOM or a node from it is handed out (dom, get_node())
     """
 
-    def __init__(self, xml_path):
+    def __init__(self, xml_path, content: Optional[bytes] = None):
         """
         Initialize with path to XML file and parse with line number tracking.
 
         Args:
             xml_path: Path to XML file to edit (str or Path)
+            content: Optional XML bytes to parse instead of reading xml_path (e.g. a
+                part read straight from a zip). xml_path then need not exist yet;
+                it is where save() will write.
 
         Raises:
             ValueError: If the XML file does not exist
         """
         self.xml_path = Path(xml_path)
-        if not self.xml_path.exists():
+        if content is None and not self.xml_path.exists():
             raise ValueError(f"XML file not found: {xml_path}")
 
-        with open(self.xml_path, "rb") as f:
-            header = f.read(200).decode("utf-8", errors="ignore")
+        if content is None:
+            with open(self.xml_path, "rb") as f:
+                header = f.read(200).decode("utf-8", errors="ignore")
+        else:
+            header = content[:200].decode("utf-8", errors="ignore")
         self.encoding = "ascii" if 'encoding="ascii"' in header else "utf-8"
 
         parser = _create_line_tracking_parser()
-        self.dom = defusedxml.minidom.parse(str(self.xml_path), parser)
+        source = str(self.xml_path) if content is None else io.BytesIO(content)
+        self._dom = defusedxml.minidom.parse(source, parser)
+        self.dirty = False
+
+    @property
+    def dom(self):
+        """The parsed DOM tree. Marks the editor dirty, as callers may change it."""
+        self.dirty = True
+        return self._dom
 
     def get_node(
         self,
@@ -110,7 +131,7 @@ class XMLEditor:
             elem = editor.get_node(tag="w:t", contains="\u201cAgreement")   # Unicode character
         """
         matches = []
-        for elem in self.dom.getElementsByTagName(tag):
+        for elem in self._dom.getElementsByTagName(tag):
             # Check line_number filter
             if line_number is not None:
                 parse_pos = getattr(elem, "parse_position", (None,))
@@ -178,6 +199,8 @@ class XMLEditor:
                 f"Multiple nodes found: <{tag}>. "
                 f"Add more filters (attrs, line_number, or contains) to narrow the search."
             )
+        # The caller may change the node directly
+        self.dirty = True
         return matches[0]
 
     def _get_element_text(self, elem):
@@ -222,6 +245,7 @@ class XMLEditor:
         for node in nodes:
             parent.insertBefore(node, elem)
         parent.removeChild(elem)
+        self.dirty = True
         return nodes
 
     def insert_after(self, elem, xml_content):
@@ -246,6 +270,7 @@ class XMLEditor:
                 parent.insertBefore(node, next_sibling)
             else:
                 parent.appendChild(node)
+        self.dirty = True
         return nodes
 
     def insert_before(self, elem, xml_content):
@@ -266,6 +291,7 @@ class XMLEditor:
         nodes = self._parse_fragment(xml_content)
         for node in nodes:
             parent.insertBefore(node, elem)
+        self.dirty = True
         return nodes
 
     def append_to(self, elem, xml_content):
@@ -285,12 +311,13 @@ class XMLEditor:
         nodes = self._parse_fragment(xml_content)
         for node in nodes:
             elem.appendChild(node)
+        self.dirty = True
         return nodes
 
     def get_next_rid(self):
         """Get the next available rId for relationships files."""
         max_id = 0
-        for rel_elem in self.dom.getElementsByTagName("Relationship"):
+        for rel_elem in self._dom.getElementsByTagName("Relationship"):
             rel_id = rel_elem.getAttribute("Id")
             if rel_id.startswith("rId"):
                 try:
@@ -304,10 +331,34 @@ class XMLEditor:
         Save the edited XML back to the file.
 
         Serializes the DOM tree and writes it back to the original file path,
-        preserving the original encoding (ascii or utf-8).
+        preserving the original encoding (ascii or utf-8). The file is written to a
+        sibling temp file and swapped in, so it is replaced rather than modified in
+        place (files hard-linked elsewhere are left untouched).
+        """
+        self._write(self._dom.toxml(encoding=self.encoding))
+
+    def save_if_modified(self):
+        """
+        Save the edited XML only if the editor is dirty.
+
+        Editors whose DOM was never handed out or edited (see dirty) are left
+        alone without being serialized, so read-only editors cost nothing.
+
+        Returns:
+            bool: True if the file was written
         """
-        content = self.dom.toxml(encoding=self.encoding)
-        self.xml_path.write_bytes(content)
+        if not self.dirty:
+            return False
+        self.save()
+        return True
+
+    def _write(self, content):
+        """Write serialized XML to a sibling temp file and swap it into place."""
+        self.xml_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.xml_path.with_name(f".{self.xml_path.name}.tmp")
+        temp_path.write_bytes(content)
+        os.replace(temp_path, self.xml_path)
+        self.dirty = False
 
     def _parse_fragment(self, xml_content):
         """
@@ -323,7 +374,7 @@ class XMLEditor:
             AssertionError: If fragment contains no element nodes
         """
         # Extract namespace declarations from the root document element
-        root_elem = self.dom.documentElement
+        root_elem = self._dom.documentElement
         namespaces = []
         if root_elem and root_elem.attributes:
             for i in range(root_elem.attributes.length):
@@ -335,7 +386,7 @@ class XMLEditor:
         wrapper = f"<root {ns_decl}>{xml_content}</root>"
         fragment_doc = defusedxml.minidom.parseString(wrapper)
         nodes = [
-            self.dom.importNode(child, deep=True)
+            self._dom.importNode(child, deep=True)
             for child in fragment_doc.documentElement.childNodes  # type: ignore
         ]
         elements = [n for n in nodes if n.nodeType == n.ELEMENT_NODE]